@@ -0,0 +1,115 @@
+import argparse
+import json
+import time
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from sklearn.metrics import adjusted_rand_score
+
+from src.domain.services.ml_clustering_model import MLClusteringModel
+from src.domain.services.ml_incremental_clustering_model import MLIncrementalClusteringModel
+
+CENTERS = np.array([
+    [0.2, 280.0, 1.0, 8.0, 275.0, 400.0],
+    [0.6, 350.0, 5.0, 12.0, 340.0, 700.0],
+    [1.1, 420.0, 10.0, 18.0, 405.0, 900.0],
+])
+SCALES = np.array([0.15, 35.0, 4.0, 4.0, 35.0, 150.0])
+
+def synthetic_herd(n_animals: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    groups = rng.integers(0, len(CENTERS), size=n_animals)
+    return CENTERS[groups] + rng.normal(size=(n_animals, 6)) * SCALES
+
+def new_weighings(features: np.ndarray, fraction: float, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    updated = features.copy()
+    changed = rng.choice(len(features), size=max(1, int(len(features) * fraction)), replace=False)
+    updated[changed, 1] += rng.normal(3.0, 1.0, size=len(changed))
+    updated[changed, 0] += rng.normal(0.0, 0.05, size=len(changed))
+    return updated
+
+def aligned_agreement(labels_a: np.ndarray, labels_b: np.ndarray) -> float:
+    n_clusters = int(max(labels_a.max(), labels_b.max())) + 1
+    contingency = np.zeros((n_clusters, n_clusters), dtype=np.int64)
+    np.add.at(contingency, (labels_a, labels_b), 1)
+    rows, cols = linear_sum_assignment(-contingency)
+    return float(contingency[rows, cols].sum() / len(labels_a))
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+def run(n_animals: int, changed_fraction: float) -> dict:
+    features = synthetic_herd(n_animals)
+    updated = new_weighings(features, changed_fraction)
+
+    (full_model, full_scaler, _), full_seconds = timed(
+        MLClusteringModel.fit_clustering_model, updated, 3, "off"
+    )
+    full_labels = full_model.predict(full_scaler.transform(updated))
+
+    (base_model, base_scaler), cold_seconds = timed(MLIncrementalClusteringModel.fit, features, 3)
+    base_labels = base_model.predict(base_scaler.transform(updated))
+
+    (warm_model, warm_scaler), warm_seconds = timed(
+        MLIncrementalClusteringModel.fit,
+        updated,
+        3,
+        previous_model=base_model,
+        previous_scaler=base_scaler
+    )
+    warm_labels = warm_model.predict(warm_scaler.transform(updated))
+
+    changed, _ = MLIncrementalClusteringModel.changed_rows(
+        list(range(n_animals)), features, list(range(n_animals)), updated
+    )
+    partial_model, partial_seconds = timed(
+        MLIncrementalClusteringModel.partial_update,
+        base_model,
+        base_scaler,
+        updated[changed]
+    )
+    partial_labels = partial_model.predict(base_scaler.transform(updated))
+
+    return {
+        "n_animals": n_animals,
+        "changed_animals": int(len(changed)),
+        "kmeans_full_refit_s": full_seconds,
+        "minibatch_cold_fit_s": cold_seconds,
+        "minibatch_warm_fit_s": warm_seconds,
+        "minibatch_partial_fit_s": partial_seconds,
+        "warm_vs_full_ari": float(adjusted_rand_score(full_labels, warm_labels)),
+        "warm_vs_full_agreement": aligned_agreement(full_labels, warm_labels),
+        "partial_vs_full_agreement": aligned_agreement(full_labels, partial_labels),
+        "warm_label_stability": float(np.mean(base_labels == warm_labels)),
+        "partial_label_stability": float(np.mean(base_labels == partial_labels)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="KMeans completo vs MiniBatchKMeans incremental")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--changed-fraction", type=float, default=0.02)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = []
+    for n_animals in args.sizes:
+        result = run(n_animals, args.changed_fraction)
+        results.append(result)
+        print(
+            f"n={n_animals:>7} | kmeans {result['kmeans_full_refit_s']:.3f}s"
+            f" | warm {result['minibatch_warm_fit_s']:.3f}s"
+            f" | partial {result['minibatch_partial_fit_s']:.4f}s"
+            f" | acuerdo warm/full {result['warm_vs_full_agreement']:.3f}"
+            f" | estabilidad warm {result['warm_label_stability']:.3f}"
+            f" | estabilidad partial {result['partial_label_stability']:.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
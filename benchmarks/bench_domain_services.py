@@ -0,0 +1,315 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.synthetic_herd import SyntheticHerd, generate_herd
+from src.domain.services.clustering_service import ClusteringService
+from src.domain.services.forecasting_service import ForecastingService
+from src.domain.services.ml_clustering_model import MLClusteringModel
+from src.domain.services.ml_forecasting_model import MLForecastingModel
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+NOISE_FLOOR_S = 0.001
+
+def timed(func: Callable, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {"min_s": min(samples), "median_s": statistics.median(samples)}
+
+class DomainBenchmark:
+
+    def __init__(self, herd: SyntheticHerd, per_animal_limit: int):
+        self.herd = herd
+        self.today = herd.reference_date
+        self.ids = herd.animal_ids
+        self.ages = herd.ages_days()
+        self.sample = herd.animals[:per_animal_limit]
+        self.settings = herd.repro_settings
+        self.target_weight = herd.production_goals.target_sale_weight_kg
+
+        index, timestamps, weights = MLClusteringModel.flatten_weight_events(herd.weight_events, self.ids)
+        self.features, self.valid = MLClusteringModel.prepare_features_batch(index, timestamps, weights, len(self.ids), self.ages)
+        self.model, self.scaler, _ = MLClusteringModel.fit_clustering_model(self.features[self.valid], 3, "off")
+        self.gdps = [ClusteringService.calculate_gdp(herd.weight_events[animal_id]) for animal_id in self.ids]
+        self.percentiles = ClusteringService.calculate_lote_percentiles(self.gdps)
+        self.fitted = self._fit_sample(polynomial_degree=2)
+
+    def cases(self) -> Dict[str, tuple]:
+        all_animals = len(self.ids)
+        sampled = len(self.sample)
+        return {
+            "features.cluster_per_animal": ("per_animal", sampled, self.cluster_features_per_animal),
+            "features.cluster_batch": ("batch", all_animals, self.cluster_features_batch),
+            "features.forecast_per_animal": ("per_animal", sampled, self.forecast_series_per_animal),
+            "features.forecast_batch": ("batch", all_animals, self.forecast_series_batch),
+            "train.kmeans": ("batch", int(self.valid.sum()), lambda: self.train_clustering("kmeans")),
+            "train.minibatch": ("batch", int(self.valid.sum()), lambda: self.train_clustering("minibatch")),
+            "train.regression_per_animal": ("per_animal", sampled, lambda: self._fit_sample(polynomial_degree=2)),
+            "train.regression_batch_deg1": ("batch", all_animals, lambda: self.train_regression_batch(1)),
+            "train.regression_batch_deg2": ("batch", all_animals, lambda: self.train_regression_batch(2)),
+            "sale_date.first_day_reaching_weight": ("per_animal", len(self.fitted), self.sale_date_search),
+            "sale_date.forecast_sale_date": ("batch", all_animals, self.sale_date_gdp),
+            "percentiles.calculate_gdp": ("batch", all_animals, self.calculate_gdps),
+            "percentiles.lote_percentiles": ("batch", all_animals, self.lote_percentiles),
+            "percentiles.label_from_gdp": ("batch", all_animals, self.label_from_gdp),
+            "end_to_end.forecast_per_animal": ("per_animal", sampled, self.forecast_end_to_end),
+            "end_to_end.cluster_per_animal": ("per_animal", sampled, self.cluster_end_to_end),
+            "end_to_end.forecast_ranch": ("batch", all_animals, self.forecast_ranch),
+            "end_to_end.cluster_ranch": ("batch", all_animals, self.cluster_ranch),
+        }
+
+    def cluster_features_per_animal(self) -> None:
+        for animal, age in zip(self.sample, self.ages):
+            MLClusteringModel.prepare_features(self.herd.weight_events[animal.id], int(age))
+
+    def cluster_features_batch(self) -> None:
+        index, timestamps, weights = MLClusteringModel.flatten_weight_events(self.herd.weight_events, self.ids)
+        MLClusteringModel.prepare_features_batch(index, timestamps, weights, len(self.ids), self.ages)
+
+    def forecast_series_per_animal(self) -> None:
+        for animal in self.sample:
+            MLForecastingModel.prepare_weight_series(self.herd.weight_events[animal.id])
+
+    def forecast_series_batch(self) -> None:
+        MLForecastingModel.prepare_weight_series_batch(self.herd.weight_events, self.ids)
+
+    def train_clustering(self, engine: str) -> None:
+        MLClusteringModel.fit_clustering_model(self.features[self.valid], 3, "auto", engine=engine)
+
+    def train_regression_batch(self, degree: int) -> None:
+        offsets, days, weights = MLForecastingModel.prepare_weight_series_batch(self.herd.weight_events, self.ids)
+        MLForecastingModel.train_weight_regression_batch(offsets, days, weights, polynomial_degree=degree)
+
+    def sale_date_search(self) -> None:
+        for model, poly, days, weights in self.fitted:
+            MLForecastingModel.predict_sale_date(weights[-1], self.target_weight, model, poly, days, self.today)
+
+    def sale_date_gdp(self) -> None:
+        for animal_id in self.ids:
+            events = self.herd.weight_events[animal_id]
+            if events:
+                ForecastingService.forecast_sale_date(
+                    float(events[0][1]),
+                    ForecastingService.calculate_gdp_30days(events),
+                    self.target_weight,
+                    self.today
+                )
+
+    def calculate_gdps(self) -> None:
+        for animal_id in self.ids:
+            ClusteringService.calculate_gdp(self.herd.weight_events[animal_id])
+
+    def lote_percentiles(self) -> None:
+        ClusteringService.calculate_lote_percentiles(self.gdps)
+
+    def label_from_gdp(self) -> None:
+        for gdp in self.gdps:
+            ClusteringService.label_from_gdp(gdp, self.percentiles)
+
+    def forecast_end_to_end(self) -> None:
+        for animal in self.sample:
+            events = self.herd.weight_events[animal.id]
+            days, weights = MLForecastingModel.prepare_weight_series(events)
+            if days is not None and len(days) >= 3:
+                model, _, r2 = MLForecastingModel.train_weight_regression(days, weights, polynomial_degree=1)
+                MLForecastingModel.predict_weight_30days(model, None, days, r2 if r2 else 0.7)
+                ForecastingService.forecast_sale_date(
+                    float(events[0][1]),
+                    ForecastingService.calculate_gdp_30days(events),
+                    self.target_weight,
+                    self.today
+                )
+            self._repro_forecast(animal)
+
+    def cluster_end_to_end(self) -> None:
+        for animal, age in zip(self.sample, self.ages):
+            events = self.herd.weight_events[animal.id]
+            features = MLClusteringModel.prepare_features(events, int(age))
+            if features is None:
+                continue
+            MLClusteringModel.predict_cluster(features, self.model, self.scaler)
+            ClusteringService.label_from_gdp(ClusteringService.calculate_gdp(events), self.percentiles)
+            self._repro_status(animal)
+
+    def forecast_ranch(self) -> None:
+        offsets, days, weights = MLForecastingModel.prepare_weight_series_batch(self.herd.weight_events, self.ids)
+        coefficients, _, _ = MLForecastingModel.train_weight_regression_batch(offsets, days, weights, polynomial_degree=1)
+        has_events = np.diff(offsets) > 0
+        last_days = np.zeros(len(self.ids))
+        last_days[has_events] = days[offsets[1:][has_events] - 1]
+        MLForecastingModel.evaluate_polynomial_batch(np.nan_to_num(coefficients), last_days + 30)
+        self.sale_date_gdp()
+        for animal in self.herd.animals:
+            self._repro_forecast(animal)
+
+    def cluster_ranch(self) -> None:
+        index, timestamps, weights = MLClusteringModel.flatten_weight_events(self.herd.weight_events, self.ids)
+        features, valid = MLClusteringModel.prepare_features_batch(index, timestamps, weights, len(self.ids), self.ages)
+        model, scaler, _ = MLClusteringModel.fit_clustering_model(features[valid], 3, "auto")
+        MLClusteringModel.predict_clusters(features[valid], model, scaler)
+        percentiles = ClusteringService.calculate_lote_percentiles(list(features[valid, 0]))
+        for gdp in features[valid, 0]:
+            ClusteringService.label_from_gdp(float(gdp), percentiles)
+        for animal in self.herd.animals:
+            self._repro_status(animal)
+
+    def _fit_sample(self, polynomial_degree: int) -> List[tuple]:
+        fitted = []
+        for animal in self.sample:
+            days, weights = MLForecastingModel.prepare_weight_series(self.herd.weight_events[animal.id])
+            model, poly, _ = MLForecastingModel.train_weight_regression(days, weights, polynomial_degree)
+            if model is not None:
+                fitted.append((model, poly, days, weights))
+        return fitted
+
+    def _repro_forecast(self, animal) -> None:
+        calving, _ = ForecastingService.forecast_calving_date(
+            animal.last_insemination_date,
+            self.settings.avg_gestation_days,
+            self.today
+        )
+        if calving:
+            ForecastingService.forecast_dry_off_date(calving, self.settings.days_to_dry_off, self.today)
+        ForecastingService.forecast_next_heat_date(animal.last_heat_date, self.settings.estrus_cycle_days, self.today)
+
+    def _repro_status(self, animal) -> None:
+        births = self.herd.birth_events[animal.id]
+        previous_birth = births[1][0].date() if len(births) > 1 else None
+        ClusteringService.evaluate_reproductive_status(
+            animal,
+            ForecastingService.calculate_days_open(animal.last_birth_date, self.today),
+            ForecastingService.calculate_calving_interval(previous_birth, animal.last_birth_date)
+        )
+
+def run(n_animals: int, per_animal_limit: int, repeat: int, seed: int, only: List[str] = None) -> dict:
+    started = time.perf_counter()
+    herd = generate_herd(n_animals, seed=seed)
+    generate_seconds = time.perf_counter() - started
+
+    benchmark = DomainBenchmark(herd, per_animal_limit)
+    cases = {}
+    for name, (scope, count, func) in benchmark.cases().items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        timing = timed(func, repeat)
+        timing.update({
+            "scope": scope,
+            "animals": count,
+            "us_per_animal": timing["median_s"] / count * 1e6 if count else None
+        })
+        cases[name] = timing
+
+    return {
+        "n_animals": n_animals,
+        "sampled_animals": len(benchmark.sample),
+        "weight_events": sum(len(events) for events in herd.weight_events.values()),
+        "generate_s": generate_seconds,
+        "cases": cases
+    }
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import sklearn
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+def compare(results: List[dict], baseline_path: str, max_regression: float) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = {run["n_animals"]: run["cases"] for run in json.load(f)["runs"]}
+
+    regressions = []
+    for result in results:
+        previous_cases = baseline.get(result["n_animals"], {})
+        for name, case in result["cases"].items():
+            previous = previous_cases.get(name)
+            if not previous or max(case["min_s"], previous["min_s"]) < NOISE_FLOOR_S:
+                continue
+            ratio = case["min_s"] / previous["min_s"]
+            flag = ""
+            if ratio > 1 + max_regression:
+                flag = "  <- REGRESIÓN"
+                regressions.append(f"n={result['n_animals']} {name}")
+            print(f"n={result['n_animals']:>7} {name:<38} x{ratio:.2f}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalado de servicios de dominio ML sobre hatos sintéticos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--per-animal-limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", type=str, nargs="+", default=None)
+    parser.add_argument("--output", type=str, default=None)
+    parser.add_argument("--compare", type=str, default=None)
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = []
+    for n_animals in args.sizes:
+        result = run(n_animals, args.per_animal_limit, args.repeat, args.seed, args.only)
+        results.append(result)
+        print(f"n={n_animals:>7} | hato generado en {result['generate_s']:.2f}s ({result['weight_events']} pesadas)")
+        for name, case in result["cases"].items():
+            print(
+                f"    {name:<38} {case['median_s'] * 1000:>10.2f} ms"
+                f" | {case['us_per_animal']:>9.2f} us/animal ({case['scope']}, {case['animals']})"
+            )
+
+    report = {
+        "benchmark": "domain_services",
+        "environment": environment(),
+        "parameters": {
+            "per_animal_limit": args.per_animal_limit,
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "runs": results
+    }
+
+    output = args.output or os.path.join(
+        "benchmarks",
+        "results",
+        f"domain_services-{report['environment']['commit'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados guardados en {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression)
+        if regressions:
+            print(f"{len(regressions)} casos más lentos que la línea base (+{args.max_regression:.0%})")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import time
+import uuid
+from uuid import UUID
+
+from src.infrastructure.queue.message_codec import MessageCodec, msgpack, orjson
+
+def synthetic_bodies(n_messages: int, seed: int = 42):
+    namespace = uuid.UUID(int=seed)
+    ranches = [str(uuid.uuid5(namespace, f"ranch-{i}")) for i in range(50)]
+    bodies = []
+    for i in range(n_messages):
+        bodies.append({
+            "ranch_id": ranches[i % len(ranches)],
+            "animal_id": str(uuid.uuid5(namespace, f"animal-{i}")),
+            "task_id": str(uuid.uuid5(namespace, f"task-{i}")),
+            "timestamp": "2024-05-01T10:00:00"
+        })
+    return bodies
+
+def legacy_decode(body: bytes):
+    data = json.loads(body.decode())
+    ranch_id = data.get("ranch_id")
+    animal_id = data.get("animal_id")
+    task_id = data.get("task_id")
+    if not all([ranch_id, animal_id, task_id]):
+        return None
+    return UUID(ranch_id), UUID(animal_id), task_id
+
+def measure(decode, bodies, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for body in bodies:
+            decode(body)
+        best = min(best, time.perf_counter() - started)
+    return len(bodies) / best
+
+def run(n_messages: int, repeats: int) -> list:
+    payloads = synthetic_bodies(n_messages)
+    json_bodies = [json.dumps(payload).encode() for payload in payloads]
+
+    results = [
+        {"path": "legacy json.loads + dict", "msgs_per_second": measure(legacy_decode, json_bodies, repeats)},
+        {
+            "path": f"codec {'orjson' if orjson is not None else 'json'}",
+            "msgs_per_second": measure(
+                lambda body: MessageCodec.decode_task("forecast", body, "application/json"),
+                json_bodies,
+                repeats
+            )
+        },
+    ]
+
+    if msgpack is not None:
+        msgpack_bodies = [msgpack.packb(payload) for payload in payloads]
+        results.append({
+            "path": "codec msgpack",
+            "msgs_per_second": measure(
+                lambda body: MessageCodec.decode_task("forecast", body, "application/msgpack"),
+                msgpack_bodies,
+                repeats
+            )
+        })
+
+    for result in results:
+        result["n_messages"] = n_messages
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Decodificación de mensajes: ruta anterior vs codec tipado")
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = run(args.messages, args.repeats)
+    for result in results:
+        print(f"{result['path']:<28} | {result['msgs_per_second']:>12,.0f} msgs/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
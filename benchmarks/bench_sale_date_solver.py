@@ -0,0 +1,80 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.domain.services.ml_forecasting_model import MLForecastingModel
+
+def legacy_first_day(model, poly_features, days_from_first, target_weight):
+    for days_ahead in range(1, 730):
+        X_test = np.array([[days_from_first[-1] + days_ahead]])
+        if poly_features is not None:
+            predicted_weight = model.predict(poly_features.transform(X_test))[0]
+        else:
+            predicted_weight = model.predict(X_test)[0]
+        if predicted_weight >= target_weight:
+            return days_ahead
+    return None
+
+def synthetic_series(n_series: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    series = []
+    for _ in range(n_series):
+        days = np.sort(rng.choice(np.arange(0, 90), size=int(rng.integers(4, 10)), replace=False))
+        days = days - days[0]
+        gdp = rng.normal(0.7, 0.4)
+        curvature = rng.normal(0.0, 0.004)
+        weights = 250 + gdp * days + curvature * days ** 2 + rng.normal(0, 3.0, size=len(days))
+        target = float(weights[-1] + rng.uniform(5, 250))
+        series.append((days, weights, target))
+    return series
+
+def run(n_series: int, degree: int) -> dict:
+    fitted = []
+    for days, weights, target in synthetic_series(n_series, seed=degree):
+        model, poly_features, _ = MLForecastingModel.train_weight_regression(
+            days, weights, polynomial_degree=degree
+        )
+        fitted.append((model, poly_features, days, target))
+
+    started = time.perf_counter()
+    legacy = [legacy_first_day(model, poly, days, target) for model, poly, days, target in fitted]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    solved = [
+        MLForecastingModel.first_day_reaching_weight(model, poly, float(days[-1]), target)
+        for model, poly, days, target in fitted
+    ]
+    solver_seconds = time.perf_counter() - started
+
+    return {
+        "degree": degree,
+        "n_series": n_series,
+        "legacy_ms_per_prediction": legacy_seconds / n_series * 1000,
+        "solver_ms_per_prediction": solver_seconds / n_series * 1000,
+        "speedup": legacy_seconds / solver_seconds if solver_seconds else None,
+        "mismatches": sum(1 for a, b in zip(legacy, solved) if a != b),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda diaria vs solución analítica de fecha de venta")
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = [run(args.series, degree) for degree in (1, 2)]
+    for result in results:
+        print(
+            f"grado {result['degree']} | bucle {result['legacy_ms_per_prediction']:.2f} ms"
+            f" | analítico {result['solver_ms_per_prediction']:.3f} ms"
+            f" | x{result['speedup']:.0f} | diferencias {result['mismatches']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
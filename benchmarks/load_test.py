@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic_herd import generate_herd
+from src.adapters.input.queue_consumer_adapter import QueueConsumerAdapter
+from src.application.services.cluster_use_case import ClusterUseCase
+from src.application.services.forecast_use_case import ForecastUseCase
+from src.application.services.ml_processor_service import MLProcessorService
+from src.domain.entities.ranch import Ranch
+from src.infrastructure.cache.cluster_model_cache import ClusterModelCache
+from src.infrastructure.compute.compute_executor import compute_executor
+from src.infrastructure.compute.ml_warmup import warm_up_ml_modules
+from src.infrastructure.memory.in_memory_queue import InMemoryQueuePublisher, InMemoryQueueStatusWriter
+from src.infrastructure.memory.in_memory_repositories import (
+    InMemoryAnimalRepository,
+    InMemoryEventRepository,
+    InMemoryPredictionRepository,
+    InMemoryRanchRepository,
+)
+from src.infrastructure.memory.in_memory_store import InjectedLatency, InMemoryStore
+from src.infrastructure.persistence.cached_ranch_repository import CachedRanchRepository
+from src.infrastructure.queue.message_codec import MessageCodec
+from config.settings import settings
+
+def build_store(
+    ranches: int,
+    animals_per_ranch: int,
+    seed: int,
+    read_latency: InjectedLatency,
+    write_latency: InjectedLatency,
+    max_connections: int = None
+) -> Tuple[InMemoryStore, Dict[uuid.UUID, List[uuid.UUID]]]:
+    store = InMemoryStore(read_latency, write_latency, max_connections=max_connections, seed=seed)
+    herd_ids = {}
+    for offset in range(ranches):
+        herd = generate_herd(animals_per_ranch, seed=seed + offset, reference_date=date.today())
+        store.add_ranch(
+            Ranch(id=herd.ranch_id, account_id=herd.ranch_id, name=f"Rancho {offset}", location="Sintético"),
+            herd.repro_settings,
+            herd.production_goals
+        )
+        for animal in herd.animals:
+            store.add_animal(
+                animal,
+                herd.weight_events[animal.id],
+                herd.breeding_events[animal.id],
+                herd.birth_events[animal.id]
+            )
+        herd_ids[herd.ranch_id] = herd.animal_ids
+    return store, herd_ids
+
+def build_adapter(store: InMemoryStore, coalesce_window_ms: int, publish_latency: InjectedLatency) -> QueueConsumerAdapter:
+    animal_repo = InMemoryAnimalRepository(store)
+    event_repo = InMemoryEventRepository(store)
+    prediction_repo = InMemoryPredictionRepository(store)
+    processor = MLProcessorService(
+        cluster_use_case=ClusterUseCase(
+            animal_repo=animal_repo,
+            event_repo=event_repo,
+            prediction_repo=prediction_repo,
+            model_cache=ClusterModelCache(
+                max_entries=settings.CLUSTER_MODEL_CACHE_MAX_ENTRIES,
+                max_bytes=settings.CLUSTER_MODEL_CACHE_MAX_BYTES
+            )
+        ),
+        forecast_use_case=ForecastUseCase(
+            animal_repo=animal_repo,
+            event_repo=event_repo,
+            ranch_repo=CachedRanchRepository(InMemoryRanchRepository(store)),
+            prediction_repo=prediction_repo
+        ),
+        status_writer=InMemoryQueueStatusWriter(
+            store,
+            flush_size=settings.QUEUE_STATUS_FLUSH_SIZE,
+            flush_interval_seconds=settings.QUEUE_STATUS_FLUSH_INTERVAL_MS / 1000
+        )
+    )
+    return QueueConsumerAdapter(
+        processor=processor,
+        publisher=InMemoryQueuePublisher(publish_latency, settings.RESULT_CONFIRM_WINDOW) if settings.RESULT_PUBLISHING_ENABLED else None,
+        coalesce_window_ms=coalesce_window_ms
+    )
+
+def generate_messages(
+    herd_ids: Dict[uuid.UUID, List[uuid.UUID]],
+    n_messages: int,
+    cluster_ratio: float,
+    ranch_task_ratio: float,
+    seed: int
+) -> List[Tuple[str, bytes]]:
+    rng = random.Random(seed)
+    ranch_ids = list(herd_ids)
+    messages = []
+    for index in range(n_messages):
+        ranch_id = rng.choice(ranch_ids)
+        queue_type = "cluster" if rng.random() < cluster_ratio else "forecast"
+        payload = {"ranch_id": str(ranch_id), "task_id": f"load-{index:07d}"}
+        if rng.random() < ranch_task_ratio:
+            payload["scope"] = "ranch"
+        else:
+            payload["animal_id"] = str(rng.choice(herd_ids[ranch_id]))
+        messages.append((queue_type, MessageCodec.dumps(payload)))
+    return messages
+
+async def drive(adapter: QueueConsumerAdapter, messages: List[Tuple[str, bytes]], concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: Dict[str, List[float]] = {}
+    statuses: Counter = Counter()
+
+    async def handle(queue_type: str, body: bytes) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                task = MessageCodec.decode_task(queue_type, body, "application/json")
+                status = await adapter._process_message(task, queue_type)
+            except Exception as e:
+                status = f"error:{type(e).__name__}"
+            operation = queue_type if b"animal_id" in body else f"{queue_type}_ranch"
+            latencies.setdefault(operation, []).append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handle(queue_type, body) for queue_type, body in messages))
+    elapsed = time.perf_counter() - started
+
+    await adapter.processor.flush_queue_status()
+    if adapter.publisher is not None:
+        await adapter.publisher.wait_for_confirms()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "messages": len(messages),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(messages) / elapsed if elapsed else 0.0,
+        "latency_ms": summarize(all_latencies),
+        "latency_ms_by_operation": {operation: summarize(values) for operation, values in sorted(latencies.items())},
+        "statuses": dict(statuses)
+    }
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    values = np.asarray(samples) * 1000
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(values.max()), "count": len(samples)}
+
+async def run(args) -> dict:
+    started = time.perf_counter()
+    store, herd_ids = build_store(
+        args.ranches,
+        args.animals,
+        args.seed,
+        InjectedLatency(args.read_latency_ms, args.jitter_ms),
+        InjectedLatency(args.write_latency_ms, args.jitter_ms),
+        args.max_connections
+    )
+    setup_seconds = time.perf_counter() - started
+    warmup_seconds = warm_up_ml_modules() if settings.ML_WARMUP_ENABLED else 0.0
+
+    adapter = build_adapter(
+        store,
+        args.coalesce_window_ms,
+        InjectedLatency(args.publish_latency_ms, args.jitter_ms)
+    )
+    messages = generate_messages(herd_ids, args.messages, args.cluster_ratio, args.ranch_task_ratio, args.seed)
+    try:
+        result = await drive(adapter, messages, args.concurrency)
+    finally:
+        compute_executor.shutdown()
+
+    result.update({
+        "setup_s": setup_seconds,
+        "warmup_s": warmup_seconds,
+        "store": store.stats(),
+        "status_writer": adapter.processor.status_writer.stats(),
+        "compute": compute_executor.stats()
+    })
+    if adapter.batcher is not None:
+        result["batcher"] = adapter.batcher.stats()
+    if adapter.publisher is not None:
+        result["publisher"] = adapter.publisher.stats()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga offline del worker con repositorios y broker en memoria")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=settings.WORKER_CONCURRENCY_FORECAST + settings.WORKER_CONCURRENCY_CLUSTER)
+    parser.add_argument("--ranches", type=int, default=4)
+    parser.add_argument("--animals", type=int, default=500)
+    parser.add_argument("--cluster-ratio", type=float, default=0.5)
+    parser.add_argument("--ranch-task-ratio", type=float, default=0.02)
+    parser.add_argument("--read-latency-ms", type=float, default=2.0)
+    parser.add_argument("--write-latency-ms", type=float, default=4.0)
+    parser.add_argument("--publish-latency-ms", type=float, default=1.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--max-connections", type=int, default=settings.DATABASE_POOL_SIZE)
+    parser.add_argument("--coalesce-window-ms", type=int, default=settings.WORKER_COALESCE_WINDOW_MS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    latency = result["latency_ms"]
+    print(
+        f"{result['messages']} mensajes en {result['elapsed_s']:.2f}s"
+        f" | {result['throughput_per_s']:.1f} msg/s (hatos generados en {result['setup_s']:.2f}s)"
+    )
+    print(
+        f"latencia ms  p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}"
+        f"  p99 {latency['p99']:.1f}  max {latency['max']:.1f}"
+    )
+    for operation, summary in result["latency_ms_by_operation"].items():
+        print(f"    {operation:<14} n={summary['count']:>6}  p50 {summary['p50']:>8.1f}  p99 {summary['p99']:>8.1f}")
+    print(f"status: {result['statuses']}")
+    print(f"store: {result['store']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "load_test", "parameters": vars(args), "result": result}, f, indent=2, default=str)
+        print(f"Resultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+from uuid import UUID
+
+import numpy as np
+
+from src.domain.entities.animal import Animal
+from src.domain.entities.ranch import ProductionGoals, RanchReproSettings
+
+REFERENCE_DATE = date(2025, 6, 1)
+WEIGHT_WINDOW_DAYS = 90
+REPRO_WINDOW_DAYS = 365
+
+@dataclass
+class SyntheticHerd:
+    ranch_id: UUID
+    reference_date: date
+    animals: List[Animal]
+    weight_events: Dict[UUID, List[tuple]]
+    breeding_events: Dict[UUID, List[tuple]]
+    birth_events: Dict[UUID, List[tuple]]
+    repro_settings: RanchReproSettings
+    production_goals: ProductionGoals
+
+    @property
+    def animal_ids(self) -> List[UUID]:
+        return [animal.id for animal in self.animals]
+
+    def ages_days(self) -> np.ndarray:
+        return np.array([(self.reference_date - animal.birth_date).days for animal in self.animals], dtype=np.float64)
+
+def _uuid(rng: np.random.Generator) -> UUID:
+    return uuid.UUID(bytes=rng.bytes(16), version=4)
+
+def _at_noon(day: date) -> datetime:
+    return datetime.combine(day, time(12, 0))
+
+def growth_curve(age_days: np.ndarray, mature_weight: np.ndarray, rate: np.ndarray, birth_weight: float = 35.0) -> np.ndarray:
+    return mature_weight - (mature_weight - birth_weight) * np.exp(-rate * age_days)
+
+def generate_herd(n_animals: int, seed: int = 42, reference_date: date = REFERENCE_DATE) -> SyntheticHerd:
+    rng = np.random.default_rng(seed)
+    ranch_id = _uuid(rng)
+    id_bytes = rng.bytes(16 * n_animals)
+
+    ages = rng.integers(120, 2200, size=n_animals)
+    females = rng.random(n_animals) < 0.7
+    mature_weight = rng.normal(560.0, 60.0, size=n_animals).clip(380.0, 800.0)
+    rate = rng.normal(0.0028, 0.0007, size=n_animals).clip(0.0008, 0.006)
+    health = rng.integers(40, 101, size=n_animals)
+
+    weighings = np.where(rng.random(n_animals) < 0.05, 1, rng.integers(2, 13, size=n_animals))
+    starts = np.concatenate(([0], np.cumsum(weighings)[:-1]))
+    owner = np.repeat(np.arange(n_animals), weighings)
+    steps = np.maximum(1, np.round(3 + rng.gamma(2.0, 5.0, size=len(owner)))).astype(np.int64)
+    steps[starts] = 0
+    elapsed = np.cumsum(steps)
+    days_before = rng.integers(0, 15, size=n_animals)[owner] + elapsed - elapsed[starts][owner]
+    noise = rng.normal(0.0, 1.0, size=len(owner)) * rng.uniform(1.0, 6.0, size=n_animals)[owner]
+    body_condition = rng.integers(2, 6, size=len(owner))
+
+    kept = days_before < np.minimum(WEIGHT_WINDOW_DAYS, ages)[owner]
+    owner, days_before, noise, body_condition = owner[kept], days_before[kept], noise[kept], body_condition[kept]
+    weights = np.round(
+        growth_curve(ages[owner] - days_before, mature_weight[owner], rate[owner]) + noise,
+        1
+    )
+    event_offsets = np.concatenate(([0], np.cumsum(np.bincount(owner, minlength=n_animals))))
+
+    weighing_dates = [_at_noon(reference_date - timedelta(days=day)) for day in range(WEIGHT_WINDOW_DAYS)]
+    weight_rows = list(zip(
+        [weighing_dates[day] for day in days_before.tolist()],
+        weights.tolist(),
+        body_condition.tolist()
+    ))
+
+    last_calving_before = rng.integers(30, 420, size=n_animals)
+    calving_days = last_calving_before[:, None] + np.concatenate(
+        (np.zeros((n_animals, 1), dtype=np.int64), np.cumsum(rng.normal(395, 35, size=(n_animals, 4)).astype(np.int64), axis=1)),
+        axis=1
+    )
+    calvings = np.clip((ages - 700) // 380 + 1, 0, 5)
+    services = rng.integers(0, 4, size=n_animals)
+    service_lead = rng.integers(45, 90, size=n_animals)
+    heat_before = rng.integers(1, 40, size=n_animals)
+    in_repro = females & (ages > 700)
+
+    animals: List[Animal] = []
+    weight_events: Dict[UUID, List[tuple]] = {}
+    breeding_events: Dict[UUID, List[tuple]] = {}
+    birth_events: Dict[UUID, List[tuple]] = {}
+    updated_at = _at_noon(reference_date)
+
+    for idx in range(n_animals):
+        animal_id = uuid.UUID(bytes=id_bytes[16 * idx:16 * idx + 16], version=4)
+        birth_date = reference_date - timedelta(days=int(ages[idx]))
+        weight_events[animal_id] = weight_rows[event_offsets[idx]:event_offsets[idx + 1]]
+
+        last_heat = last_birth = last_insemination = None
+        breeding: List[tuple] = []
+        births: List[tuple] = []
+        if in_repro[idx]:
+            animal_calvings = calving_days[idx, :calvings[idx]].tolist()
+            births = [
+                (_at_noon(reference_date - timedelta(days=before)), "NORMAL", 1, 1)
+                for before in animal_calvings
+                if before <= REPRO_WINDOW_DAYS
+            ]
+            last_birth = reference_date - timedelta(days=animal_calvings[0])
+
+            first_service = animal_calvings[0] - int(service_lead[idx])
+            breeding = [
+                (_at_noon(reference_date - timedelta(days=day)), "IA", None, "Técnico")
+                for day in range(first_service - 21 * (int(services[idx]) - 1), first_service + 1, 21)
+                if day > 0
+            ]
+            if breeding:
+                last_insemination = breeding[0][0].date()
+            last_heat = reference_date - timedelta(days=int(heat_before[idx]))
+
+        breeding_events[animal_id] = breeding
+        birth_events[animal_id] = births
+
+        animals.append(Animal(
+            id=animal_id,
+            ranch_id=ranch_id,
+            visual_tag=f"B-{idx:06d}",
+            electronic_tag=None,
+            name=None,
+            sex="HEMBRA" if females[idx] else "MACHO",
+            birth_date=birth_date,
+            breed="Brahman",
+            productive_status="ACTIVO",
+            reproductive_status=None,
+            health_score=int(health[idx]),
+            last_heat_date=last_heat,
+            last_birth_date=last_birth,
+            last_insemination_date=last_insemination,
+            current_cluster_label="PENDING",
+            predicted_sale_date=None,
+            expected_calving_date=None,
+            suggested_dry_date=None,
+            next_likely_heat_date=None,
+            projected_weight_30d=None,
+            is_active=True,
+            server_updated_at=updated_at
+        ))
+
+    return SyntheticHerd(
+        ranch_id=ranch_id,
+        reference_date=reference_date,
+        animals=animals,
+        weight_events=weight_events,
+        breeding_events=breeding_events,
+        birth_events=birth_events,
+        repro_settings=RanchReproSettings(
+            id=_uuid(rng),
+            ranch_id=ranch_id,
+            avg_gestation_days=283,
+            estrus_cycle_days=21,
+            voluntary_waiting_period=45,
+            days_to_dry_off=60,
+            gdp_factor_dry_season=0.8,
+            gdp_factor_rainy_season=1.1
+        ),
+        production_goals=ProductionGoals(
+            id=_uuid(rng),
+            ranch_id=ranch_id,
+            target_sale_weight_kg=480.0,
+            max_ranch_capacity_kg=float(n_animals * 600)
+        )
+    )
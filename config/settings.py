@@ -6,8 +6,10 @@ BASE_DIR = Path(__file__).parent.parent
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+    DATABASE_POOL_MIN_SIZE: int = int(os.getenv("DATABASE_POOL_MIN_SIZE", "2"))
     DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
     DATABASE_POOL_TIMEOUT: int = int(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+    DATABASE_COPY_THRESHOLD: int = int(os.getenv("DATABASE_COPY_THRESHOLD", "1000"))
 
     AMQP_URL: str = os.getenv("AMQP_URL", "")
     AMQP_HOST: str = os.getenv("AMQP_HOST", "")
@@ -19,10 +21,43 @@ class Settings:
     QUEUE_NAME_FORECAST: str = os.getenv("QUEUE_NAME_FORECAST", "bovara.forecast")
     QUEUE_NAME_CLUSTER: str = os.getenv("QUEUE_NAME_CLUSTER", "bovara.cluster")
     QUEUE_DEAD_LETTER: str = os.getenv("QUEUE_DEAD_LETTER", "bovara.dlq")
+    QUEUE_NAME_RESULTS: str = os.getenv("QUEUE_NAME_RESULTS", "bovara.results")
+    RESULT_PUBLISHING_ENABLED: bool = os.getenv("RESULT_PUBLISHING_ENABLED", "false").lower() == "true"
 
     WORKER_BATCH_SIZE: int = int(os.getenv("WORKER_BATCH_SIZE", "50"))
     WORKER_POLL_INTERVAL: int = int(os.getenv("WORKER_POLL_INTERVAL", "10"))
     WORKER_MAX_RETRIES: int = int(os.getenv("WORKER_MAX_RETRIES", "3"))
+    WORKER_RETRY_BASE_DELAY_MS: int = int(os.getenv("WORKER_RETRY_BASE_DELAY_MS", "5000"))
+    WORKER_CONCURRENCY_FORECAST: int = int(os.getenv("WORKER_CONCURRENCY_FORECAST", str(WORKER_BATCH_SIZE)))
+    WORKER_CONCURRENCY_CLUSTER: int = int(os.getenv("WORKER_CONCURRENCY_CLUSTER", str(WORKER_BATCH_SIZE)))
+    WORKER_COALESCE_WINDOW_MS: int = int(os.getenv("WORKER_COALESCE_WINDOW_MS", "200"))
+    WORKER_COALESCE_MIN_RANCH_BATCH: int = int(os.getenv("WORKER_COALESCE_MIN_RANCH_BATCH", "8"))
+    WORKER_SHUTDOWN_TIMEOUT: int = int(os.getenv("WORKER_SHUTDOWN_TIMEOUT", "30"))
+    WORKER_MODE: str = os.getenv("WORKER_MODE", "single")
+    WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", "0"))
+    WORKER_RESTART_BACKOFF: float = float(os.getenv("WORKER_RESTART_BACKOFF", "1.0"))
+
+    CLUSTER_MODEL_CACHE_MAX_ENTRIES: int = int(os.getenv("CLUSTER_MODEL_CACHE_MAX_ENTRIES", "256"))
+    CLUSTER_MODEL_CACHE_MAX_BYTES: int = int(os.getenv("CLUSTER_MODEL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CLUSTER_ENGINE: str = os.getenv("CLUSTER_ENGINE", "kmeans")
+    CLUSTER_PARTIAL_FIT_MAX_FRACTION: float = float(os.getenv("CLUSTER_PARTIAL_FIT_MAX_FRACTION", "0.1"))
+    CLUSTER_SILHOUETTE_MODE: str = os.getenv("CLUSTER_SILHOUETTE_MODE", "auto")
+    CLUSTER_SILHOUETTE_EXACT_MAX: int = int(os.getenv("CLUSTER_SILHOUETTE_EXACT_MAX", "2000"))
+    CLUSTER_SILHOUETTE_SAMPLE_SIZE: int = int(os.getenv("CLUSTER_SILHOUETTE_SAMPLE_SIZE", "2000"))
+    RANCH_CACHE_TTL_SECONDS: int = int(os.getenv("RANCH_CACHE_TTL_SECONDS", "300"))
+    RANCH_CACHE_MAX_ENTRIES: int = int(os.getenv("RANCH_CACHE_MAX_ENTRIES", "2048"))
+    QUEUE_STATUS_FLUSH_SIZE: int = int(os.getenv("QUEUE_STATUS_FLUSH_SIZE", str(WORKER_BATCH_SIZE)))
+    QUEUE_STATUS_FLUSH_INTERVAL_MS: int = int(os.getenv("QUEUE_STATUS_FLUSH_INTERVAL_MS", "100"))
+    RESULT_CONFIRM_WINDOW: int = int(os.getenv("RESULT_CONFIRM_WINDOW", str(WORKER_BATCH_SIZE * 2)))
+    ML_WARMUP_ENABLED: bool = os.getenv("ML_WARMUP_ENABLED", "true").lower() == "true"
+    COMPUTE_EXECUTOR: str = os.getenv("COMPUTE_EXECUTOR", "thread")
+    COMPUTE_MAX_WORKERS: int = int(os.getenv("COMPUTE_MAX_WORKERS", "0"))
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9108"))
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+    TRACING_EXPORT_PATH: str = os.getenv("TRACING_EXPORT_PATH", "traces/spans-{pid}.jsonl")
 
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
@@ -1,25 +1,74 @@
 import asyncio
-import json
 import logging
-from typing import Callable
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set
 
 from src.infrastructure.queue.queue_consumer import QueueConsumer
 from src.application.services.ml_processor_service import MLProcessorService
 from src.infrastructure.queue.rabbitmq_connection import RabbitMQConnection
+from src.infrastructure.queue.retry_policy import retry_policy
+from src.infrastructure.queue.message_codec import MessageCodec, TaskMessage
+from src.infrastructure.queue.messages import MessageDecodeError, ResultMessage
+from src.infrastructure.queue.queue_publisher import QueuePublisher
+from src.ports.queue.queue_consumer_port import QueueConsumerPort
+from src.ports.queue.queue_publisher_port import QueuePublisherPort
+from src.infrastructure.metrics.worker_metrics import (
+    MESSAGES_TOTAL,
+    NACKS_TOTAL,
+    TASK_SECONDS,
+    record_stage,
+    stage_scope,
+)
+from src.infrastructure.tracing.tracer import tracer
+from src.adapters.input.task_batcher import TaskBatcher
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 class QueueConsumerAdapter:
 
-    def __init__(self):
-        self.consumer = QueueConsumer()
-        self.processor = MLProcessorService()
+    def __init__(
+        self,
+        processor: Optional[MLProcessorService] = None,
+        consumer: Optional[QueueConsumerPort] = None,
+        publisher: Optional[QueuePublisherPort] = None,
+        coalesce_window_ms: Optional[int] = None
+    ):
+        self.consumer = consumer if consumer is not None else QueueConsumer()
+        self.processor = processor if processor is not None else MLProcessorService()
         self.running = False
+        self.connected = False
+        self.in_flight: Dict[str, Set[asyncio.Task]] = {}
+        self.retry_policy = retry_policy
+        self.queue_names = {
+            "forecast": settings.QUEUE_NAME_FORECAST,
+            "cluster": settings.QUEUE_NAME_CLUSTER
+        }
+        self.publisher = publisher
+        if publisher is None and settings.RESULT_PUBLISHING_ENABLED:
+            self.publisher = QueuePublisher()
+        if coalesce_window_ms is None:
+            coalesce_window_ms = settings.WORKER_COALESCE_WINDOW_MS
+        self.batcher = None
+        if coalesce_window_ms > 0:
+            self.batcher = TaskBatcher(
+                self.processor,
+                window_seconds=coalesce_window_ms / 1000,
+                max_batch=settings.WORKER_BATCH_SIZE,
+                min_ranch_batch=settings.WORKER_COALESCE_MIN_RANCH_BATCH
+            )
+
+    async def connect(self) -> None:
+        await self.consumer.connect()
+        if self.publisher is not None:
+            await self.publisher.declare_queue(settings.QUEUE_NAME_RESULTS)
+        self.connected = True
 
     async def start(self) -> None:
         try:
-            await self.consumer.connect()
+            if not self.connected:
+                await self.connect()
             self.running = True
             logger.info("Adaptador de consumer iniciado")
             await self._consume_messages()
@@ -30,68 +79,192 @@ class QueueConsumerAdapter:
     async def stop(self) -> None:
         try:
             self.running = False
+            if self.batcher is not None:
+                self.batcher.flush_all()
+            await self._drain_in_flight()
+            await self.processor.flush_queue_status()
+            if self.publisher is not None:
+                await self.publisher.wait_for_confirms()
             await self.consumer.disconnect()
+            self.connected = False
             logger.info("Adaptador de consumer detenido")
         except Exception as e:
             logger.error(f"Error deteniendo consumer adapter: {str(e)}")
 
-    async def _consume_messages(self) -> None:
-        channel = await RabbitMQConnection.get_channel()
+    def in_flight_count(self, queue_type: str = None) -> int:
+        if queue_type is None:
+            return sum(len(tasks) for tasks in self.in_flight.values())
+        return len(self.in_flight.get(queue_type, ()))
+
+    async def _drain_in_flight(self) -> None:
+        pending = set().union(*self.in_flight.values()) if self.in_flight else set()
+        if not pending:
+            return
 
-        queue_forecast = await channel.get_queue(settings.QUEUE_NAME_FORECAST)
-        queue_cluster = await channel.get_queue(settings.QUEUE_NAME_CLUSTER)
+        logger.info(f"Esperando {len(pending)} mensajes en proceso")
+        _, not_done = await asyncio.wait(pending, timeout=settings.WORKER_SHUTDOWN_TIMEOUT)
+        if not_done:
+            logger.warning(f"{len(not_done)} mensajes sin terminar al detener; se reentregarán")
+            for task in not_done:
+                task.cancel()
 
+    async def _consume_messages(self) -> None:
         await asyncio.gather(
-            self._consume_queue(queue_forecast, "forecast"),
-            self._consume_queue(queue_cluster, "cluster")
+            self._consume_queue(
+                settings.QUEUE_NAME_FORECAST,
+                "forecast",
+                settings.WORKER_CONCURRENCY_FORECAST
+            ),
+            self._consume_queue(
+                settings.QUEUE_NAME_CLUSTER,
+                "cluster",
+                settings.WORKER_CONCURRENCY_CLUSTER
+            )
         )
 
-    async def _consume_queue(self, queue, queue_type: str) -> None:
+    async def _consume_queue(self, queue_name: str, queue_type: str, concurrency: int) -> None:
+        channel = await RabbitMQConnection.create_channel(prefetch_count=concurrency)
+        queue = await channel.get_queue(queue_name)
+
+        slots = asyncio.Semaphore(concurrency)
+        tasks = self.in_flight.setdefault(queue_type, set())
+
+        def release(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            slots.release()
+
+        logger.info(f"Consumiendo {queue_name} con concurrencia {concurrency}")
+
         async with queue.iterator() as queue_iter:
             async for message in queue_iter:
-                async with message.process():
-                    try:
-                        body = json.loads(message.body.decode())
-                        await self._process_message(body, queue_type)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Error decodificando mensaje: {str(e)}")
-                        await message.nack(requeue=False)
-                    except Exception as e:
-                        logger.error(f"Error procesando mensaje: {str(e)}")
-                        await message.nack(requeue=True)
-
-    async def _process_message(self, body: dict, queue_type: str) -> None:
-        ranch_id = body.get("ranch_id")
-        animal_id = body.get("animal_id")
-        task_id = body.get("task_id")
-
-        if not all([ranch_id, animal_id, task_id]):
-            logger.warning(f"Mensaje incompleto en {queue_type}: {body}")
-            return
+                await slots.acquire()
+                if not self.running:
+                    slots.release()
+                    NACKS_TOTAL.inc(queue=queue_type)
+                    await self._settle(message.nack(requeue=True))
+                    break
 
-        if queue_type == "forecast":
-            result = await self.processor.process_forecasting_task(
-                ranch_id,
-                animal_id,
-                task_id
-            )
-        elif queue_type == "cluster":
-            result = await self.processor.process_clustering_task(
-                ranch_id,
-                animal_id,
-                task_id
+                task = asyncio.create_task(self._handle_message(message, queue_type))
+                tasks.add(task)
+                task.add_done_callback(release)
+
+    async def _handle_message(self, message, queue_type: str) -> None:
+        with tracer.start_trace(f"{queue_type}.message", queue=queue_type) as trace:
+            try:
+                with tracer.span("decode", bytes=len(message.body)):
+                    task = MessageCodec.decode_task(queue_type, message.body, message.content_type)
+            except MessageDecodeError as e:
+                logger.error(f"Error decodificando mensaje de {queue_type}: {str(e)}")
+                await self._route_failure(message, queue_type, f"Mensaje inválido: {str(e)}", retryable=False)
+                return
+
+            trace.set_correlation(task_id=task.task_id, ranch_id=task.ranch_id, animal_id=task.animal_id)
+
+            started = time.perf_counter()
+            try:
+                status = await self._process_message(task, queue_type)
+            except asyncio.CancelledError:
+                NACKS_TOTAL.inc(queue=queue_type)
+                await self._settle(message.nack(requeue=True))
+                raise
+            except Exception as e:
+                logger.error(f"Error procesando mensaje: {str(e)}")
+                await self._route_failure(message, queue_type, str(e))
+                return
+            finally:
+                TASK_SECONDS.observe(time.perf_counter() - started, queue=queue_type)
+
+            trace.set_attribute("outcome", status)
+            MESSAGES_TOTAL.inc(queue=queue_type, outcome=status)
+            await self._settle(message.ack())
+
+    async def _route_failure(self, message, queue_type: str, error: str, retryable: bool = True) -> None:
+        try:
+            channel = await RabbitMQConnection.get_channel()
+            outcome = await self.retry_policy.handle_failure(
+                channel,
+                message,
+                self.queue_names.get(queue_type, queue_type),
+                error,
+                retryable=retryable
             )
-        else:
-            logger.warning(f"Tipo de cola desconocida: {queue_type}")
+        except Exception as e:
+            logger.error(f"Error enrutando mensaje fallido, se reencola: {str(e)}")
+            NACKS_TOTAL.inc(queue=queue_type)
+            await self._settle(message.nack(requeue=True))
             return
 
+        tracer.current_span().set_attribute("outcome", outcome)
+        MESSAGES_TOTAL.inc(queue=queue_type, outcome=outcome)
+        await self._settle(message.ack())
+
+    @staticmethod
+    async def _settle(operation) -> None:
+        try:
+            await operation
+        except Exception as e:
+            logger.error(f"Error confirmando mensaje: {str(e)}")
+
+    async def _process_message(self, task: TaskMessage, queue_type: str) -> str:
+        operation = queue_type if task.animal_id is not None else f"{queue_type}_ranch"
+        with stage_scope(operation):
+            return await self._run_task(task, queue_type)
+
+    async def _run_task(self, task: TaskMessage, queue_type: str) -> str:
+        task_id = task.task_id
+
+        with tracer.span("process", batched=self.batcher is not None):
+            result = await self._dispatch_task(task, queue_type)
+
         status = result.get("status", "unknown")
         error = result.get("error")
 
-        await self.processor.update_queue_status(
-            task_id,
-            status.upper(),
-            error
+        status_started = time.perf_counter()
+        with tracer.span("queue_status.update", status=status.upper()):
+            await self.processor.update_queue_status(
+                task_id,
+                status.upper(),
+                error
+            )
+        record_stage("write", time.perf_counter() - status_started)
+
+        if self.publisher is not None:
+            with tracer.span("publish_result"):
+                await self._publish_result(task, queue_type, result)
+
+        logger.info(f"Mensaje procesado: {task_id} - {status}")
+        return status
+
+    async def _dispatch_task(self, task: TaskMessage, queue_type: str) -> dict:
+        if self.batcher is not None:
+            return await self.batcher.submit(queue_type, task)
+        if queue_type == "forecast" and task.animal_id is None:
+            return await self.processor.process_ranch_forecasting_task(task.ranch_id, task.task_id)
+        if queue_type == "cluster" and task.animal_id is None:
+            return await self.processor.process_ranch_clustering_task(task.ranch_id, task.task_id)
+        if queue_type == "forecast":
+            return await self.processor.process_forecasting_task(task.ranch_id, task.animal_id, task.task_id)
+        return await self.processor.process_clustering_task(task.ranch_id, task.animal_id, task.task_id)
+
+    async def _publish_result(self, task: TaskMessage, queue_type: str, result: dict) -> None:
+        result_type = queue_type if task.animal_id is not None else f"{queue_type}_ranch"
+        status = result.get("status", "unknown")
+        result_message = ResultMessage(
+            animal_id=str(task.animal_id) if task.animal_id is not None else None,
+            ranch_id=str(task.ranch_id),
+            result_type=result_type,
+            result_data=result.get("data") if status == "success" else {"error": result.get("error")},
+            timestamp=datetime.now().isoformat(),
+            status=status,
+            task_id=task.task_id
         )
 
-        logger.info(f"Mensaje procesado: {task_id} - {status}")
\ No newline at end of file
+        confirmed = await self.publisher.publish(
+            settings.QUEUE_NAME_RESULTS,
+            result_message.to_dict(),
+            message_id=task.task_id,
+            correlation_id=task.task_id,
+            type=result_type
+        )
+        if not confirmed:
+            raise RuntimeError(f"Resultado {task.task_id} no confirmado por el broker")
\ No newline at end of file
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.queue.message_codec import TaskMessage
+from src.infrastructure.metrics.worker_metrics import stage_scope
+from src.infrastructure.tracing.tracer import tracer
+
+logger = logging.getLogger(__name__)
+
+class TaskBatcher:
+
+    def __init__(self, processor, window_seconds: float, max_batch: int, min_ranch_batch: int = 1):
+        self.processor = processor
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.min_ranch_batch = min_ranch_batch
+        self._pending: Dict[str, List[Tuple[TaskMessage, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.messages = 0
+        self.computations = 0
+
+    async def submit(self, queue_type: str, task: TaskMessage) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(queue_type, [])
+        pending.append((task, future))
+
+        if len(pending) >= self.max_batch:
+            self.flush(queue_type)
+        elif len(pending) == 1:
+            self._timers[queue_type] = loop.call_later(self.window_seconds, self.flush, queue_type)
+
+        return await future
+
+    def flush(self, queue_type: str) -> None:
+        timer = self._timers.pop(queue_type, None)
+        if timer is not None:
+            timer.cancel()
+
+        items = self._pending.pop(queue_type, None)
+        if not items:
+            return
+
+        task = asyncio.create_task(self._dispatch(queue_type, items))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    def flush_all(self) -> None:
+        for queue_type in list(self._pending):
+            self.flush(queue_type)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "computations": self.computations,
+            "pending": sum(len(items) for items in self._pending.values())
+        }
+
+    async def _dispatch(self, queue_type: str, items: List[Tuple[TaskMessage, asyncio.Future]]) -> None:
+        tasks = [task for task, _ in items]
+        try:
+            with tracer.start_trace(f"{queue_type}.batch", queue=queue_type, messages=len(items)) as trace:
+                trace.set_correlation(
+                    task_id=[task.task_id for task in tasks],
+                    ranch_id=sorted({str(task.ranch_id) for task in tasks})
+                )
+                with stage_scope(f"{queue_type}_batch"):
+                    results = await self._run_batch(queue_type, tasks)
+        except Exception as e:
+            logger.error(f"Error procesando lote de {queue_type}: {str(e)}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run_batch(self, queue_type: str, tasks: List[TaskMessage]) -> List[Dict[str, Any]]:
+        ranches: Dict[UUID, Dict[str, Any]] = {}
+        for position, task in enumerate(tasks):
+            ranch = ranches.setdefault(task.ranch_id, {"ranch_tasks": [], "animals": {}})
+            if task.animal_id is not None:
+                ranch["animals"].setdefault(task.animal_id, []).append(position)
+            else:
+                ranch["ranch_tasks"].append(position)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        await asyncio.gather(*[
+            self._run_ranch(queue_type, ranch_id, group, tasks, results)
+            for ranch_id, group in ranches.items()
+        ])
+
+        self.batches += 1
+        self.messages += len(tasks)
+        logger.info(
+            f"Lote {queue_type}: {len(tasks)} mensajes de {len(ranches)} ranchos"
+        )
+        return results
+
+    async def _run_ranch(
+        self,
+        queue_type: str,
+        ranch_id: UUID,
+        group: Dict[str, Any],
+        tasks: List[TaskMessage],
+        results: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        ranch_tasks: List[int] = group["ranch_tasks"]
+        animals: Dict[UUID, List[int]] = group["animals"]
+
+        if not ranch_tasks and len(animals) < self.min_ranch_batch:
+            await asyncio.gather(*[
+                self._run_single(queue_type, ranch_id, animal_id, positions, tasks, results)
+                for animal_id, positions in animals.items()
+            ])
+            return
+
+        self.computations += 1
+        with tracer.span("process_batch", ranch_id=ranch_id, animals=len(animals), ranch_tasks=len(ranch_tasks)):
+            batch = await self._process_batch(
+                queue_type,
+                ranch_id,
+                None if ranch_tasks else list(animals)
+            )
+
+        for position in ranch_tasks:
+            results[position] = self._for_task(batch, tasks[position].task_id)
+
+        batch_results = batch.get("results", {}) if batch["status"] == "success" else {}
+        for animal_id, positions in animals.items():
+            if batch["status"] != "success":
+                single = batch
+            elif animal_id in batch_results:
+                single = {"status": "success", "data": batch_results[animal_id]}
+            else:
+                await self._run_single(queue_type, ranch_id, animal_id, positions, tasks, results)
+                continue
+
+            for position in positions:
+                results[position] = self._for_task(single, tasks[position].task_id)
+
+    async def _run_single(
+        self,
+        queue_type: str,
+        ranch_id: UUID,
+        animal_id: UUID,
+        positions: List[int],
+        tasks: List[TaskMessage],
+        results: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        self.computations += 1
+        single = await self._process_single(
+            queue_type,
+            ranch_id,
+            animal_id,
+            tasks[positions[0]].task_id
+        )
+
+        for position in positions:
+            results[position] = self._for_task(single, tasks[position].task_id)
+
+    async def _process_batch(self, queue_type: str, ranch_id: UUID, animal_ids: Optional[List[UUID]]) -> Dict[str, Any]:
+        if queue_type == "cluster":
+            return await self.processor.process_clustering_batch(ranch_id, animal_ids)
+        return await self.processor.process_forecasting_batch(ranch_id, animal_ids)
+
+    async def _process_single(self, queue_type: str, ranch_id: UUID, animal_id: UUID, task_id: str) -> Dict[str, Any]:
+        if queue_type == "cluster":
+            return await self.processor.process_clustering_task(ranch_id, animal_id, task_id)
+        return await self.processor.process_forecasting_task(ranch_id, animal_id, task_id)
+
+    @staticmethod
+    def _for_task(result: Dict[str, Any], task_id: str) -> Dict[str, Any]:
+        task_result = {"status": result["status"], "task_id": task_id}
+        if "data" in result:
+            task_result["data"] = result["data"]
+        if "error" in result:
+            task_result["error"] = result["error"]
+        return task_result
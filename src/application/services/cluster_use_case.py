@@ -1,25 +1,44 @@
+import asyncio
 import logging
 from uuid import UUID
 from datetime import date
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 import numpy as np
 
 from src.domain.services.clustering_service import ClusteringService
 from src.domain.services.ml_clustering_model import MLClusteringModel
+from src.domain.services.ml_incremental_clustering_model import MLIncrementalClusteringModel
+from src.ports.persistence.animal_port import AnimalRepository
+from src.ports.persistence.event_port import EventRepository
+from src.ports.persistence.prediction_port import PredictionRepository
 from src.infrastructure.persistence.animal_repository_impl import AnimalRepositoryImpl
 from src.infrastructure.persistence.event_repository_impl import EventRepositoryImpl
 from src.infrastructure.persistence.prediction_repository_impl import PredictionRepositoryImpl
+from src.infrastructure.cache.cluster_model_cache import ClusterModelEntry, Watermark, cluster_model_cache
+from src.infrastructure.compute.compute_executor import compute_executor
 from src.application.mappers.prediction_mapper import PredictionMapper
 from src.application.dto.cluster_result_dto import ClusterResultDTO
 from datetime import datetime
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 class ClusterUseCase:
 
-    def __init__(self):
-        self.animal_repo = AnimalRepositoryImpl()
-        self.event_repo = EventRepositoryImpl()
-        self.prediction_repo = PredictionRepositoryImpl()
+    def __init__(
+        self,
+        animal_repo: Optional[AnimalRepository] = None,
+        event_repo: Optional[EventRepository] = None,
+        prediction_repo: Optional[PredictionRepository] = None,
+        model_cache=None,
+        executor=None
+    ):
+        self.animal_repo = animal_repo if animal_repo is not None else AnimalRepositoryImpl()
+        self.event_repo = event_repo if event_repo is not None else EventRepositoryImpl()
+        self.prediction_repo = prediction_repo if prediction_repo is not None else PredictionRepositoryImpl()
+        self.model_cache = model_cache if model_cache is not None else cluster_model_cache
+        self.executor = executor if executor is not None else compute_executor
+        self._lote_loads: Dict[Tuple[UUID, Watermark], asyncio.Future] = {}
 
     async def execute(self, ranch_id: UUID, animal_id: UUID) -> ClusterResultDTO:
         try:
@@ -35,39 +54,16 @@ class ClusterUseCase:
                 explanation = "Datos insuficientes de pesajes para clustering"
                 severity = "warning"
             else:
-                all_animals = await self.animal_repo.find_active_by_ranch(ranch_id)
-                
-                lote_features = []
-                lote_gdps = []
-                
-                for other_animal in all_animals:
-                    other_weight_events = await self.event_repo.find_weight_events(
-                        other_animal.id,
-                        days_back=90
-                    )
-                    
-                    if other_weight_events and len(other_weight_events) >= 2:
-                        age_days = (date.today() - other_animal.birth_date).days if other_animal.birth_date else 365
-                        features = MLClusteringModel.prepare_features(other_weight_events, age_days)
-                        
-                        if features is not None:
-                            lote_features.append(features[0])
-                            
-                            gdp = ClusteringService.calculate_gdp(other_weight_events)
-                            lote_gdps.append(gdp)
-
-                if not lote_features or len(lote_features) < 3:
+                lote_model = await self._get_lote_model(ranch_id)
+
+                if lote_model.kmeans_model is None:
                     cluster_label = "PENDING"
                     confidence = 0.5
                     explanation = "Lote insuficiente para clustering (< 3 animales)"
                     severity = "warning"
                 else:
-                    lote_features_array = np.array(lote_features)
-                    
-                    kmeans_model, scaler, silhouette = MLClusteringModel.train_clustering_model(
-                        lote_features_array,
-                        n_clusters=3
-                    )
+                    kmeans_model = lote_model.kmeans_model
+                    scaler = lote_model.scaler
 
                     age_days = (date.today() - animal.birth_date).days if animal.birth_date else 365
                     animal_features = MLClusteringModel.prepare_features(weight_events, age_days)
@@ -78,8 +74,8 @@ class ClusterUseCase:
                         scaler
                     )
 
-                    lote_percentiles = ClusteringService.calculate_lote_percentiles(lote_gdps)
-                    
+                    lote_percentiles = lote_model.lote_percentiles
+
                     cluster_label, service_conf, explanation = ClusteringService.calculate_cluster_label(
                         animal,
                         weight_events,
@@ -92,29 +88,14 @@ class ClusterUseCase:
                     breeding_events = await self.event_repo.find_breeding_events(animal_id, days_back=365)
                     birth_events = await self.event_repo.find_birth_events(animal_id, days_back=365)
 
-                    if animal.last_birth_date:
-                        days_open = (date.today() - animal.last_birth_date).days
-                    else:
-                        days_open = 0
-
-                    if len(birth_events) >= 2:
-                        calving_interval = (birth_events[0][0] - birth_events[1][0]).days
-                    else:
-                        calving_interval = 0
-
-                    repro_label, repro_conf, repro_explanation = ClusteringService.evaluate_reproductive_status(
+                    cluster_label, confidence, explanation, severity = self._apply_reproductive_status(
                         animal,
-                        days_open,
-                        calving_interval
+                        cluster_label,
+                        confidence,
+                        explanation,
+                        birth_events
                     )
 
-                    if repro_label == "REPRO_PROBLEMA":
-                        cluster_label = repro_label
-                        confidence = repro_conf
-                        explanation = repro_explanation
-
-                    severity = "warning" if "REZAGA" in cluster_label or "PROBLEMA" in cluster_label else "info"
-
             await self.animal_repo.update_cluster_label(animal_id, cluster_label)
 
             prediction = PredictionMapper.to_prediction(
@@ -139,4 +120,341 @@ class ClusterUseCase:
             )
         except Exception as e:
             logger.error(f"Error en ClusterUseCase: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    async def execute_ranch(
+        self,
+        ranch_id: UUID,
+        animal_ids: Optional[Iterable[UUID]] = None
+    ) -> List[ClusterResultDTO]:
+        try:
+            targets = set(animal_ids) if animal_ids is not None else None
+
+            watermark = await self._get_watermark(ranch_id)
+            all_animals, lote_weight_events = await self._load_lote(ranch_id)
+            eligible_animals, lote_features, lote_gdps = await self.executor.run(
+                self._build_lote_features,
+                all_animals,
+                lote_weight_events,
+                label="cluster.features"
+            )
+
+            previous = self.model_cache.peek(ranch_id)
+            lote_model = self.model_cache.get(ranch_id, watermark)
+            if lote_model is None:
+                lote_model = await self._single_flight(ranch_id, watermark, lambda: self._train_lote_model(
+                    ranch_id,
+                    watermark,
+                    lote_features,
+                    lote_gdps,
+                    [animal.id for animal in eligible_animals],
+                    previous
+                ))
+
+            labels: Dict[UUID, str] = {}
+            predictions = []
+            results = []
+            now = datetime.now()
+
+            def add_result(animal_id, cluster_label, confidence, explanation, severity):
+                if targets is not None and animal_id not in targets:
+                    return
+                labels[animal_id] = cluster_label
+                predictions.append(PredictionMapper.to_prediction(
+                    ranch_id=ranch_id,
+                    animal_id=animal_id,
+                    prediction_type="cluster_assignment",
+                    prediction_date=date.today(),
+                    confidence_score=confidence,
+                    explanation=explanation,
+                    severity=severity
+                ))
+                results.append(ClusterResultDTO(
+                    animal_id=animal_id,
+                    ranch_id=ranch_id,
+                    cluster_label=cluster_label,
+                    confidence_score=confidence,
+                    explanation=explanation,
+                    severity=severity,
+                    timestamp=now
+                ))
+
+            eligible_ids = {animal.id for animal in eligible_animals}
+            for animal in all_animals:
+                if animal.id not in eligible_ids:
+                    add_result(
+                        animal.id,
+                        "PENDING",
+                        0.0,
+                        "Datos insuficientes de pesajes para clustering",
+                        "warning"
+                    )
+
+            if lote_model.kmeans_model is None:
+                for animal in eligible_animals:
+                    add_result(
+                        animal.id,
+                        "PENDING",
+                        0.5,
+                        "Lote insuficiente para clustering (< 3 animales)",
+                        "warning"
+                    )
+            else:
+                _, cluster_confidences = await self.executor.run(
+                    MLClusteringModel.predict_clusters,
+                    lote_features,
+                    lote_model.kmeans_model,
+                    lote_model.scaler,
+                    label="cluster.predict"
+                )
+                birth_events_by_animal = await self.event_repo.find_birth_events_by_ranch(
+                    ranch_id,
+                    days_back=365,
+                    animal_ids=[
+                        animal.id for animal in eligible_animals
+                        if targets is None or animal.id in targets
+                    ]
+                )
+
+                for idx, animal in enumerate(eligible_animals):
+                    if targets is not None and animal.id not in targets:
+                        continue
+                    cluster_label, service_conf, explanation = ClusteringService.label_from_gdp(
+                        lote_gdps[idx],
+                        lote_model.lote_percentiles
+                    )
+                    cluster_conf = float(cluster_confidences[idx]) if cluster_confidences is not None else 0.0
+                    confidence = (cluster_conf + service_conf) / 2
+
+                    cluster_label, confidence, explanation, severity = self._apply_reproductive_status(
+                        animal,
+                        cluster_label,
+                        confidence,
+                        explanation,
+                        birth_events_by_animal.get(animal.id, [])
+                    )
+                    add_result(animal.id, cluster_label, confidence, explanation, severity)
+
+            await self.animal_repo.update_cluster_labels(labels)
+            await self.prediction_repo.save_batch(predictions)
+
+            logger.info(f"Clustering de rancho {ranch_id} completado: {len(results)} animales")
+            return results
+        except Exception as e:
+            logger.error(f"Error en ClusterUseCase (rancho): {str(e)}")
+            raise
+
+    def _apply_reproductive_status(
+        self,
+        animal,
+        cluster_label: str,
+        confidence: float,
+        explanation: str,
+        birth_events: List[tuple]
+    ) -> Tuple[str, float, str, str]:
+        if animal.last_birth_date:
+            days_open = (date.today() - animal.last_birth_date).days
+        else:
+            days_open = 0
+
+        if len(birth_events) >= 2:
+            calving_interval = (birth_events[0][0] - birth_events[1][0]).days
+        else:
+            calving_interval = 0
+
+        repro_label, repro_conf, repro_explanation = ClusteringService.evaluate_reproductive_status(
+            animal,
+            days_open,
+            calving_interval
+        )
+
+        if repro_label == "REPRO_PROBLEMA":
+            cluster_label = repro_label
+            confidence = repro_conf
+            explanation = repro_explanation
+
+        severity = "warning" if "REZAGA" in cluster_label or "PROBLEMA" in cluster_label else "info"
+
+        return cluster_label, confidence, explanation, severity
+
+    async def _get_watermark(self, ranch_id: UUID) -> Watermark:
+        active_count, active_checksum = await self.animal_repo.get_active_fingerprint(ranch_id)
+        return (
+            await self.event_repo.get_weight_watermark(ranch_id),
+            active_count,
+            active_checksum,
+            date.today()
+        )
+
+    async def _get_lote_model(self, ranch_id: UUID) -> ClusterModelEntry:
+        watermark = await self._get_watermark(ranch_id)
+
+        previous = self.model_cache.peek(ranch_id)
+        cached = self.model_cache.get(ranch_id, watermark)
+        if cached is not None:
+            return cached
+
+        return await self._single_flight(
+            ranch_id,
+            watermark,
+            lambda: self._load_lote_model(ranch_id, watermark, previous)
+        )
+
+    async def _single_flight(
+        self,
+        ranch_id: UUID,
+        watermark: Watermark,
+        load: Callable[[], Awaitable[ClusterModelEntry]]
+    ) -> ClusterModelEntry:
+        key = (ranch_id, watermark)
+        loading = self._lote_loads.get(key)
+        if loading is None:
+            loading = asyncio.ensure_future(load())
+            self._lote_loads[key] = loading
+            loading.add_done_callback(lambda _: self._lote_loads.pop(key, None))
+        return await asyncio.shield(loading)
+
+    async def _load_lote_model(
+        self,
+        ranch_id: UUID,
+        watermark: Watermark,
+        previous: Optional[ClusterModelEntry]
+    ) -> ClusterModelEntry:
+        all_animals, lote_weight_events = await self._load_lote(ranch_id)
+        eligible_animals, lote_features, lote_gdps = await self.executor.run(
+            self._build_lote_features,
+            all_animals,
+            lote_weight_events,
+            label="cluster.features"
+        )
+
+        return await self._train_lote_model(
+            ranch_id,
+            watermark,
+            lote_features,
+            lote_gdps,
+            [animal.id for animal in eligible_animals],
+            previous
+        )
+
+    async def _load_lote(self, ranch_id: UUID) -> Tuple[list, Dict[UUID, List[tuple]]]:
+        all_animals = await self.animal_repo.find_active_by_ranch(ranch_id)
+        lote_weight_events = await self.event_repo.find_weight_events_by_ranch(
+            ranch_id,
+            days_back=90,
+            animal_ids=[other_animal.id for other_animal in all_animals]
+        )
+        return all_animals, lote_weight_events
+
+    @staticmethod
+    def _build_lote_features(
+        all_animals: list,
+        lote_weight_events: Dict[UUID, List[tuple]]
+    ) -> Tuple[list, np.ndarray, List[float]]:
+        animal_ids = [other_animal.id for other_animal in all_animals]
+        ages = np.array([
+            (date.today() - other_animal.birth_date).days if other_animal.birth_date else 365
+            for other_animal in all_animals
+        ], dtype=np.float64)
+
+        animal_index, timestamps, weights = MLClusteringModel.flatten_weight_events(
+            lote_weight_events,
+            animal_ids
+        )
+        features, valid = MLClusteringModel.prepare_features_batch(
+            animal_index,
+            timestamps,
+            weights,
+            len(all_animals),
+            ages
+        )
+
+        eligible_animals = [other_animal for other_animal, is_valid in zip(all_animals, valid) if is_valid]
+        lote_features = features[valid]
+        lote_gdps = lote_features[:, 0].tolist()
+
+        return eligible_animals, lote_features, lote_gdps
+
+    async def _train_lote_model(
+        self,
+        ranch_id: UUID,
+        watermark: Watermark,
+        lote_features: np.ndarray,
+        lote_gdps: List[float],
+        animal_ids: List[UUID],
+        previous: Optional[ClusterModelEntry] = None
+    ) -> ClusterModelEntry:
+        incremental = settings.CLUSTER_ENGINE == "minibatch"
+        if previous is None or previous.kmeans_model is None or not incremental:
+            previous = None
+
+        kmeans_model, scaler, quality = await self.executor.run(
+            self._fit_lote_model,
+            lote_features,
+            animal_ids,
+            previous.kmeans_model if previous else None,
+            previous.scaler if previous else None,
+            previous.animal_ids if previous else None,
+            previous.features if previous else None,
+            label="cluster.train"
+        )
+
+        entry = ClusterModelEntry(
+            kmeans_model=kmeans_model,
+            scaler=scaler,
+            lote_percentiles=ClusteringService.calculate_lote_percentiles(lote_gdps),
+            watermark=watermark,
+            n_animals=len(lote_features),
+            silhouette=quality["silhouette"] if quality else None,
+            quality=quality,
+            animal_ids=list(animal_ids) if incremental else None,
+            features=lote_features if incremental else None
+        )
+        self.model_cache.put(ranch_id, entry)
+        return entry
+
+    @staticmethod
+    def _fit_lote_model(
+        lote_features: np.ndarray,
+        animal_ids: List[UUID],
+        previous_model=None,
+        previous_scaler=None,
+        previous_ids: Optional[List[UUID]] = None,
+        previous_features: Optional[np.ndarray] = None
+    ) -> Tuple:
+        if len(lote_features) < 3:
+            return None, None, None
+
+        if previous_model is not None and previous_features is not None:
+            changed, removed = MLIncrementalClusteringModel.changed_rows(
+                previous_ids,
+                previous_features,
+                animal_ids,
+                lote_features
+            )
+            if len(changed) + removed <= settings.CLUSTER_PARTIAL_FIT_MAX_FRACTION * len(lote_features):
+                kmeans_model, scaler = MLClusteringModel.update_clustering_model(
+                    previous_model,
+                    previous_scaler,
+                    lote_features[changed]
+                )
+                if kmeans_model is not None:
+                    return kmeans_model, scaler, {
+                        "silhouette": None,
+                        "mode": "off",
+                        "seconds": 0.0,
+                        "sample_size": 0,
+                        "engine": "minibatch",
+                        "partial_fit": int(len(changed))
+                    }
+
+        return MLClusteringModel.fit_clustering_model(
+            lote_features,
+            n_clusters=3,
+            silhouette_mode=settings.CLUSTER_SILHOUETTE_MODE,
+            silhouette_exact_max=settings.CLUSTER_SILHOUETTE_EXACT_MAX,
+            silhouette_sample_size=settings.CLUSTER_SILHOUETTE_SAMPLE_SIZE,
+            engine=settings.CLUSTER_ENGINE,
+            previous_model=previous_model,
+            previous_scaler=previous_scaler
+        )
@@ -1,14 +1,21 @@
 import logging
 from uuid import UUID
 from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
 import numpy as np
 
 from src.domain.services.forecasting_service import ForecastingService
 from src.domain.services.ml_forecasting_model import MLForecastingModel
+from src.ports.persistence.animal_port import AnimalRepository
+from src.ports.persistence.event_port import EventRepository
+from src.ports.persistence.prediction_port import PredictionRepository
+from src.ports.persistence.ranch_port import RanchRepository
 from src.infrastructure.persistence.animal_repository_impl import AnimalRepositoryImpl
 from src.infrastructure.persistence.event_repository_impl import EventRepositoryImpl
 from src.infrastructure.persistence.ranch_repository_impl import RanchRepositoryImpl
+from src.infrastructure.persistence.cached_ranch_repository import CachedRanchRepository
 from src.infrastructure.persistence.prediction_repository_impl import PredictionRepositoryImpl
+from src.infrastructure.compute.compute_executor import compute_executor
 from src.application.mappers.prediction_mapper import PredictionMapper
 from src.application.dto.forecast_result_dto import ForecastResultDTO
 from datetime import datetime
@@ -17,11 +24,19 @@ logger = logging.getLogger(__name__)
 
 class ForecastUseCase:
 
-    def __init__(self):
-        self.animal_repo = AnimalRepositoryImpl()
-        self.event_repo = EventRepositoryImpl()
-        self.ranch_repo = RanchRepositoryImpl()
-        self.prediction_repo = PredictionRepositoryImpl()
+    def __init__(
+        self,
+        animal_repo: Optional[AnimalRepository] = None,
+        event_repo: Optional[EventRepository] = None,
+        ranch_repo: Optional[RanchRepository] = None,
+        prediction_repo: Optional[PredictionRepository] = None,
+        executor=None
+    ):
+        self.animal_repo = animal_repo if animal_repo is not None else AnimalRepositoryImpl()
+        self.event_repo = event_repo if event_repo is not None else EventRepositoryImpl()
+        self.ranch_repo = ranch_repo if ranch_repo is not None else CachedRanchRepository(RanchRepositoryImpl())
+        self.prediction_repo = prediction_repo if prediction_repo is not None else PredictionRepositoryImpl()
+        self.executor = executor if executor is not None else compute_executor
 
     async def execute(self, ranch_id: UUID, animal_id: UUID) -> ForecastResultDTO:
         try:
@@ -39,26 +54,21 @@ class ForecastUseCase:
             
             if weight_events:
                 current_weight = float(weight_events[0][1])
-                
-                days_arr, weights_arr = MLForecastingModel.prepare_weight_series(weight_events)
-                
-                if days_arr is not None and len(days_arr) >= 3:
-                    linear_model, _, r2_linear = MLForecastingModel.train_weight_regression(
-                        days_arr, weights_arr, polynomial_degree=1
-                    )
-                    
+
+                projection = await self.executor.run(
+                    self._project_weight_30d,
+                    weight_events,
+                    label="forecast.regression"
+                )
+
+                if projection is not None:
                     predicted_sale_date, sale_confidence = ForecastingService.forecast_sale_date(
                         current_weight,
                         ForecastingService.calculate_gdp_30days(weight_events),
                         production_goals.target_sale_weight_kg
                     )
 
-                    projected_weight_30d, weight_confidence = MLForecastingModel.predict_weight_30days(
-                        linear_model,
-                        None,
-                        days_arr,
-                        r2_linear if r2_linear else 0.7
-                    )
+                    projected_weight_30d, weight_confidence = projection
                 else:
                     predicted_sale_date, sale_confidence = None, 0.3
                     projected_weight_30d, weight_confidence = None, 0.3
@@ -67,94 +77,257 @@ class ForecastUseCase:
                 predicted_sale_date, sale_confidence = None, 0.0
                 projected_weight_30d, weight_confidence = None, 0.0
 
-            expected_calving_date, calving_confidence = ForecastingService.forecast_calving_date(
-                animal.last_insemination_date,
-                repro_settings.avg_gestation_days
-            )
+            breeding_events = await self.event_repo.find_breeding_events(animal_id, days_back=365)
 
-            if expected_calving_date:
-                suggested_dry_date, dry_confidence = ForecastingService.forecast_dry_off_date(
-                    expected_calving_date,
-                    repro_settings.days_to_dry_off
-                )
-            else:
-                suggested_dry_date, dry_confidence = None, 0.0
+            result = self._build_result(
+                ranch_id,
+                animal,
+                repro_settings,
+                current_weight,
+                predicted_sale_date,
+                sale_confidence,
+                projected_weight_30d,
+                weight_confidence,
+                len(breeding_events)
+            )
 
-            next_likely_heat_date, heat_confidence = ForecastingService.forecast_next_heat_date(
-                animal.last_heat_date,
-                repro_settings.estrus_cycle_days
+            await self.animal_repo.update_forecast_data(
+                animal_id,
+                result.predicted_sale_date,
+                result.expected_calving_date,
+                result.suggested_dry_date,
+                result.next_likely_heat_date,
+                result.projected_weight_30d
             )
 
-            age_days = (date.today() - animal.birth_date).days if animal.birth_date else 365
-            
-            breeding_events = await self.event_repo.find_breeding_events(animal_id, days_back=365)
-            
-            if animal.last_birth_date:
-                days_open = ForecastingService.calculate_days_open(animal.last_birth_date)
-            else:
-                days_open = 0
+            await self.prediction_repo.save(self._to_prediction(result))
 
-            conception_success = MLForecastingModel.estimate_conception_success(
-                age_days,
-                animal.health_score,
-                days_open,
-                len(breeding_events)
-            )
+            return result
+        except Exception as e:
+            logger.error(f"Error en ForecastUseCase: {str(e)}")
+            raise
 
-            overall_confidence = np.mean([
-                sale_confidence if sale_confidence else 0.3,
-                calving_confidence if calving_confidence else 0.3,
-                dry_confidence if dry_confidence else 0.3,
-                heat_confidence if heat_confidence else 0.3,
-                conception_success
-            ])
+    async def execute_ranch(
+        self,
+        ranch_id: UUID,
+        animal_ids: Optional[Iterable[UUID]] = None
+    ) -> List[ForecastResultDTO]:
+        try:
+            repro_settings = await self.ranch_repo.get_repro_settings(ranch_id)
+            production_goals = await self.ranch_repo.get_production_goals(ranch_id)
 
-            explanation = self._generate_explanation(
-                predicted_sale_date,
-                expected_calving_date,
-                current_weight,
-                conception_success
-            )
+            if not repro_settings or not production_goals:
+                raise ValueError(f"Configuración faltante para rancho {ranch_id}")
 
-            severity = "info" if overall_confidence >= 0.70 else "warning"
+            animals = await self.animal_repo.find_active_by_ranch(ranch_id)
+            if animal_ids is not None:
+                targets = set(animal_ids)
+                animals = [animal for animal in animals if animal.id in targets]
+            if not animals:
+                return []
 
-            await self.animal_repo.update_forecast_data(
-                animal_id,
-                predicted_sale_date,
-                expected_calving_date,
-                suggested_dry_date,
-                next_likely_heat_date,
-                projected_weight_30d
+            animal_ids = [animal.id for animal in animals]
+            weight_events_by_animal = await self.event_repo.find_weight_events_by_ranch(
+                ranch_id,
+                days_back=90,
+                animal_ids=animal_ids
             )
-
-            prediction = PredictionMapper.to_prediction(
-                ranch_id=ranch_id,
-                animal_id=animal_id,
-                prediction_type="forecast_update",
-                prediction_date=date.today(),
-                confidence_score=overall_confidence,
-                explanation=explanation,
-                severity=severity
+            breeding_events_by_animal = await self.event_repo.find_breeding_events_by_ranch(
+                ranch_id,
+                days_back=365,
+                animal_ids=animal_ids
             )
-            await self.prediction_repo.save(prediction)
-
-            return ForecastResultDTO(
-                animal_id=animal_id,
-                ranch_id=ranch_id,
-                predicted_sale_date=predicted_sale_date,
-                expected_calving_date=expected_calving_date,
-                suggested_dry_date=suggested_dry_date,
-                next_likely_heat_date=next_likely_heat_date,
-                projected_weight_30d=projected_weight_30d,
-                confidence_score=overall_confidence,
-                explanation=explanation,
-                severity=severity,
-                timestamp=datetime.now()
+
+            has_fit, r2_linear, projected_weights = await self.executor.run(
+                self._project_weights_30d_batch,
+                weight_events_by_animal,
+                animal_ids,
+                label="forecast.regression_batch"
             )
+
+            results = []
+            for idx, animal in enumerate(animals):
+                weight_events = weight_events_by_animal.get(animal.id, [])
+
+                if weight_events:
+                    current_weight = float(weight_events[0][1])
+
+                    if has_fit[idx]:
+                        predicted_sale_date, sale_confidence = ForecastingService.forecast_sale_date(
+                            current_weight,
+                            ForecastingService.calculate_gdp_30days(weight_events),
+                            production_goals.target_sale_weight_kg
+                        )
+                        projected_weight_30d = float(projected_weights[idx])
+                        weight_confidence = min(float(r2_linear[idx]) if r2_linear[idx] else 0.7, 0.90)
+                    else:
+                        predicted_sale_date, sale_confidence = None, 0.3
+                        projected_weight_30d, weight_confidence = None, 0.3
+                else:
+                    current_weight = 0.0
+                    predicted_sale_date, sale_confidence = None, 0.0
+                    projected_weight_30d, weight_confidence = None, 0.0
+
+                results.append(self._build_result(
+                    ranch_id,
+                    animal,
+                    repro_settings,
+                    current_weight,
+                    predicted_sale_date,
+                    sale_confidence,
+                    projected_weight_30d,
+                    weight_confidence,
+                    len(breeding_events_by_animal.get(animal.id, []))
+                ))
+
+            await self.animal_repo.update_forecast_data_batch([
+                (
+                    result.animal_id,
+                    result.predicted_sale_date,
+                    result.expected_calving_date,
+                    result.suggested_dry_date,
+                    result.next_likely_heat_date,
+                    result.projected_weight_30d
+                )
+                for result in results
+            ])
+            await self.prediction_repo.save_batch([self._to_prediction(result) for result in results])
+
+            logger.info(f"Forecasting de rancho {ranch_id} completado: {len(results)} animales")
+            return results
         except Exception as e:
-            logger.error(f"Error en ForecastUseCase: {str(e)}")
+            logger.error(f"Error en ForecastUseCase (rancho): {str(e)}")
             raise
 
+    @staticmethod
+    def _project_weight_30d(weight_events: List[tuple]) -> Optional[Tuple[float, float]]:
+        days_arr, weights_arr = MLForecastingModel.prepare_weight_series(weight_events)
+        if days_arr is None or len(days_arr) < 3:
+            return None
+
+        linear_model, _, r2_linear = MLForecastingModel.train_weight_regression(
+            days_arr, weights_arr, polynomial_degree=1
+        )
+
+        return MLForecastingModel.predict_weight_30days(
+            linear_model,
+            None,
+            days_arr,
+            r2_linear if r2_linear else 0.7
+        )
+
+    @staticmethod
+    def _project_weights_30d_batch(
+        weight_events_by_animal: Dict[UUID, List[tuple]],
+        animal_ids: List[UUID]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        offsets, days_arr, weights_arr = MLForecastingModel.prepare_weight_series_batch(
+            weight_events_by_animal,
+            animal_ids
+        )
+        coefficients, r2_linear, _ = MLForecastingModel.train_weight_regression_batch(
+            offsets,
+            days_arr,
+            weights_arr,
+            polynomial_degree=1
+        )
+        has_fit = ~np.isnan(r2_linear)
+        has_events = np.diff(offsets) > 0
+        last_days = np.zeros(len(animal_ids))
+        last_days[has_events] = days_arr[offsets[1:][has_events] - 1]
+        projected_weights = MLForecastingModel.evaluate_polynomial_batch(
+            np.nan_to_num(coefficients),
+            last_days + 30
+        )
+
+        return has_fit, r2_linear, projected_weights
+
+    def _build_result(
+        self,
+        ranch_id: UUID,
+        animal,
+        repro_settings,
+        current_weight: float,
+        predicted_sale_date,
+        sale_confidence: float,
+        projected_weight_30d,
+        weight_confidence: float,
+        breeding_event_count: int
+    ) -> ForecastResultDTO:
+        expected_calving_date, calving_confidence = ForecastingService.forecast_calving_date(
+            animal.last_insemination_date,
+            repro_settings.avg_gestation_days
+        )
+
+        if expected_calving_date:
+            suggested_dry_date, dry_confidence = ForecastingService.forecast_dry_off_date(
+                expected_calving_date,
+                repro_settings.days_to_dry_off
+            )
+        else:
+            suggested_dry_date, dry_confidence = None, 0.0
+
+        next_likely_heat_date, heat_confidence = ForecastingService.forecast_next_heat_date(
+            animal.last_heat_date,
+            repro_settings.estrus_cycle_days
+        )
+
+        age_days = (date.today() - animal.birth_date).days if animal.birth_date else 365
+
+        if animal.last_birth_date:
+            days_open = ForecastingService.calculate_days_open(animal.last_birth_date)
+        else:
+            days_open = 0
+
+        conception_success = MLForecastingModel.estimate_conception_success(
+            age_days,
+            animal.health_score,
+            days_open,
+            breeding_event_count
+        )
+
+        overall_confidence = np.mean([
+            sale_confidence if sale_confidence else 0.3,
+            calving_confidence if calving_confidence else 0.3,
+            dry_confidence if dry_confidence else 0.3,
+            heat_confidence if heat_confidence else 0.3,
+            conception_success
+        ])
+
+        explanation = self._generate_explanation(
+            predicted_sale_date,
+            expected_calving_date,
+            current_weight,
+            conception_success
+        )
+
+        severity = "info" if overall_confidence >= 0.70 else "warning"
+
+        return ForecastResultDTO(
+            animal_id=animal.id,
+            ranch_id=ranch_id,
+            predicted_sale_date=predicted_sale_date,
+            expected_calving_date=expected_calving_date,
+            suggested_dry_date=suggested_dry_date,
+            next_likely_heat_date=next_likely_heat_date,
+            projected_weight_30d=projected_weight_30d,
+            confidence_score=overall_confidence,
+            explanation=explanation,
+            severity=severity,
+            timestamp=datetime.now()
+        )
+
+    def _to_prediction(self, result: ForecastResultDTO):
+        return PredictionMapper.to_prediction(
+            ranch_id=result.ranch_id,
+            animal_id=result.animal_id,
+            prediction_type="forecast_update",
+            prediction_date=date.today(),
+            confidence_score=result.confidence_score,
+            explanation=result.explanation,
+            severity=result.severity
+        )
+
     def _generate_explanation(
         self,
         predicted_sale_date,
@@ -1,32 +1,40 @@
 import logging
 from uuid import UUID
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from src.application.services.cluster_use_case import ClusterUseCase
 from src.application.services.forecast_use_case import ForecastUseCase
-from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.persistence.postgres_pool import TRANSIENT_ERRORS
+from src.infrastructure.persistence.queue_status_writer import QueueStatusWriter
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 class MLProcessorService:
 
-    def __init__(self):
-        self.cluster_use_case = ClusterUseCase()
-        self.forecast_use_case = ForecastUseCase()
+    def __init__(
+        self,
+        cluster_use_case: Optional[ClusterUseCase] = None,
+        forecast_use_case: Optional[ForecastUseCase] = None,
+        status_writer: Optional[QueueStatusWriter] = None
+    ):
+        self.cluster_use_case = cluster_use_case if cluster_use_case is not None else ClusterUseCase()
+        self.forecast_use_case = forecast_use_case if forecast_use_case is not None else ForecastUseCase()
+        self.status_writer = status_writer if status_writer is not None else QueueStatusWriter(
+            flush_size=settings.QUEUE_STATUS_FLUSH_SIZE,
+            flush_interval_seconds=settings.QUEUE_STATUS_FLUSH_INTERVAL_MS / 1000
+        )
 
     async def process_clustering_task(
         self,
-        ranch_id: str,
-        animal_id: str,
+        ranch_id: UUID,
+        animal_id: UUID,
         task_id: str
     ) -> Dict[str, Any]:
         try:
             logger.info(f"Procesando clustering - Tarea {task_id}")
 
-            result = await self.cluster_use_case.execute(
-                UUID(ranch_id),
-                UUID(animal_id)
-            )
+            result = await self.cluster_use_case.execute(ranch_id, animal_id)
 
             logger.info(f"Clustering completado para animal {animal_id}: {result.cluster_label}")
 
@@ -35,6 +43,8 @@ class MLProcessorService:
                 "task_id": task_id,
                 "data": result.to_dict()
             }
+        except TRANSIENT_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Error en clustering {task_id}: {str(e)}")
             return {
@@ -43,19 +53,43 @@ class MLProcessorService:
                 "error": str(e)
             }
 
+    async def process_ranch_clustering_task(
+        self,
+        ranch_id: UUID,
+        task_id: str
+    ) -> Dict[str, Any]:
+        try:
+            logger.info(f"Procesando clustering de rancho - Tarea {task_id}")
+
+            results = await self.cluster_use_case.execute_ranch(ranch_id)
+
+            logger.info(f"Clustering de rancho {ranch_id} completado: {len(results)} animales")
+
+            return {
+                "status": "success",
+                "task_id": task_id,
+                "data": self._clustering_summary(ranch_id, results)
+            }
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Error en clustering de rancho {task_id}: {str(e)}")
+            return {
+                "status": "error",
+                "task_id": task_id,
+                "error": str(e)
+            }
+
     async def process_forecasting_task(
         self,
-        ranch_id: str,
-        animal_id: str,
+        ranch_id: UUID,
+        animal_id: UUID,
         task_id: str
     ) -> Dict[str, Any]:
         try:
             logger.info(f"Procesando forecasting - Tarea {task_id}")
 
-            result = await self.forecast_use_case.execute(
-                UUID(ranch_id),
-                UUID(animal_id)
-            )
+            result = await self.forecast_use_case.execute(ranch_id, animal_id)
 
             logger.info(f"Forecasting completado para animal {animal_id}")
 
@@ -64,6 +98,8 @@ class MLProcessorService:
                 "task_id": task_id,
                 "data": result.to_dict()
             }
+        except TRANSIENT_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Error en forecasting {task_id}: {str(e)}")
             return {
@@ -72,6 +108,113 @@ class MLProcessorService:
                 "error": str(e)
             }
 
+    async def process_ranch_forecasting_task(
+        self,
+        ranch_id: UUID,
+        task_id: str
+    ) -> Dict[str, Any]:
+        try:
+            logger.info(f"Procesando forecasting de rancho - Tarea {task_id}")
+
+            results = await self.forecast_use_case.execute_ranch(ranch_id)
+
+            logger.info(f"Forecasting de rancho {ranch_id} completado: {len(results)} animales")
+
+            return {
+                "status": "success",
+                "task_id": task_id,
+                "data": self._forecasting_summary(ranch_id, results)
+            }
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Error en forecasting de rancho {task_id}: {str(e)}")
+            return {
+                "status": "error",
+                "task_id": task_id,
+                "error": str(e)
+            }
+
+    async def process_clustering_batch(
+        self,
+        ranch_id: UUID,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[str, Any]:
+        try:
+            logger.info(
+                f"Procesando clustering en lote - Rancho {ranch_id}, "
+                f"{'todos los' if animal_ids is None else len(animal_ids)} animales"
+            )
+
+            results = await self.cluster_use_case.execute_ranch(
+                ranch_id,
+                animal_ids
+            )
+
+            return {
+                "status": "success",
+                "data": self._clustering_summary(ranch_id, results),
+                "results": {result.animal_id: result.to_dict() for result in results}
+            }
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Error en clustering en lote del rancho {ranch_id}: {str(e)}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    async def process_forecasting_batch(
+        self,
+        ranch_id: UUID,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[str, Any]:
+        try:
+            logger.info(
+                f"Procesando forecasting en lote - Rancho {ranch_id}, "
+                f"{'todos los' if animal_ids is None else len(animal_ids)} animales"
+            )
+
+            results = await self.forecast_use_case.execute_ranch(
+                ranch_id,
+                animal_ids
+            )
+
+            return {
+                "status": "success",
+                "data": self._forecasting_summary(ranch_id, results),
+                "results": {result.animal_id: result.to_dict() for result in results}
+            }
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception as e:
+            logger.error(f"Error en forecasting en lote del rancho {ranch_id}: {str(e)}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    @staticmethod
+    def _clustering_summary(ranch_id: UUID, results: list) -> Dict[str, Any]:
+        label_counts: Dict[str, int] = {}
+        for result in results:
+            label_counts[result.cluster_label] = label_counts.get(result.cluster_label, 0) + 1
+
+        return {
+            "ranch_id": str(ranch_id),
+            "processed": len(results),
+            "labels": label_counts
+        }
+
+    @staticmethod
+    def _forecasting_summary(ranch_id: UUID, results: list) -> Dict[str, Any]:
+        return {
+            "ranch_id": str(ranch_id),
+            "processed": len(results),
+            "with_sale_date": sum(1 for result in results if result.predicted_sale_date)
+        }
+
     async def update_queue_status(
         self,
         task_id: str,
@@ -79,19 +222,10 @@ class MLProcessorService:
         error_message: str = None
     ) -> None:
         try:
-            if error_message:
-                query = """
-                    UPDATE processing_queue
-                    SET status = %s, error_message = %s, processed_at = NOW()
-                    WHERE id = %s
-                """
-                await PostgresPool.execute_update(query, (status, error_message, task_id))
-            else:
-                query = """
-                    UPDATE processing_queue
-                    SET status = %s, processed_at = NOW()
-                    WHERE id = %s
-                """
-                await PostgresPool.execute_update(query, (status, task_id))
+            await self.status_writer.update(task_id, status, error_message)
         except Exception as e:
-            logger.error(f"Error actualizando status de queue: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error actualizando status de queue: {str(e)}")
+            raise
+
+    async def flush_queue_status(self) -> None:
+        await self.status_writer.flush()
@@ -42,7 +42,10 @@ class ClusteringService:
             return ClusterLabel.PENDING, 0.0, "Datos insuficientes para clustering"
 
         gdp = ClusteringService.calculate_gdp(weight_events)
-        
+        return ClusteringService.label_from_gdp(gdp, lote_percentiles)
+
+    @staticmethod
+    def label_from_gdp(gdp: float, lote_percentiles: dict) -> Tuple[str, float, str]:
         if gdp >= lote_percentiles.get("p75", 0.8):
             return (
                 ClusterLabel.PRODUCTIVO_A,
@@ -1,14 +1,23 @@
 import numpy as np
-import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
 import logging
+import time
 from typing import List, Tuple, Dict
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from src.domain.services.ml_incremental_clustering_model import MLIncrementalClusteringModel
 
 logger = logging.getLogger(__name__)
 
+MICROSECONDS_PER_DAY = 86_400_000_000
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def event_timestamp_us(value) -> int:
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    epoch = EPOCH if value.tzinfo is None else EPOCH_UTC
+    return (value - epoch) // timedelta(microseconds=1)
+
 class MLClusteringModel:
 
     @staticmethod
@@ -38,6 +47,95 @@ class MLClusteringModel:
 
         return np.array(features).reshape(1, -1)
 
+    @staticmethod
+    def flatten_weight_events(
+        weight_events_by_animal: Dict,
+        animal_ids: List
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        animal_index = []
+        timestamps = []
+        weights = []
+
+        for idx, animal_id in enumerate(animal_ids):
+            for event in weight_events_by_animal.get(animal_id, ()):
+                animal_index.append(idx)
+                timestamps.append(event_timestamp_us(event[0]))
+                weights.append(float(event[1]))
+
+        return (
+            np.array(animal_index, dtype=np.int64),
+            np.array(timestamps, dtype=np.int64),
+            np.array(weights, dtype=np.float64)
+        )
+
+    @staticmethod
+    def prepare_features_batch(
+        animal_index: np.ndarray,
+        timestamps: np.ndarray,
+        weights: np.ndarray,
+        n_animals: int,
+        animal_ages_days: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        features = np.full((n_animals, 6), np.nan)
+        counts = np.bincount(animal_index, minlength=n_animals)
+        valid = counts >= 2
+
+        if animal_ages_days is None:
+            ages = np.full(n_animals, 365.0)
+        else:
+            ages = np.asarray(animal_ages_days, dtype=np.float64)
+            ages = np.where(np.isnan(ages) | (ages == 0), 365.0, ages)
+
+        if not valid.any():
+            return features, valid
+
+        positions = np.arange(len(animal_index))
+        by_date = np.lexsort((positions, timestamps, animal_index))
+        sorted_weights = weights[by_date]
+        sorted_timestamps = timestamps[by_date]
+
+        starts = np.zeros(n_animals, dtype=np.int64)
+        starts[1:] = np.cumsum(counts)[:-1]
+        starts = starts[valid]
+        group_counts = counts[valid]
+        ends = starts + group_counts - 1
+
+        first_weight = sorted_weights[starts]
+        last_weight = sorted_weights[ends]
+        days_diff = (sorted_timestamps[ends] - sorted_timestamps[starts]) // MICROSECONDS_PER_DAY
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gdp = np.where(days_diff != 0, (last_weight - first_weight) / days_diff, 0.0)
+        gdp = np.maximum(gdp, 0.0)
+
+        weight_trend = last_weight - sorted_weights[ends - 1]
+
+        group_ids = np.repeat(np.arange(len(starts)), group_counts)
+        valid_weights = sorted_weights[valid[animal_index[by_date]]]
+        means = np.bincount(group_ids, weights=valid_weights) / group_counts
+        squared = np.bincount(group_ids, weights=(valid_weights - means[group_ids]) ** 2)
+        weight_variance = np.sqrt(squared / group_counts)
+
+        by_weight = np.lexsort((valid_weights, group_ids))
+        weights_by_value = valid_weights[by_weight]
+        value_starts = np.zeros(len(group_counts), dtype=np.int64)
+        value_starts[1:] = np.cumsum(group_counts)[:-1]
+        weight_median = (
+            weights_by_value[value_starts + (group_counts - 1) // 2]
+            + weights_by_value[value_starts + group_counts // 2]
+        ) / 2
+
+        features[valid] = np.column_stack([
+            gdp,
+            last_weight,
+            weight_trend,
+            weight_variance,
+            weight_median,
+            ages[valid]
+        ])
+
+        return features, valid
+
     @staticmethod
     def _calculate_gdp(weights: np.ndarray, dates: np.ndarray) -> float:
         if len(weights) < 2:
@@ -52,31 +150,136 @@ class MLClusteringModel:
         return max(gdp, 0.0)
 
     @staticmethod
-    def train_clustering_model(lote_animals_features: np.ndarray, n_clusters: int = 3) -> Tuple:
+    def train_clustering_model(
+        lote_animals_features: np.ndarray,
+        n_clusters: int = 3,
+        silhouette_mode: str = "exact"
+    ) -> Tuple:
+        kmeans, scaler, quality = MLClusteringModel.fit_clustering_model(
+            lote_animals_features,
+            n_clusters=n_clusters,
+            silhouette_mode=silhouette_mode
+        )
+        return kmeans, scaler, quality["silhouette"] if quality else None
+
+    @staticmethod
+    def fit_clustering_model(
+        lote_animals_features: np.ndarray,
+        n_clusters: int = 3,
+        silhouette_mode: str = "auto",
+        silhouette_exact_max: int = 2000,
+        silhouette_sample_size: int = 2000,
+        engine: str = "kmeans",
+        previous_model=None,
+        previous_scaler=None
+    ) -> Tuple:
         if lote_animals_features is None or len(lote_animals_features) < 3:
             return None, None, None
 
         try:
-            scaler = StandardScaler()
-            features_scaled = scaler.fit_transform(lote_animals_features)
-
-            kmeans = KMeans(
-                n_clusters=min(n_clusters, len(lote_animals_features)),
-                random_state=42,
-                n_init=10,
-                max_iter=300
+            if engine == "minibatch":
+                kmeans, scaler = MLIncrementalClusteringModel.fit(
+                    lote_animals_features,
+                    n_clusters=n_clusters,
+                    previous_model=previous_model,
+                    previous_scaler=previous_scaler
+                )
+                features_scaled = scaler.transform(lote_animals_features)
+            elif engine == "kmeans":
+                from sklearn.cluster import KMeans
+                from sklearn.preprocessing import StandardScaler
+
+                scaler = StandardScaler()
+                features_scaled = scaler.fit_transform(lote_animals_features)
+
+                kmeans = KMeans(
+                    n_clusters=min(n_clusters, len(lote_animals_features)),
+                    random_state=42,
+                    n_init=10,
+                    max_iter=300
+                )
+                kmeans.fit(features_scaled)
+            else:
+                raise ValueError(f"Motor de clustering inválido: {engine}")
+
+            quality = MLClusteringModel.score_clustering(
+                features_scaled,
+                kmeans.labels_,
+                mode=silhouette_mode,
+                exact_max=silhouette_exact_max,
+                sample_size=silhouette_sample_size
             )
-            kmeans.fit(features_scaled)
+            quality["engine"] = engine
+            quality["warm_start"] = previous_model is not None and engine == "minibatch"
 
-            silhouette_avg = silhouette_score(features_scaled, kmeans.labels_)
-            
-            logger.info(f"Clustering entrenado: {n_clusters} clusters, silhouette: {silhouette_avg:.3f}")
+            silhouette_text = f"{quality['silhouette']:.3f}" if quality["silhouette"] is not None else "n/a"
+            logger.info(
+                f"Clustering entrenado ({engine}): {n_clusters} clusters, silhouette: {silhouette_text} "
+                f"({quality['mode']}, {quality['seconds'] * 1000:.1f} ms)"
+            )
 
-            return kmeans, scaler, silhouette_avg
+            return kmeans, scaler, quality
         except Exception as e:
             logger.error(f"Error entrenando clustering: {str(e)}")
             return None, None, None
 
+    @staticmethod
+    def update_clustering_model(
+        kmeans_model,
+        scaler,
+        changed_features: np.ndarray
+    ) -> Tuple:
+        try:
+            kmeans_model = MLIncrementalClusteringModel.partial_update(kmeans_model, scaler, changed_features)
+            logger.info(f"Clustering actualizado (partial_fit): {len(changed_features)} animales")
+            return kmeans_model, scaler
+        except Exception as e:
+            logger.error(f"Error actualizando clustering: {str(e)}")
+            return None, None
+
+    @staticmethod
+    def score_clustering(
+        features_scaled: np.ndarray,
+        labels: np.ndarray,
+        mode: str = "auto",
+        exact_max: int = 2000,
+        sample_size: int = 2000,
+        random_state: int = 42
+    ) -> Dict:
+        n_samples = len(features_scaled)
+
+        if mode == "auto":
+            mode = "exact" if n_samples <= exact_max else "sampled"
+
+        if mode not in ("exact", "sampled", "off"):
+            raise ValueError(f"Modo de silhouette inválido: {mode}")
+
+        n_labels = len(np.unique(labels))
+        if mode == "off" or n_labels < 2 or n_labels >= n_samples:
+            return {"silhouette": None, "mode": mode, "seconds": 0.0, "sample_size": 0}
+
+        from sklearn.metrics import silhouette_score
+
+        started = time.perf_counter()
+        if mode == "sampled" and n_samples > sample_size:
+            silhouette_avg = silhouette_score(
+                features_scaled,
+                labels,
+                sample_size=sample_size,
+                random_state=random_state
+            )
+            used_samples = sample_size
+        else:
+            silhouette_avg = silhouette_score(features_scaled, labels)
+            used_samples = n_samples
+
+        return {
+            "silhouette": float(silhouette_avg),
+            "mode": mode,
+            "seconds": time.perf_counter() - started,
+            "sample_size": used_samples
+        }
+
     @staticmethod
     def predict_cluster(
         animal_features: np.ndarray,
@@ -100,6 +303,30 @@ class MLClusteringModel:
             logger.error(f"Error prediciendo cluster: {str(e)}")
             return None, 0.0
 
+    @staticmethod
+    def predict_clusters(
+        lote_features: np.ndarray,
+        kmeans_model,
+        scaler
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if kmeans_model is None or scaler is None or lote_features is None or len(lote_features) == 0:
+            return None, None
+
+        try:
+            features_scaled = scaler.transform(lote_features)
+            cluster_labels = kmeans_model.predict(features_scaled)
+
+            distances = np.linalg.norm(
+                features_scaled - kmeans_model.cluster_centers_[cluster_labels],
+                axis=1
+            )
+            confidences = np.minimum(1.0 / (1.0 + distances), 1.0)
+
+            return cluster_labels, confidences
+        except Exception as e:
+            logger.error(f"Error prediciendo clusters del lote: {str(e)}")
+            return None, None
+
     @staticmethod
     def map_cluster_to_label(cluster_num: int, cluster_characteristics: Dict) -> Tuple[str, str]:
         if cluster_num is None:
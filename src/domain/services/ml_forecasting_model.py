@@ -1,12 +1,12 @@
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.metrics import r2_score, mean_absolute_error
+from numpy.polynomial import Polynomial
 import logging
+import math
 from typing import List, Tuple, Optional
 from datetime import datetime, date, timedelta
 
+from src.domain.services.ml_clustering_model import MICROSECONDS_PER_DAY, event_timestamp_us
+
 logger = logging.getLogger(__name__)
 
 class MLForecastingModel:
@@ -34,6 +34,10 @@ class MLForecastingModel:
         if days_from_first is None or weights is None or len(days_from_first) < 3:
             return None, None, None
 
+        from sklearn.linear_model import LinearRegression
+        from sklearn.metrics import mean_absolute_error, r2_score
+        from sklearn.preprocessing import PolynomialFeatures
+
         try:
             X = days_from_first.reshape(-1, 1)
             
@@ -57,6 +61,139 @@ class MLForecastingModel:
             logger.error(f"Error entrenando regresión de peso: {str(e)}")
             return None, None, None
 
+    @staticmethod
+    def prepare_weight_series_batch(
+        weight_events_by_animal: dict,
+        animal_ids: list
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        counts = np.array([len(weight_events_by_animal.get(animal_id, ())) for animal_id in animal_ids], dtype=np.int64)
+        offsets = np.zeros(len(animal_ids) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+
+        animal_index = np.repeat(np.arange(len(animal_ids)), counts)
+        timestamps = np.empty(offsets[-1], dtype=np.int64)
+        weights = np.empty(offsets[-1], dtype=np.float64)
+
+        position = 0
+        for animal_id in animal_ids:
+            for event in weight_events_by_animal.get(animal_id, ()):
+                timestamps[position] = event_timestamp_us(event[0])
+                weights[position] = float(event[1])
+                position += 1
+
+        order = np.lexsort((np.arange(len(animal_index)), timestamps, animal_index))
+        timestamps = timestamps[order]
+        weights = weights[order]
+
+        first_timestamps = np.repeat(timestamps[offsets[:-1][counts > 0]], counts[counts > 0])
+        days_from_first = ((timestamps - first_timestamps) // MICROSECONDS_PER_DAY).astype(np.float64)
+
+        return offsets, days_from_first, weights
+
+    @staticmethod
+    def train_weight_regression_batch(
+        offsets: np.ndarray,
+        days_from_first: np.ndarray,
+        weights: np.ndarray,
+        polynomial_degree: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        offsets = np.asarray(offsets, dtype=np.int64)
+        days_from_first = np.asarray(days_from_first, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        n_series = len(offsets) - 1
+        n_terms = polynomial_degree + 1
+        counts = np.diff(offsets)
+        series_index = np.repeat(np.arange(n_series), counts)
+
+        coefficients = np.full((n_series, n_terms), np.nan)
+        r2 = np.full(n_series, np.nan)
+        mae = np.full(n_series, np.nan)
+
+        valid = counts >= 3
+        if not valid.any():
+            return coefficients, r2, mae
+
+        safe_counts = np.maximum(counts, 1)
+        center = np.bincount(series_index, weights=days_from_first, minlength=n_series) / safe_counts
+        spread = np.sqrt(
+            np.bincount(series_index, weights=(days_from_first - center[series_index]) ** 2, minlength=n_series)
+            / safe_counts
+        )
+        spread = np.where(spread > 0, spread, 1.0)
+        u = (days_from_first - center[series_index]) / spread[series_index]
+
+        powers = u[:, None] ** np.arange(2 * polynomial_degree + 1)
+        moments = np.stack([
+            np.bincount(series_index, weights=powers[:, k], minlength=n_series)
+            for k in range(2 * polynomial_degree + 1)
+        ], axis=1)
+        rhs = np.stack([
+            np.bincount(series_index, weights=powers[:, k] * weights, minlength=n_series)
+            for k in range(n_terms)
+        ], axis=1)
+
+        term = np.arange(n_terms)
+        gram = moments[:, term[:, None] + term[None, :]]
+        scaled_coefficients = np.einsum(
+            "nij,nj->ni",
+            np.linalg.pinv(gram[valid]),
+            rhs[valid]
+        )
+
+        coefficients[valid] = MLForecastingModel._unscale_coefficients(
+            scaled_coefficients,
+            center[valid],
+            spread[valid]
+        )
+
+        fitted = np.zeros(len(weights))
+        point_valid = valid[series_index]
+        fitted[point_valid] = MLForecastingModel.evaluate_polynomial_batch(
+            coefficients[series_index[point_valid]],
+            days_from_first[point_valid]
+        )
+        residuals = weights - fitted
+
+        mean_weight = np.bincount(series_index, weights=weights, minlength=n_series) / safe_counts
+        ss_res = np.bincount(series_index, weights=residuals ** 2, minlength=n_series)
+        ss_tot = np.bincount(series_index, weights=(weights - mean_weight[series_index]) ** 2, minlength=n_series)
+        abs_res = np.bincount(series_index, weights=np.abs(residuals), minlength=n_series)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2_valid = np.where(
+                ss_tot > 0,
+                1.0 - ss_res / ss_tot,
+                np.where(np.isclose(ss_res, 0.0), 1.0, 0.0)
+            )
+        r2[valid] = r2_valid[valid]
+        mae[valid] = abs_res[valid] / counts[valid]
+
+        return coefficients, r2, mae
+
+    @staticmethod
+    def evaluate_polynomial_batch(coefficients: np.ndarray, days: np.ndarray) -> np.ndarray:
+        days = np.asarray(days, dtype=np.float64)
+        result = np.zeros(np.broadcast(coefficients[..., 0], days).shape)
+        for power in range(coefficients.shape[-1] - 1, -1, -1):
+            result = result * days + coefficients[..., power]
+        return result
+
+    @staticmethod
+    def _unscale_coefficients(
+        scaled_coefficients: np.ndarray,
+        center: np.ndarray,
+        spread: np.ndarray
+    ) -> np.ndarray:
+        n_terms = scaled_coefficients.shape[1]
+        coefficients = np.zeros_like(scaled_coefficients)
+        for power in range(n_terms):
+            scaled = scaled_coefficients[:, power] / spread ** power
+            for k in range(power + 1):
+                binomial = math.comb(power, k)
+                coefficients[:, k] += scaled * binomial * (-center) ** (power - k)
+        return coefficients
+
     @staticmethod
     def predict_sale_date(
         current_weight: float,
@@ -77,26 +214,80 @@ class MLForecastingModel:
             return None, 0.0
 
         try:
-            max_days = 730
-            for days_ahead in range(1, max_days):
-                X_test = np.array([[days_from_first[-1] + days_ahead]])
-                
-                if poly_features is not None:
-                    X_test_transformed = poly_features.transform(X_test)
-                    predicted_weight = model.predict(X_test_transformed)[0]
-                else:
-                    predicted_weight = model.predict(X_test)[0]
-
-                if predicted_weight >= target_weight:
-                    confidence = min(model_r2, 0.95)
-                    predicted_date = current_date + timedelta(days=days_ahead)
-                    return predicted_date, confidence
+            days_ahead = MLForecastingModel.first_day_reaching_weight(
+                model,
+                poly_features,
+                float(days_from_first[-1]),
+                target_weight
+            )
+
+            if days_ahead is not None:
+                confidence = min(model_r2, 0.95)
+                predicted_date = current_date + timedelta(days=days_ahead)
+                return predicted_date, confidence
 
             return None, 0.3
         except Exception as e:
             logger.error(f"Error prediciendo fecha de venta: {str(e)}")
             return None, 0.0
 
+    @staticmethod
+    def first_day_reaching_weight(
+        model,
+        poly_features,
+        last_day: float,
+        target_weight: float,
+        max_days: int = 730
+    ) -> Optional[int]:
+        coefficients = MLForecastingModel._polynomial_coefficients(model, poly_features)
+
+        if coefficients is None:
+            horizon = np.arange(1, max_days)
+            predicted = MLForecastingModel._predict_days(model, poly_features, last_day + horizon)
+            reached = np.flatnonzero(predicted >= target_weight)
+            return int(horizon[reached[0]]) if len(reached) else None
+
+        shifted = Polynomial(coefficients)(Polynomial([last_day, 1.0])) - target_weight
+        shifted = shifted.trim()
+
+        candidates = {1}
+        if shifted.degree() > 0:
+            for root in shifted.roots():
+                crossing = int(np.ceil(np.real(root)))
+                candidates.update((crossing - 1, crossing, crossing + 1))
+
+        candidates = np.array(sorted(d for d in candidates if 1 <= d < max_days))
+        predicted = MLForecastingModel._predict_days(model, poly_features, last_day + candidates)
+        reached = np.flatnonzero(predicted >= target_weight)
+
+        return int(candidates[reached[0]]) if len(reached) else None
+
+    @staticmethod
+    def _polynomial_coefficients(model, poly_features) -> Optional[np.ndarray]:
+        coef = np.ravel(getattr(model, "coef_", []))
+        intercept = float(np.ravel(getattr(model, "intercept_", 0.0))[0])
+
+        if poly_features is None:
+            if len(coef) != 1:
+                return None
+            return np.array([intercept, coef[0]])
+
+        powers = getattr(poly_features, "powers_", None)
+        if powers is None or powers.shape != (len(coef), 1):
+            return None
+
+        coefficients = np.zeros(int(powers.max()) + 1)
+        np.add.at(coefficients, powers[:, 0], coef)
+        coefficients[0] += intercept
+        return coefficients
+
+    @staticmethod
+    def _predict_days(model, poly_features, days: np.ndarray) -> np.ndarray:
+        X = np.asarray(days, dtype=np.float64).reshape(-1, 1)
+        if poly_features is not None:
+            X = poly_features.transform(X)
+        return model.predict(X)
+
     @staticmethod
     def predict_weight_30days(
         model,
@@ -0,0 +1,98 @@
+import copy
+import numpy as np
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class MLIncrementalClusteringModel:
+
+    @staticmethod
+    def fit(
+        lote_animals_features: np.ndarray,
+        n_clusters: int = 3,
+        previous_model=None,
+        previous_scaler=None,
+        batch_size: int = 1024,
+        random_state: int = 42
+    ) -> Tuple:
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.preprocessing import StandardScaler
+
+        n_clusters = min(n_clusters, len(lote_animals_features))
+
+        scaler = StandardScaler()
+        features_scaled = scaler.fit_transform(lote_animals_features)
+
+        init = MLIncrementalClusteringModel._warm_start_centroids(
+            previous_model,
+            previous_scaler,
+            scaler,
+            n_clusters
+        )
+        if init is None:
+            init = MLIncrementalClusteringModel._ordered_initial_centroids(
+                features_scaled,
+                n_clusters,
+                random_state
+            )
+
+        model = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            init=init,
+            n_init=1,
+            batch_size=batch_size,
+            max_iter=100,
+            random_state=random_state
+        )
+        model.fit(features_scaled)
+
+        return model, scaler
+
+    @staticmethod
+    def partial_update(model, scaler, changed_features: np.ndarray):
+        if model is None or scaler is None or changed_features is None or len(changed_features) == 0:
+            return model
+
+        updated = copy.deepcopy(model)
+        updated.partial_fit(scaler.transform(changed_features))
+        return updated
+
+    @staticmethod
+    def changed_rows(
+        previous_ids: List,
+        previous_features: np.ndarray,
+        animal_ids: List,
+        lote_animals_features: np.ndarray
+    ) -> Tuple[np.ndarray, int]:
+        previous_index = {animal_id: idx for idx, animal_id in enumerate(previous_ids)}
+        positions = np.array([previous_index.get(animal_id, -1) for animal_id in animal_ids], dtype=np.int64)
+
+        known = positions >= 0
+        changed = ~known
+        if known.any():
+            changed[known] = ~np.all(
+                np.isclose(previous_features[positions[known]], lote_animals_features[known]),
+                axis=1
+            )
+
+        removed = len(previous_ids) - int(known.sum())
+        return np.flatnonzero(changed), removed
+
+    @staticmethod
+    def _warm_start_centroids(previous_model, previous_scaler, scaler, n_clusters: int) -> np.ndarray:
+        if previous_model is None or previous_scaler is None:
+            return None
+
+        centroids = previous_model.cluster_centers_
+        if len(centroids) != n_clusters:
+            return None
+
+        return scaler.transform(previous_scaler.inverse_transform(centroids))
+
+    @staticmethod
+    def _ordered_initial_centroids(features_scaled: np.ndarray, n_clusters: int, random_state: int) -> np.ndarray:
+        from sklearn.cluster import kmeans_plusplus
+
+        centroids, _ = kmeans_plusplus(features_scaled, n_clusters, random_state=random_state)
+        return centroids[np.argsort(centroids[:, 0], kind="stable")]
@@ -0,0 +1,131 @@
+import logging
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional, Tuple, Any
+from uuid import UUID
+
+import numpy as np
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+Watermark = Tuple[Optional[datetime], int, int, date]
+
+@dataclass
+class ClusterModelEntry:
+    kmeans_model: Any
+    scaler: Any
+    lote_percentiles: dict
+    watermark: Watermark
+    n_animals: int
+    silhouette: Optional[float] = None
+    quality: Optional[dict] = None
+    animal_ids: Optional[list] = None
+    features: Optional[np.ndarray] = None
+    size_bytes: int = field(default=0)
+
+    def __post_init__(self):
+        if not self.size_bytes:
+            self.size_bytes = self._estimate_size()
+
+    def _estimate_size(self) -> int:
+        total = sys.getsizeof(self.lote_percentiles)
+        if self.features is not None:
+            total += self.features.nbytes
+        if self.animal_ids is not None:
+            total += sys.getsizeof(self.animal_ids) + sum(sys.getsizeof(animal_id) for animal_id in self.animal_ids)
+        for model in (self.kmeans_model, self.scaler):
+            if model is None:
+                continue
+            total += sys.getsizeof(model)
+            for value in vars(model).values():
+                if isinstance(value, np.ndarray):
+                    total += value.nbytes
+                else:
+                    total += sys.getsizeof(value)
+        return total
+
+class ClusterModelCache:
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[UUID, ClusterModelEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, ranch_id: UUID, watermark: Watermark) -> Optional[ClusterModelEntry]:
+        entry = self._entries.get(ranch_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.watermark != watermark:
+            logger.debug(f"Modelo de clustering invalidado para rancho {ranch_id}")
+            self.invalidate(ranch_id)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(ranch_id)
+        self.hits += 1
+        return entry
+
+    def peek(self, ranch_id: UUID) -> Optional[ClusterModelEntry]:
+        return self._entries.get(ranch_id)
+
+    def put(self, ranch_id: UUID, entry: ClusterModelEntry) -> None:
+        self.invalidate(ranch_id)
+
+        if entry.size_bytes > self.max_bytes:
+            logger.warning(
+                f"Modelo de clustering de rancho {ranch_id} excede el límite de caché "
+                f"({entry.size_bytes} bytes)"
+            )
+            return
+
+        self._entries[ranch_id] = entry
+        self._total_bytes += entry.size_bytes
+        self._evict()
+
+    def invalidate(self, ranch_id: UUID) -> None:
+        entry = self._entries.pop(ranch_id, None)
+        if entry is not None:
+            self._total_bytes -= entry.size_bytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            ranch_id, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size_bytes
+            self.evictions += 1
+            logger.debug(f"Modelo de clustering desalojado para rancho {ranch_id}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ranch_id: UUID) -> bool:
+        return ranch_id in self._entries
+
+cluster_model_cache = ClusterModelCache(
+    max_entries=settings.CLUSTER_MODEL_CACHE_MAX_ENTRIES,
+    max_bytes=settings.CLUSTER_MODEL_CACHE_MAX_BYTES
+)
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.infrastructure.metrics.registry import percentile
+from src.infrastructure.metrics.worker_metrics import record_stage, stage_for_label
+from src.infrastructure.tracing.tracer import tracer
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict) -> Tuple[float, float, Any]:
+    started_at = time.time()
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return started_at, time.perf_counter() - started, result
+
+class ComputeExecutor:
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None, samples: int = 2048):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Modo de executor inválido: {mode}")
+
+        self.mode = mode
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[Executor] = None
+        self._samples = samples
+        self._wait_ms: Dict[str, deque] = {}
+        self._compute_ms: Dict[str, deque] = {}
+        self.jobs = 0
+        self.in_flight = 0
+
+    async def run(self, fn: Callable, *args, label: Optional[str] = None, **kwargs) -> Any:
+        label = label or getattr(fn, "__qualname__", "job")
+        stage = stage_for_label(label)
+        loop = asyncio.get_running_loop()
+
+        with tracer.span(label, stage=stage) as span:
+            submitted_at = time.time()
+            submitted = time.perf_counter()
+            self.in_flight += 1
+            try:
+                started_at, compute_seconds, result = await loop.run_in_executor(
+                    self._get_executor(),
+                    partial(_timed_call, fn, args, kwargs)
+                )
+            finally:
+                self.in_flight -= 1
+                record_stage(stage, time.perf_counter() - submitted)
+
+            wait_ms = max(started_at - submitted_at, 0.0) * 1000
+            compute_ms = compute_seconds * 1000
+            span.set_attribute("wait_ms", round(wait_ms, 3))
+            span.set_attribute("compute_ms", round(compute_ms, 3))
+
+        self.jobs += 1
+        self._wait_ms.setdefault(label, deque(maxlen=self._samples)).append(wait_ms)
+        self._compute_ms.setdefault(label, deque(maxlen=self._samples)).append(compute_ms)
+
+        logger.debug(f"Job {label}: espera {wait_ms:.1f} ms, cómputo {compute_ms:.1f} ms")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "jobs": self.jobs,
+            "in_flight": self.in_flight,
+            "labels": {
+                label: {
+                    "jobs": len(self._compute_ms[label]),
+                    "wait_ms_p50": percentile(self._wait_ms[label], 50),
+                    "wait_ms_p99": percentile(self._wait_ms[label], 99),
+                    "compute_ms_p50": percentile(self._compute_ms[label], 50),
+                    "compute_ms_p99": percentile(self._compute_ms[label], 99),
+                }
+                for label in self._compute_ms
+            }
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("Executor de cómputo detenido")
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="compute"
+                )
+            logger.info(f"Executor de cómputo iniciado ({self.mode}, {self.max_workers} workers)")
+        return self._executor
+
+compute_executor = ComputeExecutor(
+    mode=settings.COMPUTE_EXECUTOR,
+    max_workers=settings.COMPUTE_MAX_WORKERS or None
+)
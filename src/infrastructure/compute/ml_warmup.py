@@ -0,0 +1,18 @@
+import importlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+ML_MODULES = (
+    "sklearn.preprocessing",
+    "sklearn.cluster",
+    "sklearn.linear_model",
+    "sklearn.metrics",
+)
+
+def warm_up_ml_modules() -> float:
+    started = time.perf_counter()
+    for module_name in ML_MODULES:
+        importlib.import_module(module_name)
+    return time.perf_counter() - started
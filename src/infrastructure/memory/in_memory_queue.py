@@ -0,0 +1,72 @@
+import asyncio
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.ports.queue.queue_publisher_port import QueuePublisherPort
+from src.infrastructure.memory.in_memory_store import InjectedLatency, InMemoryStore
+from src.infrastructure.persistence.queue_status_writer import QueueStatusWriter
+
+class InMemoryQueueStatusWriter(QueueStatusWriter):
+
+    def __init__(self, store: InMemoryStore, flush_size: int, flush_interval_seconds: float):
+        super().__init__(flush_size, flush_interval_seconds)
+        self.store = store
+
+    async def _execute(self, rows: Dict[str, Tuple[str, Optional[str]]]) -> int:
+        await self.store.write()
+        for task_id, (status, error_message) in rows.items():
+            previous_error = self.store.queue_status.get(task_id, (None, None))[1]
+            self.store.queue_status[task_id] = (status, error_message or previous_error)
+        return len(rows)
+
+class InMemoryQueuePublisher(QueuePublisherPort):
+
+    def __init__(self, latency: InjectedLatency = None, confirm_window: int = 256, seed: int = 0):
+        self.latency = latency or InjectedLatency()
+        self.confirm_window = confirm_window
+        self._rng = random.Random(seed)
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self.published = 0
+        self.confirmed = 0
+        self.failed = 0
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        await self.wait_for_confirms()
+
+    async def declare_queue(self, queue_name: str) -> None:
+        self.messages.setdefault(queue_name, [])
+
+    async def publish(self, queue_name: str, message: Dict[str, Any], **properties) -> bool:
+        self.published += 1
+        await asyncio.sleep(self.latency.sample(self._rng))
+        self.messages.setdefault(queue_name, []).append(message)
+        self.confirmed += 1
+        return True
+
+    async def publish_nowait(self, queue_name: str, message: Dict[str, Any], **properties) -> None:
+        if len(self._pending) >= self.confirm_window:
+            await self.wait_for_confirms()
+
+        task = asyncio.create_task(self.publish(queue_name, message, **properties))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def wait_for_confirms(self) -> Tuple[int, int]:
+        if not self._pending:
+            return 0, 0
+
+        results = await asyncio.gather(*list(self._pending), return_exceptions=True)
+        confirmed = sum(1 for result in results if result is True)
+        return confirmed, len(results) - confirmed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "published": self.published,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "pending_confirms": len(self._pending)
+        }
@@ -0,0 +1,257 @@
+import hashlib
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid5
+
+from src.domain.entities.animal import Animal
+from src.domain.entities.prediction import Prediction
+from src.domain.entities.ranch import ProductionGoals, Ranch, RanchReproSettings
+from src.ports.persistence.animal_port import AnimalRepository
+from src.ports.persistence.event_port import EventRepository
+from src.ports.persistence.prediction_port import PredictionRepository
+from src.ports.persistence.ranch_port import RanchRepository
+from src.infrastructure.memory.in_memory_store import EVENT_TYPES, InMemoryStore
+from src.infrastructure.metrics.worker_metrics import instrument_repository
+
+FORECAST_FIELDS = (
+    "predicted_sale_date",
+    "expected_calving_date",
+    "suggested_dry_date",
+    "next_likely_heat_date",
+    "projected_weight_30d"
+)
+
+@instrument_repository("animal")
+class InMemoryAnimalRepository(AnimalRepository):
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_by_id(self, animal_id: UUID) -> Optional[Animal]:
+        await self.store.read()
+        return self.store.animals.get(animal_id)
+
+    async def find_by_ranch(self, ranch_id: UUID) -> List[Animal]:
+        await self.store.read()
+        return self._sorted(self._ranch_animals(ranch_id))
+
+    async def find_active_by_ranch(self, ranch_id: UUID) -> List[Animal]:
+        await self.store.read()
+        return self._sorted(animal for animal in self._ranch_animals(ranch_id) if animal.is_active)
+
+    async def count_active_by_ranch(self, ranch_id: UUID) -> int:
+        await self.store.read()
+        return sum(1 for animal in self._ranch_animals(ranch_id) if animal.is_active)
+
+    async def get_active_fingerprint(self, ranch_id: UUID) -> Tuple[int, int]:
+        await self.store.read()
+        active = [animal.id for animal in self._ranch_animals(ranch_id) if animal.is_active]
+        checksum = sum(int(hashlib.md5(str(animal_id).encode()).hexdigest()[:15], 16) for animal_id in active)
+        return len(active), checksum
+
+    async def update_cluster_label(self, animal_id: UUID, label: str) -> bool:
+        return await self.update_cluster_labels({animal_id: label}) > 0
+
+    async def update_cluster_labels(self, labels: Dict[UUID, str]) -> int:
+        if not labels:
+            return 0
+
+        await self.store.write()
+        return self._update({
+            animal_id: {"current_cluster_label": label}
+            for animal_id, label in labels.items()
+        })
+
+    async def update_forecast_data(
+        self,
+        animal_id: UUID,
+        predicted_sale_date: Optional[object],
+        expected_calving_date: Optional[object],
+        suggested_dry_date: Optional[object],
+        next_likely_heat_date: Optional[object],
+        projected_weight_30d: Optional[float]
+    ) -> bool:
+        forecast = (
+            animal_id,
+            predicted_sale_date,
+            expected_calving_date,
+            suggested_dry_date,
+            next_likely_heat_date,
+            projected_weight_30d
+        )
+        return await self.update_forecast_data_batch([forecast]) > 0
+
+    async def update_forecast_data_batch(self, forecasts: List[tuple]) -> int:
+        if not forecasts:
+            return 0
+
+        await self.store.write()
+        return self._update({
+            forecast[0]: dict(zip(FORECAST_FIELDS, forecast[1:]))
+            for forecast in forecasts
+        })
+
+    def _ranch_animals(self, ranch_id: UUID):
+        animals = self.store.animals
+        return (animals[animal_id] for animal_id in self.store.animals_by_ranch.get(ranch_id, ()))
+
+    def _sorted(self, animals) -> List[Animal]:
+        return sorted(animals, key=lambda animal: animal.visual_tag)
+
+    def _update(self, changes: Dict[UUID, dict]) -> int:
+        updated_at = self.store.clock()
+        updated = 0
+        for animal_id, fields in changes.items():
+            animal = self.store.animals.get(animal_id)
+            if animal is None:
+                continue
+            self.store.animals[animal_id] = replace(animal, server_updated_at=updated_at, **fields)
+            updated += 1
+        return updated
+
+@instrument_repository("event")
+class InMemoryEventRepository(EventRepository):
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_by_animal(self, animal_id: UUID, days_back: int = 90) -> List[tuple]:
+        await self.store.read()
+        animal = self.store.animals.get(animal_id)
+        if animal is None:
+            return []
+
+        rows = [
+            (
+                uuid5(animal_id, f"{event_type}:{event[0].isoformat()}"),
+                animal_id,
+                animal.ranch_id,
+                event_type,
+                event[0],
+                None,
+                None,
+                "synthetic",
+                animal.server_updated_at
+            )
+            for event_type in EVENT_TYPES
+            for event in self._recent(self.store.events[event_type].get(animal_id, ()), days_back)
+        ]
+        return sorted(rows, key=lambda row: row[4], reverse=True)
+
+    async def find_weight_events(self, animal_id: UUID, days_back: int = 90) -> List[tuple]:
+        return await self._find_by_animal("weight", animal_id, days_back)
+
+    async def find_weight_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 90,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        return await self._find_grouped_by_animal("weight", ranch_id, days_back, animal_ids)
+
+    async def get_weight_watermark(self, ranch_id: UUID) -> Optional[datetime]:
+        await self.store.read()
+        return self.store.weight_watermarks.get(ranch_id)
+
+    async def find_breeding_events(self, animal_id: UUID, days_back: int = 365) -> List[tuple]:
+        return await self._find_by_animal("breeding", animal_id, days_back)
+
+    async def find_birth_events(self, animal_id: UUID, days_back: int = 365) -> List[tuple]:
+        return await self._find_by_animal("birth", animal_id, days_back)
+
+    async def find_breeding_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 365,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        return await self._find_grouped_by_animal("breeding", ranch_id, days_back, animal_ids)
+
+    async def find_birth_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 365,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        return await self._find_grouped_by_animal("birth", ranch_id, days_back, animal_ids)
+
+    async def get_last_event_by_type(self, animal_id: UUID, event_type: str) -> Optional[tuple]:
+        await self.store.read()
+        events = self.store.events.get(event_type, {}).get(animal_id)
+        if not events:
+            return None
+
+        event_date = events[0][0]
+        return (uuid5(animal_id, f"{event_type}:{event_date.isoformat()}"), event_date, event_type)
+
+    async def _find_by_animal(self, event_type: str, animal_id: UUID, days_back: int) -> List[tuple]:
+        await self.store.read()
+        return self._recent(self.store.events[event_type].get(animal_id, ()), days_back)
+
+    async def _find_grouped_by_animal(
+        self,
+        event_type: str,
+        ranch_id: UUID,
+        days_back: int,
+        animal_ids: Optional[List[UUID]]
+    ) -> Dict[UUID, List[tuple]]:
+        if animal_ids is not None and not animal_ids:
+            return {}
+
+        await self.store.read()
+        candidates = self.store.animals_by_ranch.get(ranch_id, ()) if animal_ids is None else animal_ids
+        events = self.store.events[event_type]
+        grouped: Dict[UUID, List[tuple]] = {}
+        for animal_id in candidates:
+            animal = self.store.animals.get(animal_id)
+            if animal is None or animal.ranch_id != ranch_id:
+                continue
+            recent = self._recent(events.get(animal_id, ()), days_back)
+            if recent:
+                grouped[animal_id] = recent
+        return grouped
+
+    def _recent(self, events, days_back: int) -> List[tuple]:
+        since = self.store.clock() - timedelta(days=days_back)
+        recent = []
+        for event in events:
+            if event[0] < since:
+                break
+            recent.append(event)
+        return recent
+
+@instrument_repository("ranch")
+class InMemoryRanchRepository(RanchRepository):
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def find_by_id(self, ranch_id: UUID) -> Optional[Ranch]:
+        await self.store.read()
+        return self.store.ranches.get(ranch_id)
+
+    async def get_repro_settings(self, ranch_id: UUID) -> Optional[RanchReproSettings]:
+        await self.store.read()
+        return self.store.repro_settings.get(ranch_id)
+
+    async def get_production_goals(self, ranch_id: UUID) -> Optional[ProductionGoals]:
+        await self.store.read()
+        return self.store.production_goals.get(ranch_id)
+
+@instrument_repository("prediction")
+class InMemoryPredictionRepository(PredictionRepository):
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def save(self, prediction: Prediction) -> bool:
+        return await self.save_batch([prediction])
+
+    async def save_batch(self, predictions: list) -> bool:
+        if not predictions:
+            return True
+
+        await self.store.write()
+        self.store.predictions.extend(predictions)
+        return True
@@ -0,0 +1,109 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from src.domain.entities.animal import Animal
+from src.domain.entities.prediction import Prediction
+from src.domain.entities.ranch import ProductionGoals, Ranch, RanchReproSettings
+
+EVENT_TYPES = ("weight", "breeding", "birth")
+
+@dataclass(frozen=True)
+class InjectedLatency:
+    base_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.jitter_ms <= 0:
+            return self.base_ms / 1000
+        return max(0.0, self.base_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+class InMemoryStore:
+
+    def __init__(
+        self,
+        read_latency: InjectedLatency = None,
+        write_latency: InjectedLatency = None,
+        max_connections: Optional[int] = None,
+        now: Optional[datetime] = None,
+        seed: int = 0
+    ):
+        self.read_latency = read_latency or InjectedLatency()
+        self.write_latency = write_latency or InjectedLatency()
+        self.now = now
+        self._rng = random.Random(seed)
+        self._connections = asyncio.Semaphore(max_connections) if max_connections else None
+
+        self.ranches: Dict[UUID, Ranch] = {}
+        self.repro_settings: Dict[UUID, RanchReproSettings] = {}
+        self.production_goals: Dict[UUID, ProductionGoals] = {}
+        self.animals: Dict[UUID, Animal] = {}
+        self.animals_by_ranch: Dict[UUID, List[UUID]] = {}
+        self.events: Dict[str, Dict[UUID, List[tuple]]] = {event_type: {} for event_type in EVENT_TYPES}
+        self.weight_watermarks: Dict[UUID, datetime] = {}
+        self.predictions: List[Prediction] = []
+        self.queue_status: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.reads = 0
+        self.writes = 0
+
+    def clock(self) -> datetime:
+        return self.now or datetime.now()
+
+    async def read(self) -> None:
+        self.reads += 1
+        await self._wait(self.read_latency)
+
+    async def write(self) -> None:
+        self.writes += 1
+        await self._wait(self.write_latency)
+
+    def add_ranch(
+        self,
+        ranch: Ranch,
+        repro_settings: Optional[RanchReproSettings] = None,
+        production_goals: Optional[ProductionGoals] = None
+    ) -> None:
+        self.ranches[ranch.id] = ranch
+        self.animals_by_ranch.setdefault(ranch.id, [])
+        if repro_settings is not None:
+            self.repro_settings[ranch.id] = repro_settings
+        if production_goals is not None:
+            self.production_goals[ranch.id] = production_goals
+
+    def add_animal(
+        self,
+        animal: Animal,
+        weight_events: List[tuple] = (),
+        breeding_events: List[tuple] = (),
+        birth_events: List[tuple] = ()
+    ) -> None:
+        if animal.id not in self.animals:
+            self.animals_by_ranch.setdefault(animal.ranch_id, []).append(animal.id)
+        self.animals[animal.id] = animal
+
+        for event_type, events in zip(EVENT_TYPES, (weight_events, breeding_events, birth_events)):
+            self.events[event_type][animal.id] = sorted(events, key=lambda event: event[0], reverse=True)
+
+        if weight_events:
+            self.weight_watermarks[animal.ranch_id] = self.clock()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "reads": self.reads,
+            "writes": self.writes,
+            "animals": len(self.animals),
+            "predictions": len(self.predictions),
+            "queue_status": len(self.queue_status)
+        }
+
+    async def _wait(self, latency: InjectedLatency) -> None:
+        delay = latency.sample(self._rng)
+        if self._connections is None:
+            await asyncio.sleep(delay)
+            return
+
+        async with self._connections:
+            await asyncio.sleep(delay)
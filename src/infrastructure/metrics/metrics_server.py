@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+from src.infrastructure.metrics.registry import MetricsRegistry, registry as default_registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class MetricsServer:
+    READ_TIMEOUT = 5.0
+
+    def __init__(self, host: str, port: int, registry: MetricsRegistry = None):
+        self.host = host
+        self.port = port
+        self.registry = registry or default_registry
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Métricas disponibles en http://{self.host}:{self.bound_port}/metrics")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            logger.info("Servidor de métricas detenido")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.READ_TIMEOUT)
+            while True:
+                header = await asyncio.wait_for(reader.readline(), self.READ_TIMEOUT)
+                if header in (b"\r\n", b"\n", b""):
+                    break
+
+            status, content_type, body = self._respond(request_line)
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"Error sirviendo métricas: {str(e)}")
+        finally:
+            writer.close()
+
+    def _respond(self, request_line: bytes) -> Tuple[str, str, bytes]:
+        parts = request_line.decode("latin-1").split()
+        if len(parts) < 2 or parts[0] != "GET":
+            return "405 Method Not Allowed", "text/plain", b"method not allowed\n"
+
+        path = parts[1].split("?", 1)[0]
+        if path == "/metrics":
+            return "200 OK", CONTENT_TYPE, self.registry.render().encode()
+        if path == "/healthz":
+            return "200 OK", "text/plain", b"ok\n"
+        return "404 Not Found", "text/plain", b"not found\n"
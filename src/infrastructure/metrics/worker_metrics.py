@@ -0,0 +1,155 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional
+
+from src.infrastructure.metrics.registry import CollectedMetric, registry
+from src.infrastructure.tracing.tracer import tracer
+
+READ_PREFIXES = ("find", "get", "count")
+
+MESSAGES_TOTAL = registry.counter(
+    "bovara_messages_total",
+    "Mensajes consumidos por cola y resultado",
+    ("queue", "outcome")
+)
+NACKS_TOTAL = registry.counter(
+    "bovara_nacks_total",
+    "Mensajes devueltos a la cola sin procesar",
+    ("queue",)
+)
+TASK_SECONDS = registry.histogram(
+    "bovara_task_duration_seconds",
+    "Latencia total de procesamiento por mensaje",
+    ("queue",)
+)
+STAGE_SECONDS = registry.histogram(
+    "bovara_stage_duration_seconds",
+    "Latencia por etapa (fetch, train, predict, write) de cada unidad de trabajo",
+    ("operation", "stage")
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "bovara_db_query_duration_seconds",
+    "Latencia de consultas por método de repositorio",
+    ("repository", "method")
+)
+DB_QUERY_ERRORS = registry.counter(
+    "bovara_db_query_errors_total",
+    "Consultas fallidas por método de repositorio",
+    ("repository", "method")
+)
+
+_stage_totals: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_totals", default=None)
+
+def record_stage(stage: str, seconds: float) -> None:
+    totals = _stage_totals.get()
+    if totals is not None:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+
+@contextmanager
+def stage_scope(operation: str):
+    totals: Dict[str, float] = {}
+    token = _stage_totals.set(totals)
+    try:
+        yield totals
+    finally:
+        _stage_totals.reset(token)
+        for stage, seconds in totals.items():
+            STAGE_SECONDS.observe(seconds, operation=operation, stage=stage)
+
+def stage_for_label(label: str) -> str:
+    return "predict" if label.endswith(".predict") else "train"
+
+def instrument_repository(repository: str):
+    def decorate(cls):
+        for name, method in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(method):
+                continue
+            setattr(cls, name, _timed_query(repository, name, method))
+        return cls
+    return decorate
+
+def _timed_query(repository: str, name: str, method):
+    stage = "fetch" if name.startswith(READ_PREFIXES) else "write"
+    span_name = f"{repository}.{name}"
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with tracer.span(span_name, stage=stage):
+                return await method(*args, **kwargs)
+        except Exception:
+            DB_QUERY_ERRORS.inc(repository=repository, method=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_QUERY_SECONDS.observe(elapsed, repository=repository, method=name)
+            record_stage(stage, elapsed)
+
+    return wrapper
+
+def register_worker_collectors(adapter):
+    from src.infrastructure.cache.cluster_model_cache import cluster_model_cache
+    from src.infrastructure.compute.compute_executor import compute_executor
+    from src.infrastructure.persistence.cached_ranch_repository import ranch_settings_cache
+    from src.infrastructure.persistence.postgres_pool import PostgresPool
+
+    def collect() -> Iterable[CollectedMetric]:
+        pool = PostgresPool.get_stats()
+        max_size = pool.get("max_size", 0)
+        yield "bovara_db_pool_connections", "gauge", "Conexiones del pool por estado", [
+            ({"state": "leased"}, pool.get("leased", 0)),
+            ({"state": "idle"}, pool.get("idle", 0)),
+            ({"state": "open"}, pool.get("size", 0)),
+            ({"state": "max"}, max_size),
+        ]
+        yield "bovara_db_pool_waiting", "gauge", "Peticiones esperando conexión", [
+            ({}, pool.get("waiting", 0))
+        ]
+        yield "bovara_db_pool_saturation", "gauge", "Fracción del pool en uso", [
+            ({}, pool.get("leased", 0) / max_size if max_size else 0.0)
+        ]
+
+        yield "bovara_in_flight_tasks", "gauge", "Mensajes en proceso por cola", [
+            ({"queue": queue_type}, adapter.in_flight_count(queue_type))
+            for queue_type in adapter.queue_names
+        ]
+        yield "bovara_compute_in_flight", "gauge", "Trabajos en el executor de cómputo", [
+            ({}, compute_executor.in_flight)
+        ]
+
+        yield from _cache_metrics({
+            "cluster_model": cluster_model_cache.stats(),
+            "ranch_settings": ranch_settings_cache.stats(),
+        })
+
+        if adapter.batcher is not None:
+            yield "bovara_batcher_pending", "gauge", "Mensajes esperando ventana de agrupación", [
+                ({}, adapter.batcher.stats()["pending"])
+            ]
+        if adapter.publisher is not None:
+            yield "bovara_result_confirms_pending", "gauge", "Publicaciones de resultados sin confirmar", [
+                ({}, adapter.publisher.stats()["pending_confirms"])
+            ]
+
+    registry.register_collector(collect)
+    return collect
+
+def _cache_metrics(caches: Dict[str, Dict[str, float]]) -> List[CollectedMetric]:
+    requests, ratios, entries = [], [], []
+    for cache, stats in caches.items():
+        hits = stats.get("hits", 0) + stats.get("coalesced", 0)
+        misses = stats.get("misses", 0)
+        requests.append(({"cache": cache, "result": "hit"}, hits))
+        requests.append(({"cache": cache, "result": "miss"}, misses))
+        ratios.append(({"cache": cache}, hits / (hits + misses) if hits + misses else 0.0))
+        entries.append(({"cache": cache}, stats.get("entries", 0)))
+
+    return [
+        ("bovara_cache_requests_total", "counter", "Consultas a caché por resultado", requests),
+        ("bovara_cache_hit_ratio", "gauge", "Proporción de aciertos de caché", ratios),
+        ("bovara_cache_entries", "gauge", "Entradas en caché", entries),
+    ]
@@ -1,15 +1,17 @@
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 import logging
 
 from src.domain.entities.animal import Animal
 from src.ports.persistence.animal_port import AnimalRepository
 from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.metrics.worker_metrics import instrument_repository
 from src.application.mappers.animal_mapper import AnimalMapper
 
 logger = logging.getLogger(__name__)
 
+@instrument_repository("animal")
 class AnimalRepositoryImpl(AnimalRepository):
     
     async def find_by_id(self, animal_id: UUID) -> Optional[Animal]:
@@ -70,6 +72,33 @@ class AnimalRepositoryImpl(AnimalRepository):
             logger.error(f"Error en find_active_by_ranch: {str(e)}")
             raise
 
+    async def count_active_by_ranch(self, ranch_id: UUID) -> int:
+        query = """
+            SELECT COUNT(*)
+            FROM animals
+            WHERE ranch_id = %s AND is_active = TRUE AND is_deleted = FALSE
+        """
+        try:
+            result = await PostgresPool.execute_one(query, (str(ranch_id),))
+            return int(result[0]) if result else 0
+        except Exception as e:
+            logger.error(f"Error en count_active_by_ranch: {str(e)}")
+            raise
+
+    async def get_active_fingerprint(self, ranch_id: UUID) -> Tuple[int, int]:
+        query = """
+            SELECT COUNT(*),
+                   COALESCE(SUM(('x' || LEFT(MD5(id::text), 15))::bit(60)::bigint), 0)
+            FROM animals
+            WHERE ranch_id = %s AND is_active = TRUE AND is_deleted = FALSE
+        """
+        try:
+            result = await PostgresPool.execute_one(query, (str(ranch_id),))
+            return (int(result[0]), int(result[1])) if result else (0, 0)
+        except Exception as e:
+            logger.error(f"Error en get_active_fingerprint: {str(e)}")
+            raise
+
     async def update_cluster_label(self, animal_id: UUID, label: str) -> bool:
         query = """
             UPDATE animals
@@ -84,6 +113,24 @@ class AnimalRepositoryImpl(AnimalRepository):
             logger.error(f"Error en update_cluster_label: {str(e)}")
             raise
 
+    async def update_cluster_labels(self, labels: Dict[UUID, str]) -> int:
+        if not labels:
+            return 0
+
+        query = """
+            UPDATE animals AS a
+            SET current_cluster_label = v.label,
+                server_updated_at = NOW()
+            FROM UNNEST(%s::uuid[], %s::text[]) AS v(id, label)
+            WHERE a.id = v.id AND a.is_deleted = FALSE
+        """
+        try:
+            animal_ids = [str(animal_id) for animal_id in labels.keys()]
+            return await PostgresPool.execute_update(query, (animal_ids, list(labels.values())))
+        except Exception as e:
+            logger.error(f"Error en update_cluster_labels: {str(e)}")
+            raise
+
     async def update_forecast_data(
         self,
         animal_id: UUID,
@@ -118,4 +165,37 @@ class AnimalRepositoryImpl(AnimalRepository):
             return rowcount > 0
         except Exception as e:
             logger.error(f"Error en update_forecast_data: {str(e)}")
+            raise
+
+    async def update_forecast_data_batch(self, forecasts: List[tuple]) -> int:
+        if not forecasts:
+            return 0
+
+        query = """
+            UPDATE animals AS a
+            SET predicted_sale_date = v.predicted_sale_date,
+                expected_calving_date = v.expected_calving_date,
+                suggested_dry_date = v.suggested_dry_date,
+                next_likely_heat_date = v.next_likely_heat_date,
+                projected_weight_30d = v.projected_weight_30d,
+                server_updated_at = NOW()
+            FROM UNNEST(
+                %s::uuid[], %s::date[], %s::date[], %s::date[], %s::date[], %s::numeric[]
+            ) AS v(id, predicted_sale_date, expected_calving_date, suggested_dry_date,
+                   next_likely_heat_date, projected_weight_30d)
+            WHERE a.id = v.id AND a.is_deleted = FALSE
+        """
+        try:
+            columns = list(zip(*forecasts))
+            params = (
+                [str(animal_id) for animal_id in columns[0]],
+                list(columns[1]),
+                list(columns[2]),
+                list(columns[3]),
+                list(columns[4]),
+                list(columns[5])
+            )
+            return await PostgresPool.execute_update(query, params)
+        except Exception as e:
+            logger.error(f"Error en update_forecast_data_batch: {str(e)}")
             raise
\ No newline at end of file
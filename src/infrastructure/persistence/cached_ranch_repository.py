@@ -0,0 +1,48 @@
+from uuid import UUID
+from typing import Optional
+import logging
+
+from src.domain.entities.ranch import Ranch, RanchReproSettings, ProductionGoals
+from src.ports.persistence.ranch_port import RanchRepository
+from src.infrastructure.cache.ttl_cache import TTLCache
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ranch_settings_cache = TTLCache(
+    ttl_seconds=settings.RANCH_CACHE_TTL_SECONDS,
+    max_entries=settings.RANCH_CACHE_MAX_ENTRIES
+)
+
+class CachedRanchRepository(RanchRepository):
+
+    def __init__(self, inner: RanchRepository, cache: TTLCache = None):
+        self.inner = inner
+        self.cache = cache if cache is not None else ranch_settings_cache
+
+    async def find_by_id(self, ranch_id: UUID) -> Optional[Ranch]:
+        return await self.inner.find_by_id(ranch_id)
+
+    async def get_repro_settings(self, ranch_id: UUID) -> Optional[RanchReproSettings]:
+        return await self.cache.get_or_load(
+            ("repro_settings", ranch_id),
+            lambda: self.inner.get_repro_settings(ranch_id)
+        )
+
+    async def get_production_goals(self, ranch_id: UUID) -> Optional[ProductionGoals]:
+        return await self.cache.get_or_load(
+            ("production_goals", ranch_id),
+            lambda: self.inner.get_production_goals(ranch_id)
+        )
+
+    def invalidate(self, ranch_id: UUID) -> None:
+        self.cache.invalidate(("repro_settings", ranch_id))
+        self.cache.invalidate(("production_goals", ranch_id))
+        logger.info(f"Caché de configuración invalidada para rancho {ranch_id}")
+
+    def invalidate_all(self) -> None:
+        self.cache.clear()
+        logger.info("Caché de configuración de ranchos invalidada")
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -1,12 +1,15 @@
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Dict
+from datetime import datetime
 import logging
 
 from src.ports.persistence.event_port import EventRepository
 from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.metrics.worker_metrics import instrument_repository
 
 logger = logging.getLogger(__name__)
 
+@instrument_repository("event")
 class EventRepositoryImpl(EventRepository):
 
     async def find_by_animal(self, animal_id: UUID, days_back: int = 90) -> List[tuple]:
@@ -43,6 +46,40 @@ class EventRepositoryImpl(EventRepository):
             logger.error(f"Error en find_weight_events: {str(e)}")
             raise
 
+    async def find_weight_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 90,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        query = """
+            SELECT e.animal_id, e.event_date, ew.weight_kg, ew.body_condition_score
+            FROM events e
+            JOIN event_weights ew ON e.id = ew.event_id
+            WHERE e.ranch_id = %s
+            AND e.event_date >= NOW() - %s * INTERVAL '1 day'
+            AND e.is_deleted = FALSE
+        """
+        try:
+            return await self._find_grouped_by_animal(query, ranch_id, days_back, animal_ids)
+        except Exception as e:
+            logger.error(f"Error en find_weight_events_by_ranch: {str(e)}")
+            raise
+
+    async def get_weight_watermark(self, ranch_id: UUID) -> Optional[datetime]:
+        query = """
+            SELECT MAX(e.server_updated_at)
+            FROM events e
+            JOIN event_weights ew ON e.id = ew.event_id
+            WHERE e.ranch_id = %s
+        """
+        try:
+            result = await PostgresPool.execute_one(query, (str(ranch_id),))
+            return result[0] if result else None
+        except Exception as e:
+            logger.error(f"Error en get_weight_watermark: {str(e)}")
+            raise
+
     async def find_breeding_events(self, animal_id: UUID, days_back: int = 365) -> List[tuple]:
         query = """
             SELECT e.event_date, eb.breeding_type, eb.sire_id, eb.technician_name
@@ -77,6 +114,46 @@ class EventRepositoryImpl(EventRepository):
             logger.error(f"Error en find_birth_events: {str(e)}")
             raise
 
+    async def find_breeding_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 365,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        query = """
+            SELECT e.animal_id, e.event_date, eb.breeding_type, eb.sire_id, eb.technician_name
+            FROM events e
+            JOIN event_breeding eb ON e.id = eb.event_id
+            WHERE e.ranch_id = %s
+            AND e.event_date >= NOW() - %s * INTERVAL '1 day'
+            AND e.is_deleted = FALSE
+        """
+        try:
+            return await self._find_grouped_by_animal(query, ranch_id, days_back, animal_ids)
+        except Exception as e:
+            logger.error(f"Error en find_breeding_events_by_ranch: {str(e)}")
+            raise
+
+    async def find_birth_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 365,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        query = """
+            SELECT e.animal_id, e.event_date, eb.birth_type, eb.offspring_count, eb.live_births
+            FROM events e
+            JOIN event_births eb ON e.id = eb.event_id
+            WHERE e.ranch_id = %s
+            AND e.event_date >= NOW() - %s * INTERVAL '1 day'
+            AND e.is_deleted = FALSE
+        """
+        try:
+            return await self._find_grouped_by_animal(query, ranch_id, days_back, animal_ids)
+        except Exception as e:
+            logger.error(f"Error en find_birth_events_by_ranch: {str(e)}")
+            raise
+
     async def get_last_event_by_type(self, animal_id: UUID, event_type: str) -> Optional[tuple]:
         query = """
             SELECT e.id, e.event_date, e.event_type
@@ -92,4 +169,28 @@ class EventRepositoryImpl(EventRepository):
             return result
         except Exception as e:
             logger.error(f"Error en get_last_event_by_type: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    async def _find_grouped_by_animal(
+        self,
+        query: str,
+        ranch_id: UUID,
+        days_back: int,
+        animal_ids: Optional[List[UUID]]
+    ) -> Dict[UUID, List[tuple]]:
+        params = [str(ranch_id), days_back]
+
+        if animal_ids is not None:
+            if not animal_ids:
+                return {}
+            query += " AND e.animal_id = ANY(%s::uuid[])"
+            params.append([str(animal_id) for animal_id in animal_ids])
+
+        query += " ORDER BY e.animal_id, e.event_date DESC"
+
+        results = await PostgresPool.execute(query, tuple(params))
+        grouped: Dict[UUID, List[tuple]] = {}
+        for row in results:
+            animal_id = row[0] if isinstance(row[0], UUID) else UUID(str(row[0]))
+            grouped.setdefault(animal_id, []).append(tuple(row[1:]))
+        return grouped
\ No newline at end of file
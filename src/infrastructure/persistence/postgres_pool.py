@@ -1,30 +1,43 @@
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import psycopg
 from psycopg import AsyncConnection
 from psycopg_pool import AsyncConnectionPool
+from src.infrastructure.metrics.registry import percentile
 from config.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+TRANSIENT_ERRORS = (psycopg.OperationalError,)
+
 class PostgresPool:
     _pool: AsyncConnectionPool = None
+    _checkout_wait_ms: deque = deque(maxlen=2048)
+    _lease_ms: deque = deque(maxlen=2048)
+    _leases_total: int = 0
+    _leased: int = 0
 
     @classmethod
     async def initialize(cls) -> None:
         if cls._pool is not None:
             return
-        
+
         try:
             cls._pool = AsyncConnectionPool(
                 settings.DATABASE_URL,
-                min_size=5,
-                max_size=settings.DATABASE_POOL_SIZE,
+                min_size=min(settings.DATABASE_POOL_MIN_SIZE, settings.DATABASE_POOL_SIZE),
+                max_size=settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW,
                 max_idle=30,
                 max_lifetime=3600,
                 timeout=settings.DATABASE_POOL_TIMEOUT,
-                connect_kwargs={
+                kwargs={
                     "connect_timeout": 10,
-                }
+                },
+                open=False
             )
             await cls._pool.open()
             logger.info("Pool PostgreSQL inicializado correctamente")
@@ -40,28 +53,67 @@ class PostgresPool:
             logger.info("Pool PostgreSQL cerrado")
 
     @classmethod
-    async def get_connection(cls) -> AsyncConnection:
+    @asynccontextmanager
+    async def connection(cls) -> AsyncIterator[AsyncConnection]:
         if cls._pool is None:
             raise RuntimeError("Pool no inicializado. Llamar a initialize() primero")
-        return await cls._pool.getconn()
+
+        requested_at = time.perf_counter()
+        async with cls._pool.connection() as conn:
+            acquired_at = time.perf_counter()
+            cls._checkout_wait_ms.append((acquired_at - requested_at) * 1000)
+            cls._leases_total += 1
+            cls._leased += 1
+            try:
+                yield conn
+            finally:
+                cls._leased -= 1
+                cls._lease_ms.append((time.perf_counter() - acquired_at) * 1000)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        stats = {
+            "leases_total": cls._leases_total,
+            "leased": cls._leased,
+            "checkout_wait_ms_p50": percentile(cls._checkout_wait_ms, 50),
+            "checkout_wait_ms_p99": percentile(cls._checkout_wait_ms, 99),
+            "lease_ms_p50": percentile(cls._lease_ms, 50),
+            "lease_ms_p99": percentile(cls._lease_ms, 99),
+        }
+
+        if cls._pool is None:
+            stats.update({"size": 0, "idle": 0, "waiting": 0, "max_size": 0})
+            return stats
+
+        pool_stats = cls._pool.get_stats()
+        stats.update({
+            "size": pool_stats.get("pool_size", 0),
+            "idle": pool_stats.get("pool_available", 0),
+            "waiting": pool_stats.get("requests_waiting", 0),
+            "min_size": cls._pool.min_size,
+            "max_size": cls._pool.max_size,
+            "connections_num": pool_stats.get("connections_num", 0),
+            "requests_errors": pool_stats.get("requests_errors", 0),
+        })
+        return stats
 
     @classmethod
     async def execute(cls, query: str, params: tuple = None):
-        async with await cls.get_connection() as conn:
+        async with cls.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(query, params or ())
                 return await cur.fetchall()
 
     @classmethod
     async def execute_one(cls, query: str, params: tuple = None):
-        async with await cls.get_connection() as conn:
+        async with cls.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(query, params or ())
                 return await cur.fetchone()
 
     @classmethod
     async def execute_update(cls, query: str, params: tuple = None) -> int:
-        async with await cls.get_connection() as conn:
+        async with cls.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(query, params or ())
                 await conn.commit()
@@ -69,20 +121,49 @@ class PostgresPool:
 
     @classmethod
     async def execute_insert(cls, query: str, params: tuple = None) -> str:
-        async with await cls.get_connection() as conn:
+        async with cls.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(query, params or ())
+                result = await cur.fetchone() if cur.description else None
                 await conn.commit()
-                result = await cur.fetchone()
-                return result[0] if result else None
+                return result[0] if result else cur.rowcount
 
     @classmethod
     async def batch_execute_update(cls, query: str, params_list: list) -> int:
-        async with await cls.get_connection() as conn:
+        if not params_list:
+            return 0
+
+        async with cls.connection() as conn:
             async with conn.cursor() as cur:
-                total_rows = 0
-                for params in params_list:
-                    await cur.execute(query, params)
-                    total_rows += cur.rowcount
-                await conn.commit()
-                return total_rows
\ No newline at end of file
+                async with conn.pipeline():
+                    await cur.executemany(query, params_list)
+                total_rows = cur.rowcount
+            await conn.commit()
+            return total_rows
+
+    @classmethod
+    async def copy_merge(
+        cls,
+        table: str,
+        columns: list,
+        rows: list,
+        merge_query: str
+    ) -> int:
+        if not rows:
+            return 0
+
+        staging = f"{table}_staging"
+        column_list = ", ".join(columns)
+
+        async with cls.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                async with cur.copy(f"COPY {staging} ({column_list}) FROM STDIN") as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+                await cur.execute(merge_query.format(staging=staging, columns=column_list))
+                total_rows = cur.rowcount
+            await conn.commit()
+            return total_rows
@@ -2,11 +2,19 @@ import logging
 from src.domain.entities.prediction import Prediction
 from src.ports.persistence.prediction_port import PredictionRepository
 from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.metrics.worker_metrics import instrument_repository
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+@instrument_repository("prediction")
 class PredictionRepositoryImpl(PredictionRepository):
 
+    COLUMNS = [
+        "id", "ranch_id", "animal_id", "prediction_type", "prediction_date",
+        "confidence_score", "explanation", "severity", "is_acknowledged", "created_at"
+    ]
+
     async def save(self, prediction: Prediction) -> bool:
         query = """
             INSERT INTO ml_predictions
@@ -51,6 +59,13 @@ class PredictionRepositoryImpl(PredictionRepository):
                 explanation = EXCLUDED.explanation,
                 severity = EXCLUDED.severity
         """
+        merge_query = """
+            INSERT INTO ml_predictions ({columns})
+            SELECT {columns} FROM {staging}
+            ON CONFLICT (id) DO UPDATE SET
+                explanation = EXCLUDED.explanation,
+                severity = EXCLUDED.severity
+        """
         try:
             params_list = [
                 (
@@ -59,7 +74,7 @@ class PredictionRepositoryImpl(PredictionRepository):
                     str(pred.animal_id),
                     pred.prediction_type,
                     pred.prediction_date,
-                    pred.confidence_score,
+                    float(pred.confidence_score),
                     pred.explanation,
                     pred.severity,
                     pred.is_acknowledged,
@@ -67,8 +82,17 @@ class PredictionRepositoryImpl(PredictionRepository):
                 )
                 for pred in predictions
             ]
-            rowcount = await PostgresPool.batch_execute_update(query, params_list)
+
+            if len(params_list) >= settings.DATABASE_COPY_THRESHOLD:
+                rowcount = await PostgresPool.copy_merge(
+                    "ml_predictions",
+                    self.COLUMNS,
+                    params_list,
+                    merge_query
+                )
+            else:
+                rowcount = await PostgresPool.batch_execute_update(query, params_list)
             return rowcount > 0
         except Exception as e:
             logger.error(f"Error en save_batch predictions: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.metrics.worker_metrics import DB_QUERY_ERRORS, DB_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+class QueueStatusWriter:
+    TABLE = "processing_queue"
+
+    def __init__(self, flush_size: int, flush_interval_seconds: float):
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._pending: List[Tuple[str, str, Optional[str], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self.flush_count = 0
+        self.rows_written = 0
+
+    async def update(self, task_id: str, status: str, error_message: Optional[str] = None) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((task_id, status, error_message, future))
+
+        if len(self._pending) >= self.flush_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval_seconds, self._start_flush)
+
+        await future
+
+    async def flush(self) -> None:
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "flushes": self.flush_count,
+            "rows": self.rows_written,
+            "pending": len(self._pending),
+            "rows_per_flush": self.rows_written / self.flush_count if self.flush_count else 0.0
+        }
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        items, self._pending = self._pending, []
+        task = asyncio.create_task(self._write(items))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, items: List[Tuple[str, str, Optional[str], asyncio.Future]]) -> None:
+        latest: Dict[str, Tuple[str, Optional[str]]] = {}
+        for task_id, status, error_message, _ in items:
+            latest[task_id] = (status, error_message)
+
+        started = time.perf_counter()
+        try:
+            await self._execute(latest)
+            self.flush_count += 1
+            self.rows_written += len(latest)
+        except Exception as e:
+            DB_QUERY_ERRORS.inc(repository=self.TABLE, method="update_status_batch")
+            logger.error(f"Error actualizando status de queue ({len(latest)} filas): {str(e)}")
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            DB_QUERY_SECONDS.observe(
+                time.perf_counter() - started,
+                repository=self.TABLE,
+                method="update_status_batch"
+            )
+
+        for *_, future in items:
+            if not future.done():
+                future.set_result(None)
+
+    async def _execute(self, rows: Dict[str, Tuple[str, Optional[str]]]) -> int:
+        query = f"""
+            UPDATE {self.TABLE} AS q
+            SET status = v.status,
+                error_message = COALESCE(v.error_message, q.error_message),
+                processed_at = NOW()
+            FROM json_populate_recordset(NULL::{self.TABLE}, %s::json) AS v
+            WHERE q.id = v.id
+        """
+
+        payload = [
+            {"id": task_id, "status": status, "error_message": error_message}
+            for task_id, (status, error_message) in rows.items()
+        ]
+        return await PostgresPool.execute_update(query, (json.dumps(payload),))
@@ -5,9 +5,11 @@ import logging
 from src.domain.entities.ranch import Ranch, RanchReproSettings, ProductionGoals
 from src.ports.persistence.ranch_port import RanchRepository
 from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.metrics.worker_metrics import instrument_repository
 
 logger = logging.getLogger(__name__)
 
+@instrument_repository("ranch")
 class RanchRepositoryImpl(RanchRepository):
 
     async def find_by_id(self, ranch_id: UUID) -> Optional[Ranch]:
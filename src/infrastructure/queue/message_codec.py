@@ -0,0 +1,99 @@
+import json
+import logging
+from typing import Any, Optional, Union
+
+from src.infrastructure.queue.messages import (
+    ClusterTaskMessage,
+    ForecastTaskMessage,
+    MessageDecodeError,
+    RanchClusterTaskMessage,
+    RanchForecastTaskMessage,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+TaskMessage = Union[ForecastTaskMessage, ClusterTaskMessage, RanchForecastTaskMessage, RanchClusterTaskMessage]
+
+JSON_CONTENT_TYPES = frozenset({"", "application/json", "text/json", "text/plain"})
+MSGPACK_CONTENT_TYPES = frozenset({"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"})
+
+ANIMAL_SCOPE = "animal"
+RANCH_SCOPE = "ranch"
+
+TASK_TYPES = {
+    ("forecast", ANIMAL_SCOPE): ForecastTaskMessage,
+    ("forecast", RANCH_SCOPE): RanchForecastTaskMessage,
+    ("cluster", ANIMAL_SCOPE): ClusterTaskMessage,
+    ("cluster", RANCH_SCOPE): RanchClusterTaskMessage,
+}
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+class MessageCodec:
+
+    @staticmethod
+    def loads(body: bytes, content_type: Optional[str] = None) -> Any:
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+
+        if media_type in JSON_CONTENT_TYPES:
+            try:
+                return _json_loads(body)
+            except ValueError as e:
+                raise MessageDecodeError(f"JSON inválido: {str(e)}")
+
+        if media_type in MSGPACK_CONTENT_TYPES:
+            if msgpack is None:
+                raise MessageDecodeError("msgpack no está instalado")
+            try:
+                return msgpack.unpackb(body, raw=False)
+            except Exception as e:
+                raise MessageDecodeError(f"msgpack inválido: {str(e)}")
+
+        raise MessageDecodeError(f"content_type no soportado: {content_type}")
+
+    @staticmethod
+    def dumps(payload: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload, default=_json_default)
+        return json.dumps(payload, default=_json_default).encode()
+
+    @staticmethod
+    def decode_task(queue_type: str, body: bytes, content_type: Optional[str] = None) -> TaskMessage:
+        payload = MessageCodec.loads(body, content_type)
+        if not isinstance(payload, dict):
+            raise MessageDecodeError(f"Se esperaba un objeto, se recibió {type(payload).__name__}")
+
+        message_type = TASK_TYPES.get((queue_type, MessageCodec._task_scope(queue_type, payload)))
+        if message_type is None:
+            raise MessageDecodeError(f"Tipo de cola desconocida: {queue_type}")
+
+        return message_type.from_dict(payload)
+
+    @staticmethod
+    def _task_scope(queue_type: str, payload: dict) -> str:
+        scope = payload.get("scope")
+        if scope is None:
+            return ANIMAL_SCOPE
+
+        if scope not in (ANIMAL_SCOPE, RANCH_SCOPE):
+            raise MessageDecodeError(f"scope inválido: {scope!r}")
+        if scope == RANCH_SCOPE and payload.get("animal_id") is not None:
+            raise MessageDecodeError("animal_id no permitido en tareas de rancho")
+        return scope
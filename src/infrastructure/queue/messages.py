@@ -3,62 +3,137 @@ from uuid import UUID
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+class MessageDecodeError(ValueError):
+    pass
+
+def _parse_uuid(data: dict, field: str, required: bool = True) -> Optional[UUID]:
+    value = data.get(field)
+    if value is None or value == "":
+        if required:
+            raise MessageDecodeError(f"Campo requerido ausente: {field}")
+        return None
+
+    if isinstance(value, UUID):
+        return value
+
+    try:
+        return UUID(value)
+    except (AttributeError, TypeError, ValueError):
+        raise MessageDecodeError(f"UUID inválido en {field}: {value!r}")
+
+def _parse_task_id(data: dict) -> str:
+    value = data.get("task_id")
+    if value is None or value == "" or isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise MessageDecodeError(f"task_id inválido: {value!r}")
+    return str(value)
+
+def _parse_timestamp(data: dict) -> Optional[str]:
+    value = data.get("timestamp")
+    return value if value is None or isinstance(value, str) else str(value)
+
+@dataclass(slots=True)
 class ForecastTaskMessage:
-    ranch_id: str
-    animal_id: str
+    ranch_id: UUID
+    animal_id: UUID
     task_id: str
-    timestamp: str
+    timestamp: Optional[str] = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "ForecastTaskMessage":
         return cls(
-            ranch_id=data.get("ranch_id"),
-            animal_id=data.get("animal_id"),
-            task_id=data.get("task_id"),
-            timestamp=data.get("timestamp")
+            ranch_id=_parse_uuid(data, "ranch_id"),
+            animal_id=_parse_uuid(data, "animal_id"),
+            task_id=_parse_task_id(data),
+            timestamp=_parse_timestamp(data)
         )
 
     def to_dict(self) -> dict:
         return {
-            "ranch_id": self.ranch_id,
-            "animal_id": self.animal_id,
+            "ranch_id": str(self.ranch_id),
+            "animal_id": str(self.animal_id),
             "task_id": self.task_id,
             "timestamp": self.timestamp
         }
 
-@dataclass
+@dataclass(slots=True)
 class ClusterTaskMessage:
-    ranch_id: str
-    animal_id: str
+    ranch_id: UUID
+    animal_id: UUID
     task_id: str
-    timestamp: str
+    timestamp: Optional[str] = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "ClusterTaskMessage":
         return cls(
-            ranch_id=data.get("ranch_id"),
-            animal_id=data.get("animal_id"),
-            task_id=data.get("task_id"),
-            timestamp=data.get("timestamp")
+            ranch_id=_parse_uuid(data, "ranch_id"),
+            animal_id=_parse_uuid(data, "animal_id"),
+            task_id=_parse_task_id(data),
+            timestamp=_parse_timestamp(data)
         )
 
     def to_dict(self) -> dict:
         return {
-            "ranch_id": self.ranch_id,
-            "animal_id": self.animal_id,
+            "ranch_id": str(self.ranch_id),
+            "animal_id": str(self.animal_id),
+            "task_id": self.task_id,
+            "timestamp": self.timestamp
+        }
+
+@dataclass(slots=True)
+class RanchForecastTaskMessage:
+    ranch_id: UUID
+    task_id: str
+    timestamp: Optional[str] = None
+    animal_id: None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RanchForecastTaskMessage":
+        return cls(
+            ranch_id=_parse_uuid(data, "ranch_id"),
+            task_id=_parse_task_id(data),
+            timestamp=_parse_timestamp(data)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "scope": "ranch",
+            "ranch_id": str(self.ranch_id),
+            "task_id": self.task_id,
+            "timestamp": self.timestamp
+        }
+
+@dataclass(slots=True)
+class RanchClusterTaskMessage:
+    ranch_id: UUID
+    task_id: str
+    timestamp: Optional[str] = None
+    animal_id: None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RanchClusterTaskMessage":
+        return cls(
+            ranch_id=_parse_uuid(data, "ranch_id"),
+            task_id=_parse_task_id(data),
+            timestamp=_parse_timestamp(data)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "scope": "ranch",
+            "ranch_id": str(self.ranch_id),
             "task_id": self.task_id,
             "timestamp": self.timestamp
         }
 
 @dataclass
 class ResultMessage:
-    animal_id: str
+    animal_id: Optional[str]
     ranch_id: str
     result_type: str
     result_data: dict
     timestamp: str
     status: str
+    task_id: Optional[str] = None
 
     def to_dict(self) -> dict:
         return {
@@ -67,5 +142,6 @@ class ResultMessage:
             "result_type": self.result_type,
             "result_data": self.result_data,
             "timestamp": self.timestamp,
-            "status": self.status
-        }
\ No newline at end of file
+            "status": self.status,
+            "task_id": self.task_id
+        }
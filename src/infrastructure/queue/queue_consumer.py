@@ -5,6 +5,7 @@ from aio_pika import IncomingMessage
 
 from src.ports.queue.queue_consumer_port import QueueConsumerPort
 from src.infrastructure.queue.rabbitmq_connection import RabbitMQConnection
+from src.infrastructure.queue.retry_policy import retry_policy
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,10 @@ class QueueConsumer(QueueConsumerPort):
                 settings.QUEUE_NAME_CLUSTER,
                 durable=True
             )
+            await retry_policy.declare(
+                await RabbitMQConnection.get_channel(),
+                [settings.QUEUE_NAME_FORECAST, settings.QUEUE_NAME_CLUSTER]
+            )
             logger.info("Colas declaradas correctamente")
         except Exception as e:
             logger.error(f"Error conectando a colas: {str(e)}")
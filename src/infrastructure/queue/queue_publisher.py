@@ -1,15 +1,26 @@
-import json
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Set, Tuple
 
 from src.ports.queue.queue_publisher_port import QueuePublisherPort
 from src.infrastructure.queue.rabbitmq_connection import RabbitMQConnection
+from src.infrastructure.queue.message_codec import MessageCodec
+from config.settings import settings
 import aio_pika
 
 logger = logging.getLogger(__name__)
 
 class QueuePublisher(QueuePublisherPort):
 
+    def __init__(self, confirm_window: int = None):
+        self.confirm_window = confirm_window or settings.RESULT_CONFIRM_WINDOW
+        self._channel = None
+        self._exchange = None
+        self._pending: Set[asyncio.Task] = set()
+        self.published = 0
+        self.confirmed = 0
+        self.failed = 0
+
     async def connect(self) -> None:
         try:
             await RabbitMQConnection.initialize()
@@ -20,27 +31,70 @@ class QueuePublisher(QueuePublisherPort):
 
     async def disconnect(self) -> None:
         try:
+            await self.wait_for_confirms()
             await RabbitMQConnection.close()
+            self._channel = None
+            self._exchange = None
             logger.info("Publicador desconectado de RabbitMQ")
         except Exception as e:
             logger.error(f"Error desconectando publicador: {str(e)}")
             raise
 
-    async def publish(self, queue_name: str, message: Dict[str, Any]) -> bool:
+    async def declare_queue(self, queue_name: str) -> None:
+        await RabbitMQConnection.declare_queue(queue_name, durable=True)
+
+    async def publish(self, queue_name: str, message: Dict[str, Any], **properties) -> bool:
         try:
-            channel = await RabbitMQConnection.get_channel()
-            queue = await channel.get_queue(queue_name)
-            
-            message_body = json.dumps(message).encode()
-            amqp_message = aio_pika.Message(
-                body=message_body,
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-            )
-            
-            await queue.put(amqp_message)
+            exchange = await self._get_exchange()
+            self.published += 1
+            await exchange.publish(self._build_message(message, properties), routing_key=queue_name)
+            self.confirmed += 1
             logger.debug(f"Mensaje publicado en {queue_name}")
             return True
         except Exception as e:
+            self.failed += 1
             logger.error(f"Error publicando en {queue_name}: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    async def publish_nowait(self, queue_name: str, message: Dict[str, Any], **properties) -> None:
+        if len(self._pending) >= self.confirm_window:
+            await self.wait_for_confirms()
+
+        task = asyncio.create_task(self.publish(queue_name, message, **properties))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def wait_for_confirms(self) -> Tuple[int, int]:
+        if not self._pending:
+            return 0, 0
+
+        results = await asyncio.gather(*list(self._pending), return_exceptions=True)
+        confirmed = sum(1 for result in results if result is True)
+        failed = len(results) - confirmed
+        if failed:
+            logger.warning(f"{failed} de {len(results)} publicaciones sin confirmar")
+        return confirmed, failed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "published": self.published,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "pending_confirms": len(self._pending)
+        }
+
+    async def _get_exchange(self):
+        channel = await RabbitMQConnection.get_channel()
+        if self._exchange is None or channel is not self._channel:
+            self._channel = channel
+            self._exchange = channel.default_exchange
+        return self._exchange
+
+    @staticmethod
+    def _build_message(message: Dict[str, Any], properties: Dict[str, Any]) -> aio_pika.Message:
+        return aio_pika.Message(
+            body=MessageCodec.dumps(message),
+            content_type="application/json",
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            **properties
+        )
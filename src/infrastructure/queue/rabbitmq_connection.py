@@ -39,6 +39,15 @@ class RabbitMQConnection:
             raise RuntimeError("Canal RabbitMQ no inicializado")
         return cls._channel
 
+    @classmethod
+    async def create_channel(cls, prefetch_count: int) -> Channel:
+        if cls._connection is None:
+            raise RuntimeError("Conexión RabbitMQ no inicializada")
+
+        channel = await cls._connection.channel()
+        await channel.set_qos(prefetch_count=prefetch_count)
+        return channel
+
     @classmethod
     async def declare_queue(cls, queue_name: str, durable: bool = True) -> Queue:
         channel = await cls.get_channel()
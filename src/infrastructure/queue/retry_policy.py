@@ -0,0 +1,117 @@
+import logging
+from typing import Dict, Iterable
+
+import aio_pika
+from aio_pika import Channel
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class RetryPolicy:
+    RETRY_HEADER = "x-retry-count"
+    ORIGIN_HEADER = "x-original-queue"
+    ERROR_HEADER = "x-last-error"
+
+    def __init__(
+        self,
+        max_retries: int = None,
+        base_delay_ms: int = None,
+        dead_letter_queue: str = None
+    ):
+        self.max_retries = settings.WORKER_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay_ms = settings.WORKER_RETRY_BASE_DELAY_MS if base_delay_ms is None else base_delay_ms
+        self.dead_letter_queue = dead_letter_queue or settings.QUEUE_DEAD_LETTER
+        self.retries: Dict[str, int] = {}
+        self.dead_letters: Dict[str, int] = {}
+
+    def delay_queue_name(self, queue_name: str, attempt: int) -> str:
+        return f"{queue_name}.retry.{self.delay_ms(attempt)}ms"
+
+    def delay_ms(self, attempt: int) -> int:
+        return self.base_delay_ms * 2 ** (attempt - 1)
+
+    async def declare(self, channel: Channel, queue_names: Iterable[str]) -> None:
+        await channel.declare_queue(self.dead_letter_queue, durable=True)
+
+        for queue_name in queue_names:
+            for attempt in range(1, self.max_retries + 1):
+                await channel.declare_queue(
+                    self.delay_queue_name(queue_name, attempt),
+                    durable=True,
+                    arguments={
+                        "x-message-ttl": self.delay_ms(attempt),
+                        "x-dead-letter-exchange": "",
+                        "x-dead-letter-routing-key": queue_name,
+                    }
+                )
+
+        logger.info(
+            f"Topología de reintentos declarada: {self.max_retries} niveles, "
+            f"base {self.base_delay_ms} ms, DLQ {self.dead_letter_queue}"
+        )
+
+    def retry_count(self, message) -> int:
+        try:
+            return int((message.headers or {}).get(self.RETRY_HEADER, 0))
+        except (TypeError, ValueError):
+            return 0
+
+    async def handle_failure(
+        self,
+        channel: Channel,
+        message,
+        queue_name: str,
+        error: str,
+        retryable: bool = True
+    ) -> str:
+        attempt = self.retry_count(message) + 1
+
+        if retryable and attempt <= self.max_retries:
+            target = self.delay_queue_name(queue_name, attempt)
+            outcome = "retry"
+        else:
+            target = self.dead_letter_queue
+            outcome = "dead_letter"
+
+        headers = dict(message.headers or {})
+        headers.update({
+            self.RETRY_HEADER: attempt if outcome == "retry" else attempt - 1,
+            self.ORIGIN_HEADER: queue_name,
+            self.ERROR_HEADER: error[:1000],
+        })
+
+        await channel.default_exchange.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                content_type=message.content_type,
+                content_encoding=message.content_encoding,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                message_id=message.message_id,
+                correlation_id=message.correlation_id,
+                timestamp=message.timestamp,
+                type=message.type
+            ),
+            routing_key=target
+        )
+
+        if outcome == "retry":
+            self.retries[queue_name] = self.retries.get(queue_name, 0) + 1
+            logger.warning(
+                f"Mensaje de {queue_name} reintentará en {self.delay_ms(attempt)} ms "
+                f"(intento {attempt}/{self.max_retries}): {error}"
+            )
+        else:
+            self.dead_letters[queue_name] = self.dead_letters.get(queue_name, 0) + 1
+            logger.error(f"Mensaje de {queue_name} enviado a {self.dead_letter_queue}: {error}")
+
+        return outcome
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "retries": dict(self.retries),
+            "dead_letters": dict(self.dead_letters),
+        }
+
+retry_policy = RetryPolicy()
@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "bovara-ml"
+SCOPE_NAME = "bovara.worker"
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple, set)):
+        return {"arrayValue": {"values": [_attribute_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in values.items()
+        if value is not None
+    ]
+
+class SpanExporter(ABC):
+
+    @abstractmethod
+    def export(self, trace_id: str, correlation: Dict[str, Any], spans: list) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+class JsonFileSpanExporter(SpanExporter):
+
+    def __init__(self, path: str):
+        self.path = path.format(pid=os.getpid())
+        self._file = None
+        self._lock = threading.Lock()
+        self.exported = 0
+
+    def export(self, trace_id: str, correlation: Dict[str, Any], spans: list) -> None:
+        line = json.dumps(self.to_otlp(trace_id, correlation, spans), separators=(",", ":"))
+        with self._lock:
+            self._get_file().write(line + "\n")
+        self.exported += len(spans)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Trazas exportadas a {self.path} ({self.exported} spans)")
+
+    @staticmethod
+    def to_otlp(trace_id: str, correlation: Dict[str, Any], spans: list) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": _attributes({"service.name": SERVICE_NAME, "process.pid": os.getpid()})
+                },
+                "scopeSpans": [{
+                    "scope": {"name": SCOPE_NAME},
+                    "spans": [
+                        {
+                            "traceId": trace_id,
+                            "spanId": span.span_id,
+                            "parentSpanId": span.parent_span_id or "",
+                            "name": span.name,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": _attributes({**correlation, **span.attributes}),
+                            "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+                        }
+                        for span in spans
+                    ]
+                }]
+            }]
+        }
+
+    def _get_file(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", buffering=1, encoding="utf-8")
+        return self._file
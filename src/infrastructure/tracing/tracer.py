@@ -0,0 +1,138 @@
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from src.infrastructure.tracing.span_exporter import JsonFileSpanExporter, SpanExporter
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class _Trace:
+    __slots__ = ("trace_id", "correlation", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.correlation: Dict[str, Any] = {}
+        self.spans: List["Span"] = []
+
+class Span:
+    __slots__ = (
+        "tracer", "trace", "name", "span_id", "parent_span_id",
+        "attributes", "start_ns", "end_ns", "error", "_token"
+    )
+
+    def __init__(self, tracer: "Tracer", trace: _Trace, name: str, parent_span_id: Optional[str], attributes: dict):
+        self.tracer = tracer
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+        self._token = None
+
+    @property
+    def is_root(self) -> bool:
+        return self.parent_span_id is None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_correlation(self, **values) -> None:
+        self.trace.correlation.update(values)
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = self.tracer._current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._current.reset(self._token)
+        self.trace.spans.append(self)
+        if self.is_root:
+            self.tracer._export(self.trace)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_correlation(self, **values) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+
+    def __init__(self, enabled: bool, sample_rate: float = 1.0, exporter: Optional[SpanExporter] = None):
+        self.enabled = enabled and exporter is not None
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self._current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+        self.traces_started = 0
+        self.traces_sampled = 0
+
+    def start_trace(self, name: str, **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+
+        self.traces_started += 1
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return NOOP_SPAN
+
+        self.traces_sampled += 1
+        return Span(self, _Trace(os.urandom(16).hex()), name, None, attributes)
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+
+        parent = self._current.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, parent.trace, name, parent.span_id, attributes)
+
+    def current_span(self):
+        if not self.enabled:
+            return NOOP_SPAN
+        return self._current.get() or NOOP_SPAN
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "traces_started": self.traces_started,
+            "traces_sampled": self.traces_sampled
+        }
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+    def _export(self, trace: _Trace) -> None:
+        try:
+            self.exporter.export(trace.trace_id, trace.correlation, trace.spans)
+        except Exception as e:
+            logger.error(f"Error exportando traza {trace.trace_id}: {str(e)}")
+
+tracer = Tracer(
+    enabled=settings.TRACING_ENABLED,
+    sample_rate=settings.TRACING_SAMPLE_RATE,
+    exporter=JsonFileSpanExporter(settings.TRACING_EXPORT_PATH) if settings.TRACING_ENABLED else None
+)
@@ -1,11 +1,28 @@
+import time
+
+_IMPORTS_STARTED = time.perf_counter()
+
+import argparse
 import asyncio
 import logging
+import os
 import sys
 import signal
+from contextlib import contextmanager
+from typing import Dict
 
 from config.settings import settings
 from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.queue.rabbitmq_connection import RabbitMQConnection
+from src.infrastructure.compute.compute_executor import compute_executor
+from src.infrastructure.compute.ml_warmup import warm_up_ml_modules
+from src.infrastructure.metrics.metrics_server import MetricsServer
+from src.infrastructure.metrics.worker_metrics import register_worker_collectors
+from src.infrastructure.tracing.tracer import tracer
 from src.adapters.input.queue_consumer_adapter import QueueConsumerAdapter
+from src.worker_supervisor import SLOT_ENV, WorkerSupervisor
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
@@ -15,26 +32,72 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+class StartupReport:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {"imports": IMPORT_SECONDS}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def log(self) -> None:
+        total = IMPORT_SECONDS + time.perf_counter() - self.started
+        breakdown = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        logger.info(f"Arranque en {total * 1000:.0f} ms ({breakdown})")
+
 class MLServiceWorker:
 
     def __init__(self):
         self.consumer_adapter = QueueConsumerAdapter()
         self.running = False
+        self.startup = StartupReport()
+        self._warmup_task = None
+        self.metrics_server = None
+        if settings.METRICS_ENABLED:
+            register_worker_collectors(self.consumer_adapter)
+            self.metrics_server = MetricsServer(
+                settings.METRICS_HOST,
+                settings.METRICS_PORT + int(os.getenv(SLOT_ENV, "0"))
+            )
 
     async def start(self) -> None:
+        consume_task = None
         try:
-            logger.info("Iniciando servicio ML de Bovara")
+            logger.info(f"Iniciando servicio ML de Bovara (pid {os.getpid()})")
             settings.validate()
 
-            await PostgresPool.initialize()
-            logger.info("Base de datos PostgreSQL inicializada")
+            shutdown_event = self._install_signal_handlers()
+
+            await asyncio.gather(self._open_database(), self._connect_broker())
+
+            if self.metrics_server is not None:
+                await self._start_metrics()
 
-            await self.consumer_adapter.start()
+            with self.startup.phase("queue_declare"):
+                await self.consumer_adapter.connect()
+
+            consume_task = asyncio.create_task(self.consumer_adapter.start())
             self.running = True
+            self.startup.log()
+
+            if settings.ML_WARMUP_ENABLED:
+                self._warmup_task = asyncio.create_task(self._warm_up())
 
             logger.info("Servicio ML en ejecución. Esperando mensajes...")
 
-            await self._wait_for_shutdown()
+            shutdown_task = asyncio.create_task(shutdown_event.wait())
+            await asyncio.wait({consume_task, shutdown_task}, return_when=asyncio.FIRST_COMPLETED)
+
+            if consume_task.done():
+                shutdown_task.cancel()
+                consume_task.result()
+                raise RuntimeError("Consumer detenido inesperadamente")
 
         except KeyboardInterrupt:
             logger.info("Servicio interrumpido por usuario")
@@ -43,6 +106,9 @@ class MLServiceWorker:
             sys.exit(1)
         finally:
             await self.stop()
+            if consume_task is not None and not consume_task.done():
+                consume_task.cancel()
+                await asyncio.gather(consume_task, return_exceptions=True)
 
     async def stop(self) -> None:
         logger.info("Deteniendo servicio ML")
@@ -51,6 +117,22 @@ class MLServiceWorker:
         except Exception as e:
             logger.error(f"Error deteniendo consumer: {str(e)}")
 
+        if self.metrics_server is not None:
+            try:
+                await self.metrics_server.stop()
+            except Exception as e:
+                logger.error(f"Error deteniendo servidor de métricas: {str(e)}")
+
+        try:
+            tracer.shutdown()
+        except Exception as e:
+            logger.error(f"Error cerrando exportador de trazas: {str(e)}")
+
+        try:
+            compute_executor.shutdown()
+        except Exception as e:
+            logger.error(f"Error deteniendo executor de cómputo: {str(e)}")
+
         try:
             await PostgresPool.close()
         except Exception as e:
@@ -59,24 +141,47 @@ class MLServiceWorker:
         self.running = False
         logger.info("Servicio detenido")
 
-    async def _wait_for_shutdown(self) -> None:
-        loop = asyncio.get_event_loop()
+    async def _open_database(self) -> None:
+        with self.startup.phase("db_pool"):
+            await PostgresPool.initialize()
+        logger.info("Base de datos PostgreSQL inicializada")
+
+    async def _connect_broker(self) -> None:
+        with self.startup.phase("broker_connect"):
+            await RabbitMQConnection.initialize()
+
+    async def _start_metrics(self) -> None:
+        try:
+            await self.metrics_server.start()
+        except OSError as e:
+            logger.error(f"No se pudo iniciar el servidor de métricas: {str(e)}")
+            self.metrics_server = None
+
+    async def _warm_up(self) -> None:
+        try:
+            seconds = await asyncio.to_thread(warm_up_ml_modules)
+            logger.info(f"Modelos ML precargados en {seconds * 1000:.0f} ms")
+        except Exception as e:
+            logger.error(f"Error precargando modelos ML: {str(e)}")
+
+    def _install_signal_handlers(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
         shutdown_event = asyncio.Event()
 
-        def signal_handler(sig, frame):
-            logger.info(f"Señal {sig} recibida")
+        def signal_handler(sig):
+            logger.info(f"Señal {sig.name} recibida")
             shutdown_event.set()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, signal_handler, sig)
 
-        await shutdown_event.wait()
+        return shutdown_event
 
 async def main():
     worker = MLServiceWorker()
     await worker.start()
 
-if __name__ == "__main__":
+def run_worker() -> None:
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -84,4 +189,26 @@ if __name__ == "__main__":
         sys.exit(0)
     except Exception as e:
         logger.error(f"Error no manejado: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Servicio ML de Bovara")
+    parser.add_argument(
+        "--mode",
+        choices=["single", "supervisor"],
+        default=settings.WORKER_MODE,
+        help="single: un proceso; supervisor: N procesos worker con reinicio automático"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.WORKER_PROCESSES,
+        help="Procesos worker en modo supervisor (0 = número de CPUs)"
+    )
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.mode == "supervisor":
+        sys.exit(WorkerSupervisor(run_worker, processes=args.processes or None).run())
+    run_worker()
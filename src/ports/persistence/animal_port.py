@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
 from src.domain.entities.animal import Animal
 
@@ -17,10 +17,22 @@ class AnimalRepository(ABC):
     async def find_active_by_ranch(self, ranch_id: UUID) -> List[Animal]:
         pass
 
+    @abstractmethod
+    async def count_active_by_ranch(self, ranch_id: UUID) -> int:
+        pass
+
+    @abstractmethod
+    async def get_active_fingerprint(self, ranch_id: UUID) -> Tuple[int, int]:
+        pass
+
     @abstractmethod
     async def update_cluster_label(self, animal_id: UUID, label: str) -> bool:
         pass
 
+    @abstractmethod
+    async def update_cluster_labels(self, labels: Dict[UUID, str]) -> int:
+        pass
+
     @abstractmethod
     async def update_forecast_data(
         self,
@@ -31,4 +43,8 @@ class AnimalRepository(ABC):
         next_likely_heat_date: Optional[object],
         projected_weight_30d: Optional[float]
     ) -> bool:
+        pass
+
+    @abstractmethod
+    async def update_forecast_data_batch(self, forecasts: List[tuple]) -> int:
         pass
\ No newline at end of file
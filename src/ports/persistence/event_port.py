@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 
 from src.domain.entities.event import Event
@@ -14,6 +14,19 @@ class EventRepository(ABC):
     async def find_weight_events(self, animal_id: UUID, days_back: int = 90) -> List[tuple]:
         pass
 
+    @abstractmethod
+    async def find_weight_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 90,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        pass
+
+    @abstractmethod
+    async def get_weight_watermark(self, ranch_id: UUID) -> Optional[datetime]:
+        pass
+
     @abstractmethod
     async def find_breeding_events(self, animal_id: UUID, days_back: int = 365) -> List[tuple]:
         pass
@@ -22,6 +35,24 @@ class EventRepository(ABC):
     async def find_birth_events(self, animal_id: UUID, days_back: int = 365) -> List[tuple]:
         pass
 
+    @abstractmethod
+    async def find_breeding_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 365,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        pass
+
+    @abstractmethod
+    async def find_birth_events_by_ranch(
+        self,
+        ranch_id: UUID,
+        days_back: int = 365,
+        animal_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, List[tuple]]:
+        pass
+
     @abstractmethod
     async def get_last_event_by_type(self, animal_id: UUID, event_type: str) -> Optional[tuple]:
         pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 class QueuePublisherPort(ABC):
     @abstractmethod
@@ -11,5 +11,13 @@ class QueuePublisherPort(ABC):
         pass
 
     @abstractmethod
-    async def publish(self, queue_name: str, message: Dict[str, Any]) -> bool:
-        pass
\ No newline at end of file
+    async def publish(self, queue_name: str, message: Dict[str, Any], **properties) -> bool:
+        pass
+
+    @abstractmethod
+    async def publish_nowait(self, queue_name: str, message: Dict[str, Any], **properties) -> None:
+        pass
+
+    @abstractmethod
+    async def wait_for_confirms(self) -> Tuple[int, int]:
+        pass
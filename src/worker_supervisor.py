@@ -0,0 +1,124 @@
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SLOT_ENV = "WORKER_SLOT"
+
+def _run_slot(target: Callable[[], None], slot: int) -> None:
+    os.environ[SLOT_ENV] = str(slot)
+    target()
+
+class WorkerSupervisor:
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        processes: Optional[int] = None,
+        shutdown_timeout: float = None,
+        restart_backoff: float = None,
+        stable_after: float = 60.0
+    ):
+        self.target = target
+        self.processes = processes or os.cpu_count() or 1
+        self.shutdown_timeout = shutdown_timeout if shutdown_timeout is not None else settings.WORKER_SHUTDOWN_TIMEOUT + 5
+        self.restart_backoff = restart_backoff if restart_backoff is not None else settings.WORKER_RESTART_BACKOFF
+        self.stable_after = stable_after
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: Dict[int, multiprocessing.Process] = {}
+        self._started_at: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = False
+        self.restarts = 0
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+
+        logger.info(f"Supervisor iniciando {self.processes} procesos worker")
+        for slot in range(self.processes):
+            self._spawn(slot)
+
+        while not self._stopping:
+            self._restart_due()
+            sentinels = [worker.sentinel for worker in self._workers.values()]
+            if sentinels:
+                wait(sentinels, timeout=1.0)
+            else:
+                time.sleep(min(1.0, self.restart_backoff))
+            self._reap()
+
+        return self._shutdown()
+
+    def _request_stop(self, sig, frame) -> None:
+        if not self._stopping:
+            logger.info(f"Señal {sig} recibida, deteniendo workers")
+        self._stopping = True
+
+    def _spawn(self, slot: int) -> None:
+        worker = self._context.Process(
+            target=_run_slot,
+            args=(self.target, slot),
+            name=f"bovara-worker-{slot}",
+            daemon=False
+        )
+        worker.start()
+        self._workers[slot] = worker
+        self._started_at[slot] = time.monotonic()
+        self._restart_at.pop(slot, None)
+        logger.info(f"Worker {slot} iniciado (pid {worker.pid})")
+
+    def _reap(self) -> None:
+        for slot, worker in list(self._workers.items()):
+            if worker.is_alive():
+                continue
+
+            worker.join()
+            del self._workers[slot]
+            if self._stopping:
+                continue
+
+            uptime = time.monotonic() - self._started_at[slot]
+            if uptime >= self.stable_after:
+                self._failures[slot] = 0
+            self._failures[slot] = self._failures.get(slot, 0) + 1
+
+            delay = min(self.restart_backoff * 2 ** (self._failures[slot] - 1), 60.0)
+            self._restart_at[slot] = time.monotonic() + delay
+            logger.error(
+                f"Worker {slot} (pid {worker.pid}) terminó con código {worker.exitcode}; "
+                f"reinicio en {delay:.1f}s"
+            )
+
+    def _restart_due(self) -> None:
+        now = time.monotonic()
+        for slot, restart_at in list(self._restart_at.items()):
+            if restart_at <= now and not self._stopping:
+                self.restarts += 1
+                self._spawn(slot)
+
+    def _shutdown(self) -> int:
+        for worker in self._workers.values():
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for slot, worker in self._workers.items():
+            worker.join(max(deadline - time.monotonic(), 0))
+            if worker.is_alive():
+                logger.warning(f"Worker {slot} (pid {worker.pid}) no terminó a tiempo, forzando cierre")
+                worker.kill()
+                worker.join()
+
+        exit_codes = [worker.exitcode for worker in self._workers.values()]
+        self._workers.clear()
+        logger.info("Supervisor detenido")
+        return 0 if all(code in (0, -signal.SIGTERM) for code in exit_codes) else 1
@@ -0,0 +1,82 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.persistence.animal_repository_impl import AnimalRepositoryImpl
+from src.infrastructure.persistence.postgres_pool import PostgresPool
+
+class FakeDatabase:
+
+    def __init__(self):
+        self.updates = []
+
+    async def execute_update(self, query, params=None):
+        self.updates.append((" ".join(query.split()), params))
+        return len(params[0])
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(PostgresPool, "execute_update", database.execute_update)
+    return database
+
+@pytest.mark.asyncio
+async def test_update_cluster_labels_sends_one_unnest_update(database):
+    first, second = uuid4(), uuid4()
+
+    updated = await AnimalRepositoryImpl().update_cluster_labels({first: "PRODUCTIVO_A", second: "PENDING"})
+
+    assert updated == 2
+    assert database.updates == [(
+        "UPDATE animals AS a "
+        "SET current_cluster_label = v.label, "
+        "server_updated_at = NOW() "
+        "FROM UNNEST(%s::uuid[], %s::text[]) AS v(id, label) "
+        "WHERE a.id = v.id AND a.is_deleted = FALSE",
+        ([str(first), str(second)], ["PRODUCTIVO_A", "PENDING"])
+    )]
+
+@pytest.mark.asyncio
+async def test_update_cluster_labels_skips_empty_batch(database):
+    assert await AnimalRepositoryImpl().update_cluster_labels({}) == 0
+    assert database.updates == []
+
+@pytest.mark.asyncio
+async def test_update_forecast_data_batch_sends_columns_as_arrays(database):
+    first, second = uuid4(), uuid4()
+    forecasts = [
+        (first, date(2025, 1, 10), date(2025, 3, 1), date(2025, 1, 1), date(2024, 12, 20), 412.5),
+        (second, None, None, None, date(2024, 12, 22), None),
+    ]
+
+    updated = await AnimalRepositoryImpl().update_forecast_data_batch(forecasts)
+
+    assert updated == 2
+    [(query, params)] = database.updates
+    assert query == (
+        "UPDATE animals AS a "
+        "SET predicted_sale_date = v.predicted_sale_date, "
+        "expected_calving_date = v.expected_calving_date, "
+        "suggested_dry_date = v.suggested_dry_date, "
+        "next_likely_heat_date = v.next_likely_heat_date, "
+        "projected_weight_30d = v.projected_weight_30d, "
+        "server_updated_at = NOW() "
+        "FROM UNNEST( %s::uuid[], %s::date[], %s::date[], %s::date[], %s::date[], %s::numeric[] ) "
+        "AS v(id, predicted_sale_date, expected_calving_date, suggested_dry_date, "
+        "next_likely_heat_date, projected_weight_30d) "
+        "WHERE a.id = v.id AND a.is_deleted = FALSE"
+    )
+    assert params == (
+        [str(first), str(second)],
+        [date(2025, 1, 10), None],
+        [date(2025, 3, 1), None],
+        [date(2025, 1, 1), None],
+        [date(2024, 12, 20), date(2024, 12, 22)],
+        [412.5, None]
+    )
+
+@pytest.mark.asyncio
+async def test_update_forecast_data_batch_skips_empty_batch(database):
+    assert await AnimalRepositoryImpl().update_forecast_data_batch([]) == 0
+    assert database.updates == []
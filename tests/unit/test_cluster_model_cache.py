@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from uuid import uuid4
+from datetime import date, datetime, timedelta
+
+from src.domain.services.ml_clustering_model import MLClusteringModel
+from src.infrastructure.cache.cluster_model_cache import ClusterModelCache, ClusterModelEntry
+
+@pytest.fixture
+def trained_entry():
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(20, 6))
+    kmeans, scaler, silhouette = MLClusteringModel.train_clustering_model(features, n_clusters=3)
+    watermark = (datetime(2024, 1, 1), 20, 12345, date(2024, 1, 2))
+    return ClusterModelEntry(
+        kmeans_model=kmeans,
+        scaler=scaler,
+        lote_percentiles={"p25": 0.4, "p50": 0.6, "p75": 0.8},
+        watermark=watermark,
+        n_animals=20,
+        silhouette=silhouette
+    )
+
+def test_cache_hit_with_same_watermark(trained_entry):
+    cache = ClusterModelCache(max_entries=4, max_bytes=10 * 1024 * 1024)
+    ranch_id = uuid4()
+    cache.put(ranch_id, trained_entry)
+
+    assert cache.get(ranch_id, trained_entry.watermark) is trained_entry
+    assert cache.stats()["hits"] == 1
+
+def test_cache_invalidated_by_new_watermark(trained_entry):
+    cache = ClusterModelCache(max_entries=4, max_bytes=10 * 1024 * 1024)
+    ranch_id = uuid4()
+    cache.put(ranch_id, trained_entry)
+
+    last_event, count, checksum, day = trained_entry.watermark
+    newer_event = (last_event + timedelta(hours=1), count, checksum, day)
+    assert cache.get(ranch_id, newer_event) is None
+    assert ranch_id not in cache
+
+    cache.put(ranch_id, trained_entry)
+    more_animals = (last_event, count + 1, checksum, day)
+    assert cache.get(ranch_id, more_animals) is None
+
+    cache.put(ranch_id, trained_entry)
+    replaced_animal = (last_event, count, checksum + 1, day)
+    assert cache.get(ranch_id, replaced_animal) is None
+
+    cache.put(ranch_id, trained_entry)
+    next_day = (last_event, count, checksum, day + timedelta(days=1))
+    assert cache.get(ranch_id, next_day) is None
+
+def test_cache_lru_eviction(trained_entry):
+    cache = ClusterModelCache(max_entries=2, max_bytes=10 * 1024 * 1024)
+    ranch_a, ranch_b, ranch_c = uuid4(), uuid4(), uuid4()
+
+    cache.put(ranch_a, trained_entry)
+    cache.put(ranch_b, trained_entry)
+    cache.get(ranch_a, trained_entry.watermark)
+    cache.put(ranch_c, trained_entry)
+
+    assert ranch_a in cache
+    assert ranch_b not in cache
+    assert ranch_c in cache
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_memory_cap(trained_entry):
+    cache = ClusterModelCache(max_entries=100, max_bytes=trained_entry.size_bytes * 2)
+    ranch_ids = [uuid4() for _ in range(3)]
+    for ranch_id in ranch_ids:
+        cache.put(ranch_id, trained_entry)
+
+    assert len(cache) == 2
+    assert cache.stats()["bytes"] <= cache.max_bytes
@@ -51,4 +51,11 @@ def test_calculate_lote_percentiles_empty():
     percentiles = ClusteringService.calculate_lote_percentiles([])
     assert percentiles["p25"] == 0.4
     assert percentiles["p50"] == 0.6
-    assert percentiles["p75"] == 0.8
\ No newline at end of file
+    assert percentiles["p75"] == 0.8
+
+def test_label_from_gdp():
+    percentiles = {"p25": 0.5, "p50": 0.8, "p75": 1.0}
+
+    assert ClusteringService.label_from_gdp(1.2, percentiles)[0] == ClusterLabel.PRODUCTIVO_A
+    assert ClusteringService.label_from_gdp(0.7, percentiles)[0] == ClusterLabel.PRODUCTIVO_B
+    assert ClusteringService.label_from_gdp(0.2, percentiles)[0] == ClusterLabel.PRODUCTIVO_C
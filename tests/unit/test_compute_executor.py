@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from src.infrastructure.compute.compute_executor import ComputeExecutor
+
+def _worker_thread(value, offset=0):
+    return threading.current_thread().name, value + offset
+
+def _fail():
+    raise ValueError("fallo de cómputo")
+
+@pytest.mark.asyncio
+async def test_run_executes_off_event_loop_and_records_timings():
+    executor = ComputeExecutor("thread", max_workers=2)
+    try:
+        thread_name, value = await executor.run(_worker_thread, 40, offset=2, label="suma")
+    finally:
+        executor.shutdown()
+
+    assert value == 42
+    assert thread_name != threading.current_thread().name
+
+    stats = executor.stats()
+    assert stats["jobs"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["labels"]["suma"]["jobs"] == 1
+    assert stats["labels"]["suma"]["compute_ms_p50"] >= 0.0
+    assert stats["labels"]["suma"]["wait_ms_p99"] >= 0.0
+
+@pytest.mark.asyncio
+async def test_run_propagates_exceptions():
+    executor = ComputeExecutor("thread", max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            await executor.run(_fail)
+    finally:
+        executor.shutdown()
+
+    assert executor.in_flight == 0
+    assert executor.jobs == 0
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ComputeExecutor("gpu")
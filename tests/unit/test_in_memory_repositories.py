@@ -0,0 +1,279 @@
+import asyncio
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from benchmarks.load_test import build_adapter, build_store, drive, generate_messages
+from benchmarks.synthetic_herd import generate_herd
+from src.application.services.cluster_use_case import ClusterUseCase
+from src.application.services.forecast_use_case import ForecastUseCase
+from src.domain.entities.ranch import Ranch
+from src.infrastructure.cache.cluster_model_cache import ClusterModelCache, cluster_model_cache
+from src.infrastructure.memory.in_memory_queue import InMemoryQueueStatusWriter
+from src.infrastructure.memory.in_memory_repositories import (
+    InMemoryAnimalRepository,
+    InMemoryEventRepository,
+    InMemoryPredictionRepository,
+    InMemoryRanchRepository,
+)
+from src.infrastructure.memory.in_memory_store import InjectedLatency, InMemoryStore
+
+def _store(n_animals=50):
+    herd = generate_herd(n_animals, seed=3)
+    store = InMemoryStore(now=datetime.combine(herd.reference_date, datetime.min.time()) + timedelta(hours=13))
+    for animal in herd.animals:
+        store.add_animal(
+            animal,
+            herd.weight_events[animal.id],
+            herd.breeding_events[animal.id],
+            herd.birth_events[animal.id]
+        )
+    return store, herd
+
+@pytest.mark.asyncio
+async def test_event_queries_match_postgres_window_and_grouping():
+    store, herd = _store()
+    events = InMemoryEventRepository(store)
+    animal = next(animal for animal in herd.animals if len(herd.weight_events[animal.id]) > 2)
+
+    recent = await events.find_weight_events(animal.id, days_back=30)
+    grouped = await events.find_weight_events_by_ranch(herd.ranch_id, days_back=90)
+    subset = await events.find_weight_events_by_ranch(herd.ranch_id, animal_ids=[animal.id])
+
+    assert recent == [event for event in herd.weight_events[animal.id] if event[0] >= store.now - timedelta(days=30)]
+    assert grouped == {animal_id: rows for animal_id, rows in herd.weight_events.items() if rows}
+    assert list(subset) == [animal.id]
+    assert await events.find_weight_events_by_ranch(herd.ranch_id, animal_ids=[]) == {}
+    assert (await events.get_last_event_by_type(animal.id, "weight"))[1] == herd.weight_events[animal.id][0][0]
+
+@pytest.mark.asyncio
+async def test_animal_updates_replace_frozen_entities():
+    store, herd = _store(10)
+    animals = InMemoryAnimalRepository(store)
+    animal_id = herd.animal_ids[0]
+
+    assert await animals.update_cluster_labels({animal_id: "ALTO", herd.animal_ids[1]: "BAJO"}) == 2
+    assert await animals.update_forecast_data(animal_id, None, None, None, None, 512.5)
+
+    updated = await animals.find_by_id(animal_id)
+    assert updated.current_cluster_label == "ALTO"
+    assert updated.projected_weight_30d == 512.5
+    assert await animals.count_active_by_ranch(herd.ranch_id) == 10
+
+@pytest.mark.asyncio
+async def test_injected_latency_is_bounded_by_connection_limit():
+    store = InMemoryStore(read_latency=InjectedLatency(base_ms=20), max_connections=2)
+    predictions = InMemoryPredictionRepository(store)
+
+    started = asyncio.get_running_loop().time()
+    await asyncio.gather(*(store.read() for _ in range(4)))
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert elapsed >= 0.035
+    assert await predictions.save_batch([])
+    assert store.stats()["reads"] == 4
+
+@pytest.mark.asyncio
+async def test_status_writer_keeps_previous_error():
+    store = InMemoryStore()
+    writer = InMemoryQueueStatusWriter(store, flush_size=10, flush_interval_seconds=0.01)
+
+    await writer.update("t1", "FAILED", "sin datos")
+    await writer.update("t1", "RETRYING")
+
+    assert store.queue_status["t1"] == ("RETRYING", "sin datos")
+
+@pytest.mark.asyncio
+async def test_load_driver_processes_messages_through_adapter():
+    store, herd_ids = build_store(1, 40, seed=5, read_latency=InjectedLatency(), write_latency=InjectedLatency())
+    adapter = build_adapter(store, coalesce_window_ms=5, publish_latency=InjectedLatency())
+    messages = generate_messages(herd_ids, 30, cluster_ratio=0.5, ranch_task_ratio=0.1, seed=5)
+
+    result = await drive(adapter, messages, concurrency=8)
+
+    assert result["messages"] == 30
+    assert result["statuses"] == {"success": 30}
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+    assert len(store.queue_status) == 30
+    assert all(status == "SUCCESS" for status, _ in store.queue_status.values())
+
+@pytest.mark.asyncio
+async def test_load_driver_uses_its_own_cluster_model_cache():
+    store, herd_ids = build_store(1, 40, seed=6, read_latency=InjectedLatency(), write_latency=InjectedLatency())
+    adapter = build_adapter(store, coalesce_window_ms=5, publish_latency=InjectedLatency())
+    injected = adapter.processor.cluster_use_case.model_cache
+    [ranch_id] = herd_ids
+
+    await drive(adapter, generate_messages(herd_ids, 10, cluster_ratio=1.0, ranch_task_ratio=0.0, seed=6), concurrency=4)
+
+    assert injected is not cluster_model_cache
+    assert ranch_id in injected
+    assert ranch_id not in cluster_model_cache
+
+class CountingExecutor:
+
+    def __init__(self):
+        self.labels = []
+
+    async def run(self, fn, *args, label=None, **kwargs):
+        self.labels.append(label)
+        await asyncio.sleep(0.01)
+        return fn(*args, **kwargs)
+
+def _cluster_use_case(store, executor=None):
+    return ClusterUseCase(
+        animal_repo=InMemoryAnimalRepository(store),
+        event_repo=InMemoryEventRepository(store),
+        prediction_repo=InMemoryPredictionRepository(store),
+        model_cache=ClusterModelCache(max_entries=4, max_bytes=64 * 1024 * 1024),
+        executor=executor
+    )
+
+@pytest.mark.asyncio
+async def test_watermark_changes_when_an_animal_is_replaced():
+    store, herd = _store(20)
+    use_case = _cluster_use_case(store)
+    before = await use_case._get_watermark(herd.ranch_id)
+
+    retired = herd.animals[0]
+    store.animals[retired.id] = replace(retired, is_active=False)
+    store.add_animal(replace(herd.animals[1], id=uuid4(), visual_tag="B-NUEVO"))
+    after = await use_case._get_watermark(herd.ranch_id)
+
+    assert before[1] == after[1]
+    assert before[2] != after[2]
+    assert after[3] == date.today()
+
+@pytest.mark.asyncio
+async def test_concurrent_cache_misses_train_the_lote_model_once():
+    store, herd = _store(30)
+    store.now = None
+    executor = CountingExecutor()
+    use_case = _cluster_use_case(store, executor)
+
+    entries = await asyncio.gather(*(use_case._get_lote_model(herd.ranch_id) for _ in range(5)))
+
+    assert executor.labels.count("cluster.train") == 1
+    assert all(entry is entries[0] for entry in entries)
+    assert use_case._lote_loads == {}
+
+@pytest.mark.asyncio
+async def test_newer_watermark_does_not_join_an_older_fit():
+    store, herd = _store(30)
+    executor = CountingExecutor()
+    use_case = _cluster_use_case(store, executor)
+
+    older = asyncio.create_task(use_case._get_lote_model(herd.ranch_id))
+    await asyncio.sleep(0.005)
+    newcomer = replace(herd.animals[0], id=uuid4(), visual_tag="B-NUEVO")
+    store.add_animal(newcomer, herd.weight_events[herd.animals[0].id])
+    newer = await use_case._get_lote_model(herd.ranch_id)
+    older = await older
+
+    assert executor.labels.count("cluster.train") == 2
+    assert newer.watermark == await use_case._get_watermark(herd.ranch_id)
+    assert older.watermark != newer.watermark
+    assert newer.n_animals == older.n_animals + 1
+    assert use_case._lote_loads == {}
+
+def _outcome(result):
+    return result.cluster_label, pytest.approx(result.confidence_score), result.explanation, result.severity
+
+@pytest.mark.asyncio
+async def test_execute_ranch_matches_per_animal_execute():
+    store, herd = _store(30)
+    use_case = _cluster_use_case(store)
+
+    expected = {
+        animal_id: _outcome(await use_case.execute(herd.ranch_id, animal_id))
+        for animal_id in herd.animal_ids
+    }
+    results = await use_case.execute_ranch(herd.ranch_id)
+
+    assert {result.animal_id: _outcome(result) for result in results} == expected
+    assert {
+        animal_id: store.animals[animal_id].current_cluster_label for animal_id in herd.animal_ids
+    } == {animal_id: outcome[0] for animal_id, outcome in expected.items()}
+
+@pytest.mark.asyncio
+async def test_execute_ranch_only_touches_requested_animals():
+    store, herd = _store(30)
+    use_case = _cluster_use_case(store)
+    requested = herd.animal_ids[:4]
+    expected = {
+        animal_id: _outcome(await use_case.execute(herd.ranch_id, animal_id))
+        for animal_id in requested
+    }
+    for animal_id in herd.animal_ids:
+        store.animals[animal_id] = replace(store.animals[animal_id], current_cluster_label=None)
+    saved = len(store.predictions)
+
+    results = await use_case.execute_ranch(herd.ranch_id, animal_ids=requested)
+
+    assert {result.animal_id: _outcome(result) for result in results} == expected
+    assert len(store.predictions) - saved == len(requested)
+    assert {prediction.animal_id for prediction in store.predictions[saved:]} == set(requested)
+    assert [
+        animal_id for animal_id in herd.animal_ids if store.animals[animal_id].current_cluster_label is not None
+    ] == requested
+
+def _forecast_use_case(store, herd):
+    store.add_ranch(
+        Ranch(id=herd.ranch_id, account_id=herd.ranch_id, name="Rancho", location="Sintético"),
+        herd.repro_settings,
+        herd.production_goals
+    )
+    return ForecastUseCase(
+        animal_repo=InMemoryAnimalRepository(store),
+        event_repo=InMemoryEventRepository(store),
+        ranch_repo=InMemoryRanchRepository(store),
+        prediction_repo=InMemoryPredictionRepository(store)
+    )
+
+def _forecast(result):
+    return (
+        result.predicted_sale_date,
+        result.expected_calving_date,
+        result.suggested_dry_date,
+        result.next_likely_heat_date,
+        pytest.approx(result.projected_weight_30d),
+        pytest.approx(result.confidence_score),
+        result.explanation,
+        result.severity
+    )
+
+@pytest.mark.asyncio
+async def test_forecast_execute_ranch_matches_per_animal_execute():
+    store, herd = _store(30)
+    use_case = _forecast_use_case(store, herd)
+
+    expected = {
+        animal_id: _forecast(await use_case.execute(herd.ranch_id, animal_id))
+        for animal_id in herd.animal_ids
+    }
+    results = await use_case.execute_ranch(herd.ranch_id)
+
+    assert {result.animal_id: _forecast(result) for result in results} == expected
+    assert any(result.projected_weight_30d is not None for result in results)
+
+@pytest.mark.asyncio
+async def test_forecast_execute_ranch_persists_only_requested_animals():
+    store, herd = _store(30)
+    use_case = _forecast_use_case(store, herd)
+    requested = herd.animal_ids[:4]
+
+    results = await use_case.execute_ranch(herd.ranch_id, animal_ids=requested)
+
+    assert [result.animal_id for result in results] == sorted(requested, key=lambda animal_id: store.animals[animal_id].visual_tag)
+    assert len(store.predictions) == len(requested)
+    for result in results:
+        animal = store.animals[result.animal_id]
+        assert animal.predicted_sale_date == result.predicted_sale_date
+        assert animal.expected_calving_date == result.expected_calving_date
+        assert animal.suggested_dry_date == result.suggested_dry_date
+        assert animal.next_likely_heat_date == result.next_likely_heat_date
+        assert animal.projected_weight_30d == result.projected_weight_30d
+    untouched = [store.animals[animal_id] for animal_id in herd.animal_ids[4:]]
+    assert all(animal.server_updated_at != store.clock() for animal in untouched)
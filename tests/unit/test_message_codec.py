@@ -0,0 +1,86 @@
+import json
+from uuid import UUID
+
+import pytest
+
+from src.infrastructure.queue import message_codec
+from src.infrastructure.queue.message_codec import MessageCodec
+from src.infrastructure.queue.messages import (
+    ClusterTaskMessage,
+    ForecastTaskMessage,
+    MessageDecodeError,
+    RanchClusterTaskMessage,
+    RanchForecastTaskMessage,
+)
+
+RANCH_ID = "7d1f5c1e-2f4b-4f57-9a51-0a8a2b1f6c11"
+ANIMAL_ID = "c5a2e0b4-8c3d-4e6b-b1f7-3d2c9a4e5f60"
+
+def _encode(payload):
+    return json.dumps(payload).encode()
+
+def test_decode_task_builds_typed_messages_with_parsed_uuids():
+    task = MessageCodec.decode_task(
+        "forecast",
+        _encode({"ranch_id": RANCH_ID, "animal_id": ANIMAL_ID, "task_id": "t-1", "timestamp": "2024-05-01T10:00:00"}),
+        "application/json"
+    )
+
+    assert isinstance(task, ForecastTaskMessage)
+    assert task.ranch_id == UUID(RANCH_ID)
+    assert task.animal_id == UUID(ANIMAL_ID)
+    assert task.task_id == "t-1"
+    assert not hasattr(task, "__dict__")
+    assert task.to_dict()["animal_id"] == ANIMAL_ID
+
+def test_decode_task_routes_by_queue_and_scope():
+    ranch_task = MessageCodec.decode_task("forecast", _encode({"scope": "ranch", "ranch_id": RANCH_ID, "task_id": 7}), None)
+    cluster_task = MessageCodec.decode_task(
+        "cluster",
+        _encode({"ranch_id": RANCH_ID, "animal_id": ANIMAL_ID, "task_id": "t"}),
+        "application/json; charset=utf-8"
+    )
+
+    assert isinstance(ranch_task, RanchForecastTaskMessage)
+    assert ranch_task.animal_id is None
+    assert ranch_task.task_id == "7"
+    assert isinstance(cluster_task, ClusterTaskMessage)
+
+@pytest.mark.parametrize("body, content_type", [
+    (b"{no json", "application/json"),
+    (b"[1, 2]", "application/json"),
+    (_encode({"ranch_id": "no-uuid", "task_id": "t"}), "application/json"),
+    (_encode({"ranch_id": RANCH_ID, "animal_id": 12, "task_id": "t"}), "application/json"),
+    (_encode({"ranch_id": RANCH_ID}), "application/json"),
+    (_encode({"ranch_id": RANCH_ID, "task_id": True}), "application/json"),
+    (_encode({"ranch_id": RANCH_ID, "task_id": "t"}), "application/xml"),
+    (_encode({"ranch_id": RANCH_ID, "task_id": "t"}), "application/json"),
+    (_encode({"ranch_id": RANCH_ID, "animal_id": "", "task_id": "t"}), "application/json"),
+    (_encode({"ranch_id": RANCH_ID, "animal_id": None, "task_id": "t"}), "application/json"),
+    (_encode({"scope": "lote", "ranch_id": RANCH_ID, "task_id": "t"}), "application/json"),
+    (_encode({"scope": "ranch", "ranch_id": RANCH_ID, "animal_id": ANIMAL_ID, "task_id": "t"}), "application/json"),
+])
+@pytest.mark.parametrize("queue_type", ["cluster", "forecast"])
+def test_invalid_payloads_are_rejected(body, content_type, queue_type):
+    with pytest.raises(MessageDecodeError):
+        MessageCodec.decode_task(queue_type, body, content_type)
+
+@pytest.mark.parametrize("queue_type, message_type", [
+    ("cluster", RanchClusterTaskMessage),
+    ("forecast", RanchForecastTaskMessage),
+])
+def test_ranch_tasks_require_explicit_scope(queue_type, message_type):
+    task = MessageCodec.decode_task(queue_type, _encode({"scope": "ranch", "ranch_id": RANCH_ID, "task_id": "t"}))
+
+    assert isinstance(task, message_type)
+    assert MessageCodec.decode_task(queue_type, MessageCodec.dumps(task.to_dict())) == task
+
+def test_unknown_queue_type_is_rejected():
+    with pytest.raises(MessageDecodeError):
+        MessageCodec.decode_task("billing", _encode({"ranch_id": RANCH_ID, "task_id": "t"}))
+
+def test_msgpack_body_without_msgpack_installed_is_rejected(monkeypatch):
+    monkeypatch.setattr(message_codec, "msgpack", None)
+
+    with pytest.raises(MessageDecodeError, match="msgpack no está instalado"):
+        MessageCodec.decode_task("cluster", b"\x80", "application/msgpack")
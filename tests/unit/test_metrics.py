@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.metrics.metrics_server import MetricsServer
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.infrastructure.metrics.worker_metrics import (
+    DB_QUERY_ERRORS,
+    DB_QUERY_SECONDS,
+    STAGE_SECONDS,
+    instrument_repository,
+    record_stage,
+    stage_scope,
+)
+
+def test_render_uses_prometheus_text_format():
+    registry = MetricsRegistry()
+    messages = registry.counter("jobs_total", "Trabajos", ("queue",))
+    latency = registry.histogram("job_seconds", "Latencia", ("queue",), buckets=(0.1, 1.0))
+
+    messages.inc(queue="forecast")
+    messages.inc(2, queue='clu"ster')
+    latency.observe(0.05, queue="forecast")
+    latency.observe(0.5, queue="forecast")
+    latency.observe(5.0, queue="forecast")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{queue="forecast"} 1' in lines
+    assert 'jobs_total{queue="clu\\"ster"} 2' in lines
+    assert "# TYPE job_seconds histogram" in lines
+    assert 'job_seconds_bucket{queue="forecast",le="0.1"} 1' in lines
+    assert 'job_seconds_bucket{queue="forecast",le="1"} 2' in lines
+    assert 'job_seconds_bucket{queue="forecast",le="+Inf"} 3' in lines
+    assert 'job_seconds_sum{queue="forecast"} 5.55' in lines
+    assert 'job_seconds_count{queue="forecast"} 3' in lines
+
+def test_collectors_are_rendered_and_failures_are_skipped():
+    registry = MetricsRegistry()
+
+    def broken():
+        raise RuntimeError("sin datos")
+
+    registry.register_collector(broken)
+    registry.register_collector(lambda: [("pool_waiting", "gauge", "Esperando", [({}, 3)])])
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE pool_waiting gauge" in lines
+    assert "pool_waiting 3" in lines
+
+def test_labels_must_match_declaration():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Trabajos", ("queue",))
+
+    with pytest.raises(ValueError):
+        counter.inc(stage="fetch")
+
+@pytest.mark.asyncio
+async def test_repository_methods_record_query_latency_and_stage():
+    @instrument_repository("test_repo")
+    class Repository:
+
+        async def find_rows(self):
+            await asyncio.sleep(0.01)
+            return [1]
+
+        async def save_rows(self):
+            raise ConnectionError("BD caída")
+
+    repository = Repository()
+
+    with stage_scope("test_operation") as totals:
+        assert await repository.find_rows() == [1]
+        with pytest.raises(ConnectionError):
+            await repository.save_rows()
+        record_stage("train", 0.5)
+
+    assert DB_QUERY_SECONDS.count(repository="test_repo", method="find_rows") == 1
+    assert DB_QUERY_ERRORS.value(repository="test_repo", method="save_rows") == 1
+    assert totals["fetch"] >= 0.01
+    assert set(totals) == {"fetch", "write", "train"}
+    assert STAGE_SECONDS.count(operation="test_operation", stage="train") == 1
+
+@pytest.mark.asyncio
+async def test_server_exposes_metrics_endpoint():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Trabajos").inc()
+    server = MetricsServer("127.0.0.1", 0, registry)
+    await server.start()
+
+    async def get(path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.bound_port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    try:
+        metrics = await get("/metrics")
+        missing = await get("/otra")
+    finally:
+        await server.stop()
+
+    assert metrics.startswith("HTTP/1.1 200 OK")
+    assert "text/plain; version=0.0.4" in metrics
+    assert "jobs_total 1" in metrics
+    assert missing.startswith("HTTP/1.1 404")
@@ -94,4 +94,113 @@ def test_analyze_reproductive_status_problema():
     )
     
     assert label == "REPRO_PROBLEMA"
-    assert conf > 0.75
\ No newline at end of file
+    assert conf > 0.75
+
+def test_predict_clusters_matches_single_prediction(sample_weight_events, low_weight_events):
+    features_list = []
+    for i, events in enumerate([sample_weight_events, low_weight_events] * 3):
+        features = MLClusteringModel.prepare_features(events, 400 + i*50)
+        features_list.append(features[0])
+
+    features_array = np.array(features_list)
+    kmeans, scaler, _ = MLClusteringModel.train_clustering_model(features_array, n_clusters=2)
+
+    labels, confidences = MLClusteringModel.predict_clusters(features_array, kmeans, scaler)
+
+    assert labels.shape == (6,)
+    for idx in range(len(features_array)):
+        cluster_num, confidence = MLClusteringModel.predict_cluster(
+            features_array[idx:idx + 1], kmeans, scaler
+        )
+        assert labels[idx] == cluster_num
+        assert confidences[idx] == pytest.approx(confidence)
+
+def test_prepare_features_batch_matches_single_animal():
+    rng = np.random.default_rng(7)
+    today = date.today()
+    herd = {}
+    for animal_id in range(40):
+        n_events = int(rng.integers(0, 8))
+        offsets = rng.choice(90, size=n_events, replace=False)
+        herd[animal_id] = [
+            (today - timedelta(days=int(offset)), float(rng.uniform(200, 500)))
+            for offset in offsets
+        ]
+    herd[40] = [(today, 300.0), (today, 310.0)]
+    animal_ids = list(herd.keys())
+    ages = np.array([float(rng.integers(200, 2000)) for _ in animal_ids])
+
+    animal_index, timestamps, weights = MLClusteringModel.flatten_weight_events(herd, animal_ids)
+    features, valid = MLClusteringModel.prepare_features_batch(
+        animal_index, timestamps, weights, len(animal_ids), ages
+    )
+
+    assert features.shape == (len(animal_ids), 6)
+    for idx, animal_id in enumerate(animal_ids):
+        expected = MLClusteringModel.prepare_features(herd[animal_id], int(ages[idx]))
+        if expected is None:
+            assert not valid[idx]
+            assert np.isnan(features[idx]).all()
+        else:
+            assert valid[idx]
+            np.testing.assert_allclose(features[idx], expected[0])
+
+def test_prepare_features_batch_matches_scalar_for_times_of_day():
+    base = datetime(2024, 3, 10)
+    herd = {
+        "cruza_medianoche": [(base + timedelta(hours=23), 300.0), (base + timedelta(days=1, hours=1), 310.0)],
+        "casi_dos_dias": [(base + timedelta(hours=1), 300.0), (base + timedelta(days=1, hours=23), 320.0)],
+        "mismo_dia": [(base + timedelta(hours=18), 305.0), (base + timedelta(hours=6), 300.0)],
+        "mezclado": [
+            (base + timedelta(days=5, hours=2), 330.0),
+            (base + timedelta(hours=22), 300.0),
+            (base + timedelta(days=2, hours=12), 318.0),
+            (base + timedelta(days=2, hours=3), 315.0),
+        ],
+    }
+    animal_ids = list(herd.keys())
+    ages = np.full(len(animal_ids), 400.0)
+
+    animal_index, timestamps, weights = MLClusteringModel.flatten_weight_events(herd, animal_ids)
+    features, valid = MLClusteringModel.prepare_features_batch(
+        animal_index, timestamps, weights, len(animal_ids), ages
+    )
+
+    assert valid.all()
+    for idx, animal_id in enumerate(animal_ids):
+        expected = MLClusteringModel.prepare_features(herd[animal_id], 400)
+        np.testing.assert_allclose(features[idx], expected[0])
+    assert features[0, 0] == 0.0
+    assert features[1, 0] == 20.0
+
+def test_score_clustering_modes():
+    rng = np.random.default_rng(3)
+    features = np.vstack([rng.normal(loc, 0.3, size=(300, 6)) for loc in (0.0, 3.0, 6.0)])
+    labels = np.repeat(np.arange(3), 300)
+
+    exact = MLClusteringModel.score_clustering(features, labels, mode="auto", exact_max=1000)
+    sampled = MLClusteringModel.score_clustering(features, labels, mode="auto", exact_max=500, sample_size=200)
+    sampled_again = MLClusteringModel.score_clustering(features, labels, mode="sampled", sample_size=200)
+    off = MLClusteringModel.score_clustering(features, labels, mode="off")
+
+    assert exact["mode"] == "exact"
+    assert exact["sample_size"] == 900
+    assert sampled["mode"] == "sampled"
+    assert sampled["sample_size"] == 200
+    assert sampled["silhouette"] == sampled_again["silhouette"]
+    assert abs(sampled["silhouette"] - exact["silhouette"]) < 0.05
+    assert off["silhouette"] is None
+
+def test_fit_clustering_model_reports_quality(sample_weight_events, low_weight_events):
+    features_array = np.array([
+        MLClusteringModel.prepare_features(events, 400 + i*50)[0]
+        for i, events in enumerate([sample_weight_events, low_weight_events] * 3)
+    ])
+
+    kmeans, scaler, quality = MLClusteringModel.fit_clustering_model(
+        features_array, n_clusters=2, silhouette_mode="off"
+    )
+
+    assert kmeans is not None
+    assert quality["mode"] == "off"
+    assert quality["silhouette"] is None
@@ -137,4 +137,86 @@ def test_ensemble_weight_prediction(weight_series):
     
     if sale_date:
         assert sale_date >= date.today()
-        assert 0.0 <= confidence <= 1.0
\ No newline at end of file
+        assert 0.0 <= confidence <= 1.0
+
+def _legacy_first_day(model, poly_features, days_from_first, target_weight):
+    for days_ahead in range(1, 730):
+        X_test = np.array([[days_from_first[-1] + days_ahead]])
+        if poly_features is not None:
+            predicted_weight = model.predict(poly_features.transform(X_test))[0]
+        else:
+            predicted_weight = model.predict(X_test)[0]
+        if predicted_weight >= target_weight:
+            return days_ahead
+    return None
+
+@pytest.mark.parametrize("degree", [1, 2])
+def test_first_day_reaching_weight_matches_daily_search(degree):
+    rng = np.random.default_rng(degree)
+    shapes = [
+        lambda d: 250 + 0.9 * d,
+        lambda d: 400 - 0.5 * d,
+        lambda d: 300 + 0.0 * d,
+        lambda d: 250 + 2.0 * d - 0.01 * d ** 2,
+        lambda d: 300 - 1.0 * d + 0.02 * d ** 2,
+    ]
+
+    for shape in shapes:
+        for _ in range(4):
+            days = np.sort(rng.choice(np.arange(0, 90), size=6, replace=False))
+            days = days - days[0]
+            weights = shape(days) + rng.normal(0, 3.0, size=len(days))
+            model, poly_features, _ = MLForecastingModel.train_weight_regression(
+                days, weights, polynomial_degree=degree
+            )
+            target = float(rng.uniform(weights[-1] + 1, weights[-1] + 200))
+
+            expected = _legacy_first_day(model, poly_features, days, target)
+            actual = MLForecastingModel.first_day_reaching_weight(
+                model, poly_features, float(days[-1]), target
+            )
+            assert actual == expected
+
+@pytest.mark.parametrize("with_time", [False, True])
+@pytest.mark.parametrize("degree", [1, 2])
+def test_train_weight_regression_batch_matches_sklearn(degree, with_time):
+    rng = np.random.default_rng(21 + degree)
+    today = datetime(2024, 3, 10) if with_time else date.today()
+    herd = {}
+    for animal_id in range(30):
+        n_events = int(rng.integers(1, 9))
+        offsets = rng.choice(90, size=n_events, replace=False)
+        hours = rng.integers(0, 24, size=n_events) if with_time else np.zeros(n_events, dtype=int)
+        gdp = rng.normal(0.8, 0.3)
+        herd[animal_id] = [
+            (today - timedelta(days=int(offset), hours=int(hour)), 250.0 + gdp * (90 - offset) + rng.normal(0, 4.0))
+            for offset, hour in zip(offsets, hours)
+        ]
+    animal_ids = list(herd.keys())
+
+    offsets, days_arr, weights_arr = MLForecastingModel.prepare_weight_series_batch(herd, animal_ids)
+    coefficients, r2, mae = MLForecastingModel.train_weight_regression_batch(
+        offsets, days_arr, weights_arr, polynomial_degree=degree
+    )
+
+    assert coefficients.shape == (30, degree + 1)
+    for idx, animal_id in enumerate(animal_ids):
+        days_single, weights_single = MLForecastingModel.prepare_weight_series(herd[animal_id])
+        if days_single is None or len(days_single) < 3:
+            assert np.isnan(r2[idx])
+            continue
+
+        np.testing.assert_allclose(days_arr[offsets[idx]:offsets[idx + 1]], days_single)
+        model, poly_features, r2_single = MLForecastingModel.train_weight_regression(
+            days_single, weights_single, polynomial_degree=degree
+        )
+        horizon = np.array([days_single[-1] + 30.0])
+        X = horizon.reshape(-1, 1)
+        expected = model.predict(poly_features.transform(X) if poly_features is not None else X)
+
+        assert r2[idx] == pytest.approx(r2_single, abs=1e-6)
+        np.testing.assert_allclose(
+            MLForecastingModel.evaluate_polynomial_batch(coefficients[idx], horizon),
+            expected,
+            rtol=1e-7
+        )
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+
+from src.domain.services.ml_clustering_model import MLClusteringModel
+from src.domain.services.ml_incremental_clustering_model import MLIncrementalClusteringModel
+
+@pytest.fixture
+def herd_features():
+    rng = np.random.default_rng(11)
+    centers = np.array([
+        [0.2, 280.0, 1.0, 8.0, 275.0, 400.0],
+        [0.6, 350.0, 5.0, 12.0, 340.0, 700.0],
+        [1.1, 420.0, 10.0, 18.0, 405.0, 900.0],
+    ])
+    scales = np.array([0.05, 10.0, 1.0, 1.0, 10.0, 40.0])
+    return np.vstack([center + rng.normal(size=(200, 6)) * scales for center in centers])
+
+def test_minibatch_engine_fits(herd_features):
+    kmeans, scaler, quality = MLClusteringModel.fit_clustering_model(
+        herd_features, n_clusters=3, engine="minibatch"
+    )
+
+    assert kmeans is not None
+    assert kmeans.cluster_centers_.shape == (3, 6)
+    assert quality["engine"] == "minibatch"
+    assert quality["warm_start"] is False
+
+def test_warm_start_keeps_cluster_numbering(herd_features):
+    model, scaler = MLIncrementalClusteringModel.fit(herd_features, n_clusters=3)
+    labels_before = model.predict(scaler.transform(herd_features))
+
+    rng = np.random.default_rng(5)
+    updated = herd_features.copy()
+    updated[:30, 1] += rng.normal(0, 2.0, size=30)
+
+    warm_model, warm_scaler = MLIncrementalClusteringModel.fit(
+        updated, n_clusters=3, previous_model=model, previous_scaler=scaler
+    )
+    labels_after = warm_model.predict(warm_scaler.transform(herd_features))
+
+    assert np.mean(labels_before == labels_after) > 0.95
+
+def test_changed_rows_detects_new_changed_and_removed():
+    previous_ids = ["a", "b", "c"]
+    previous_features = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    animal_ids = ["a", "c", "d"]
+    features = np.array([[1.0, 2.0], [5.0, 7.0], [0.0, 0.0]])
+
+    changed, removed = MLIncrementalClusteringModel.changed_rows(
+        previous_ids, previous_features, animal_ids, features
+    )
+
+    assert changed.tolist() == [1, 2]
+    assert removed == 1
+
+def test_partial_update_moves_centroids(herd_features):
+    model, scaler = MLIncrementalClusteringModel.fit(herd_features, n_clusters=3)
+    centers_before = model.cluster_centers_.copy()
+
+    updated = MLIncrementalClusteringModel.partial_update(model, scaler, herd_features[:20] + 5.0)
+
+    assert updated is not model
+    assert updated.cluster_centers_.shape == centers_before.shape
+    assert not np.allclose(updated.cluster_centers_, centers_before)
+    assert np.array_equal(model.cluster_centers_, centers_before)
@@ -0,0 +1,214 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+import pytest
+
+from config.settings import settings
+from src.infrastructure.persistence import postgres_pool
+from src.infrastructure.persistence.postgres_pool import PostgresPool
+
+class FakePool:
+
+    def __init__(self, conninfo=None, checkout_delay=0.0, conn=None, **kwargs):
+        self.conninfo = conninfo
+        self.conn = conn
+        self.kwargs = kwargs
+        self.checkout_delay = checkout_delay
+        self.min_size = kwargs.get("min_size", 1)
+        self.max_size = kwargs.get("max_size", 4)
+        self.opened = False
+
+    async def open(self):
+        self.opened = True
+
+    @asynccontextmanager
+    async def connection(self):
+        await asyncio.sleep(self.checkout_delay)
+        yield self.conn if self.conn is not None else object()
+
+    def get_stats(self):
+        return {"pool_size": 3, "pool_available": 2, "requests_waiting": 1, "connections_num": 7, "requests_errors": 0}
+
+class FakeCopy:
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    async def write_row(self, row):
+        self.cursor.copied.append(row)
+
+class FakeCursor:
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.copied = []
+        self.rowcount = -1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params=None):
+        self.connection.statements.append(" ".join(query.split()))
+        if query.lstrip().startswith("INSERT"):
+            self.rowcount = len(self.copied)
+
+    async def executemany(self, query, params_list):
+        assert self.connection.in_pipeline
+        self.connection.statements.append(" ".join(query.split()))
+        self.connection.executemany_params.append(list(params_list))
+        self.rowcount = len(params_list)
+
+    @asynccontextmanager
+    async def copy(self, statement):
+        self.connection.statements.append(statement)
+        yield FakeCopy(self)
+        self.connection.copied.extend(self.copied)
+
+class FakeConnection:
+
+    def __init__(self):
+        self.statements = []
+        self.executemany_params = []
+        self.copied = []
+        self.commits = 0
+        self.in_pipeline = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    @asynccontextmanager
+    async def pipeline(self):
+        self.in_pipeline = True
+        try:
+            yield
+        finally:
+            self.in_pipeline = False
+
+    async def commit(self):
+        self.commits += 1
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(PostgresPool, "_pool", None)
+    monkeypatch.setattr(PostgresPool, "_checkout_wait_ms", deque(maxlen=2048))
+    monkeypatch.setattr(PostgresPool, "_lease_ms", deque(maxlen=2048))
+    monkeypatch.setattr(PostgresPool, "_leases_total", 0)
+    monkeypatch.setattr(PostgresPool, "_leased", 0)
+    return PostgresPool
+
+@pytest.mark.asyncio
+async def test_initialize_keeps_a_small_warm_pool(pool, monkeypatch):
+    monkeypatch.setattr(postgres_pool, "AsyncConnectionPool", FakePool)
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DATABASE_POOL_MIN_SIZE", 2)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 20)
+
+    await pool.initialize()
+
+    assert pool._pool.opened
+    assert pool._pool.kwargs["min_size"] == 2
+    assert pool._pool.kwargs["max_size"] == 30
+
+@pytest.mark.asyncio
+async def test_connection_records_checkout_wait_and_lease_time(pool):
+    pool._pool = FakePool(checkout_delay=0.02, min_size=2, max_size=30)
+
+    async with pool.connection():
+        assert pool._leased == 1
+        await asyncio.sleep(0.03)
+
+    with pytest.raises(ValueError):
+        async with pool.connection():
+            raise ValueError("fallo de consulta")
+
+    assert pool._leased == 0
+    assert pool._leases_total == 2
+    assert len(pool._checkout_wait_ms) == 2
+    assert min(pool._checkout_wait_ms) >= 15
+    assert max(pool._lease_ms) >= 25
+    assert min(pool._lease_ms) < 25
+
+@pytest.mark.asyncio
+async def test_connection_requires_initialize(pool):
+    with pytest.raises(RuntimeError):
+        async with pool.connection():
+            pass
+
+def test_get_stats_without_pool(pool):
+    pool._lease_ms.extend([1.0, 2.0, 3.0])
+
+    stats = pool.get_stats()
+
+    assert stats["size"] == 0
+    assert stats["max_size"] == 0
+    assert stats["lease_ms_p50"] == 2.0
+    assert stats["lease_ms_p99"] == 3.0
+    assert stats["checkout_wait_ms_p50"] == 0.0
+
+def test_get_stats_reports_pool_and_lease_percentiles(pool):
+    pool._pool = FakePool(min_size=2, max_size=30)
+    pool._checkout_wait_ms.extend(float(value) for value in range(1, 101))
+    pool._lease_ms.extend([5.0] * 99 + [500.0])
+    pool._leases_total = 100
+
+    stats = pool.get_stats()
+
+    assert stats == {
+        "leases_total": 100,
+        "leased": 0,
+        "checkout_wait_ms_p50": 51.0,
+        "checkout_wait_ms_p99": 99.0,
+        "lease_ms_p50": 5.0,
+        "lease_ms_p99": 5.0,
+        "size": 3,
+        "idle": 2,
+        "waiting": 1,
+        "min_size": 2,
+        "max_size": 30,
+        "connections_num": 7,
+        "requests_errors": 0,
+    }
+
+@pytest.mark.asyncio
+async def test_batch_execute_update_pipelines_executemany(pool):
+    conn = FakeConnection()
+    pool._pool = FakePool(conn=conn)
+    params_list = [("a", 1), ("b", 2), ("c", 3)]
+
+    rowcount = await pool.batch_execute_update("UPDATE t SET v = %s WHERE id = %s", params_list)
+
+    assert rowcount == 3
+    assert conn.statements == ["UPDATE t SET v = %s WHERE id = %s"]
+    assert conn.executemany_params == [params_list]
+    assert conn.commits == 1
+    assert await pool.batch_execute_update("UPDATE t SET v = %s", []) == 0
+    assert pool._leases_total == 1
+
+@pytest.mark.asyncio
+async def test_copy_merge_copies_into_staging_and_merges(pool):
+    conn = FakeConnection()
+    pool._pool = FakePool(conn=conn)
+    rows = [("a", 1), ("b", 2)]
+
+    rowcount = await pool.copy_merge(
+        "ml_predictions",
+        ["id", "severity"],
+        rows,
+        "INSERT INTO ml_predictions ({columns}) SELECT {columns} FROM {staging} ON CONFLICT (id) DO NOTHING"
+    )
+
+    assert rowcount == 2
+    assert conn.statements == [
+        "CREATE TEMP TABLE ml_predictions_staging (LIKE ml_predictions INCLUDING DEFAULTS) ON COMMIT DROP",
+        "COPY ml_predictions_staging (id, severity) FROM STDIN",
+        "INSERT INTO ml_predictions (id, severity) SELECT id, severity FROM ml_predictions_staging "
+        "ON CONFLICT (id) DO NOTHING",
+    ]
+    assert conn.copied == rows
+    assert conn.commits == 1
+    assert await pool.copy_merge("ml_predictions", ["id"], [], "") == 0
+    assert pool._leases_total == 1
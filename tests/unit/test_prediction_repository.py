@@ -0,0 +1,96 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from config.settings import settings
+from src.application.mappers.prediction_mapper import PredictionMapper
+from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.persistence.prediction_repository_impl import PredictionRepositoryImpl
+
+class FakeDatabase:
+
+    def __init__(self):
+        self.batches = []
+        self.copies = []
+
+    async def batch_execute_update(self, query, params_list):
+        self.batches.append((" ".join(query.split()), params_list))
+        return len(params_list)
+
+    async def copy_merge(self, table, columns, rows, merge_query):
+        self.copies.append((table, columns, rows, " ".join(merge_query.split())))
+        return len(rows)
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(PostgresPool, "batch_execute_update", database.batch_execute_update)
+    monkeypatch.setattr(PostgresPool, "copy_merge", database.copy_merge)
+    monkeypatch.setattr(settings, "DATABASE_COPY_THRESHOLD", 3)
+    return database
+
+def _predictions(n):
+    ranch_id = uuid4()
+    return [
+        PredictionMapper.to_prediction(
+            ranch_id=ranch_id,
+            animal_id=uuid4(),
+            prediction_type="cluster_assignment",
+            prediction_date=date(2025, 1, 10),
+            confidence_score=0.8,
+            explanation=f"GDP {index}",
+            severity="info"
+        )
+        for index in range(n)
+    ]
+
+def _row(prediction):
+    return (
+        str(prediction.id),
+        str(prediction.ranch_id),
+        str(prediction.animal_id),
+        prediction.prediction_type,
+        prediction.prediction_date,
+        float(prediction.confidence_score),
+        prediction.explanation,
+        prediction.severity,
+        prediction.is_acknowledged,
+        prediction.created_at
+    )
+
+@pytest.mark.asyncio
+async def test_save_batch_below_threshold_uses_executemany(database):
+    predictions = _predictions(2)
+
+    assert await PredictionRepositoryImpl().save_batch(predictions)
+
+    assert database.copies == []
+    [(query, params_list)] = database.batches
+    assert query.startswith(
+        "INSERT INTO ml_predictions (id, ranch_id, animal_id, prediction_type, prediction_date, "
+        "confidence_score, explanation, severity, is_acknowledged, created_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) ON CONFLICT (id) DO UPDATE"
+    )
+    assert params_list == [_row(prediction) for prediction in predictions]
+
+@pytest.mark.asyncio
+async def test_save_batch_at_threshold_uses_copy_merge(database):
+    predictions = _predictions(3)
+
+    assert await PredictionRepositoryImpl().save_batch(predictions)
+
+    assert database.batches == []
+    [(table, columns, rows, merge_query)] = database.copies
+    assert table == "ml_predictions"
+    assert columns == PredictionRepositoryImpl.COLUMNS
+    assert rows == [_row(prediction) for prediction in predictions]
+    assert merge_query == (
+        "INSERT INTO ml_predictions ({columns}) SELECT {columns} FROM {staging} "
+        "ON CONFLICT (id) DO UPDATE SET explanation = EXCLUDED.explanation, severity = EXCLUDED.severity"
+    )
+
+@pytest.mark.asyncio
+async def test_save_batch_skips_empty_batch(database):
+    assert await PredictionRepositoryImpl().save_batch([])
+    assert database.batches == [] and database.copies == []
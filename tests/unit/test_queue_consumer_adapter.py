@@ -0,0 +1,243 @@
+import asyncio
+import json
+
+import pytest
+
+from config.settings import settings
+from src.adapters.input.queue_consumer_adapter import QueueConsumerAdapter
+from src.infrastructure.memory.in_memory_queue import InMemoryQueuePublisher
+from src.infrastructure.memory.in_memory_store import InjectedLatency
+from src.infrastructure.queue.message_codec import MessageCodec
+from src.infrastructure.queue.rabbitmq_connection import RabbitMQConnection
+from src.infrastructure.queue.retry_policy import RetryPolicy
+
+class FakeMessage:
+
+    def __init__(self, body: bytes, headers: dict = None):
+        self.body = body
+        self.headers = headers or {}
+        self.content_type = "application/json"
+        self.content_encoding = None
+        self.message_id = None
+        self.correlation_id = None
+        self.timestamp = None
+        self.type = None
+        self.outcome = None
+
+    async def ack(self):
+        self.outcome = "ack"
+
+    async def nack(self, requeue: bool = True):
+        self.outcome = f"nack:{requeue}"
+
+    async def reject(self, requeue: bool = False):
+        self.outcome = f"reject:{requeue}"
+
+class FakeIterator:
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+class FakeQueue:
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    def iterator(self):
+        return FakeIterator(self.messages)
+
+class FakeExchange:
+
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, message, routing_key):
+        self.published.append((routing_key, message))
+
+class FakeChannel:
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.prefetch_count = None
+        self.default_exchange = FakeExchange()
+
+    async def get_queue(self, name):
+        return FakeQueue(self.messages)
+
+def _adapter(monkeypatch, messages, process):
+    channel = FakeChannel(messages)
+
+    async def create_channel(prefetch_count):
+        channel.prefetch_count = prefetch_count
+        return channel
+
+    async def get_channel():
+        return channel
+
+    monkeypatch.setattr(RabbitMQConnection, "create_channel", create_channel)
+    monkeypatch.setattr(RabbitMQConnection, "get_channel", get_channel)
+
+    adapter = QueueConsumerAdapter.__new__(QueueConsumerAdapter)
+    adapter.running = True
+    adapter.in_flight = {}
+    if process is not None:
+        adapter._process_message = process
+    adapter.retry_policy = RetryPolicy(max_retries=2, base_delay_ms=1000, dead_letter_queue="bovara.dlq")
+    adapter.queue_names = {"forecast": "bovara.forecast", "cluster": "bovara.cluster"}
+    return adapter, channel
+
+RANCH_ID = "7d1f5c1e-2f4b-4f57-9a51-0a8a2b1f6c11"
+ANIMAL_ID = "c5a2e0b4-8c3d-4e6b-b1f7-3d2c9a4e5f60"
+
+def _body(task_id):
+    return json.dumps({"ranch_id": RANCH_ID, "animal_id": ANIMAL_ID, "task_id": task_id}).encode()
+
+@pytest.mark.asyncio
+async def test_consume_queue_bounds_concurrency_and_sets_prefetch(monkeypatch):
+    active = 0
+    peak = 0
+
+    async def process(task, queue_type):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    messages = [FakeMessage(_body(str(i))) for i in range(12)]
+    adapter, channel = _adapter(monkeypatch, messages, process)
+
+    await adapter._consume_queue("bovara.forecast", "forecast", concurrency=4)
+    await adapter._drain_in_flight()
+
+    assert channel.prefetch_count == 4
+    assert peak == 4
+    assert all(message.outcome == "ack" for message in messages)
+    assert adapter.in_flight_count() == 0
+
+@pytest.mark.asyncio
+async def test_failures_are_delayed_then_dead_lettered(monkeypatch):
+    async def process(task, queue_type):
+        if task.task_id != "ok":
+            raise RuntimeError("fallo")
+
+    ok = FakeMessage(_body("ok"))
+    first_failure = FakeMessage(_body("boom"))
+    last_failure = FakeMessage(_body("boom"), headers={RetryPolicy.RETRY_HEADER: 2})
+    malformed = FakeMessage(b"{no json")
+    adapter, channel = _adapter(monkeypatch, [ok, first_failure, last_failure, malformed], process)
+
+    await adapter._consume_queue("bovara.cluster", "cluster", concurrency=2)
+    await adapter._drain_in_flight()
+
+    assert [message.outcome for message in (ok, first_failure, last_failure, malformed)] == ["ack"] * 4
+
+    malformed_headers = next(
+        message.headers for _, message in channel.default_exchange.published
+        if message.body == b"{no json"
+    )
+    assert sorted(routing_key for routing_key, _ in channel.default_exchange.published) == [
+        "bovara.cluster.retry.1000ms",
+        "bovara.dlq",
+        "bovara.dlq",
+    ]
+    assert malformed_headers[RetryPolicy.RETRY_HEADER] == 0
+    assert adapter.retry_policy.stats() == {
+        "retries": {"bovara.cluster": 1},
+        "dead_letters": {"bovara.cluster": 2},
+    }
+
+def test_delay_queue_names_follow_the_configured_delay():
+    current = RetryPolicy(max_retries=3, base_delay_ms=1000, dead_letter_queue="bovara.dlq")
+    reconfigured = RetryPolicy(max_retries=3, base_delay_ms=5000, dead_letter_queue="bovara.dlq")
+
+    assert [current.delay_queue_name("bovara.cluster", attempt) for attempt in (1, 2, 3)] == [
+        "bovara.cluster.retry.1000ms",
+        "bovara.cluster.retry.2000ms",
+        "bovara.cluster.retry.4000ms",
+    ]
+    assert reconfigured.delay_queue_name("bovara.cluster", 1) == "bovara.cluster.retry.5000ms"
+
+@pytest.mark.asyncio
+async def test_failure_is_requeued_when_retry_publish_fails(monkeypatch):
+    async def process(task, queue_type):
+        raise RuntimeError("fallo")
+
+    message = FakeMessage(_body("boom"))
+    adapter, channel = _adapter(monkeypatch, [message], process)
+
+    async def broken_publish(message, routing_key):
+        raise ConnectionError("canal cerrado")
+
+    channel.default_exchange.publish = broken_publish
+
+    await adapter._consume_queue("bovara.forecast", "forecast", concurrency=1)
+    await adapter._drain_in_flight()
+
+    assert message.outcome == "nack:True"
+
+class FakeProcessor:
+
+    def __init__(self):
+        self.statuses = []
+
+    async def process_clustering_task(self, ranch_id, animal_id, task_id):
+        return {"status": "success", "task_id": task_id, "data": {"cluster_label": "PRODUCTIVO_A"}}
+
+    async def update_queue_status(self, task_id, status, error=None):
+        self.statuses.append((task_id, status))
+
+def _publishing_adapter(publisher):
+    adapter = QueueConsumerAdapter.__new__(QueueConsumerAdapter)
+    adapter.processor = FakeProcessor()
+    adapter.batcher = None
+    adapter.publisher = publisher
+    return adapter
+
+@pytest.mark.asyncio
+async def test_result_is_confirmed_before_the_task_completes():
+    publisher = InMemoryQueuePublisher(InjectedLatency(base_ms=10))
+    adapter = _publishing_adapter(publisher)
+    task = MessageCodec.decode_task("cluster", _body("t1"), "application/json")
+
+    status = await adapter._run_task(task, "cluster")
+
+    assert status == "success"
+    [result] = publisher.messages[settings.QUEUE_NAME_RESULTS]
+    assert result["task_id"] == "t1"
+    assert publisher.stats()["pending_confirms"] == 0
+
+@pytest.mark.asyncio
+async def test_unconfirmed_result_is_routed_as_a_failure(monkeypatch):
+    publisher = InMemoryQueuePublisher()
+
+    async def unconfirmed(queue_name, message, **properties):
+        return False
+
+    publisher.publish = unconfirmed
+    message = FakeMessage(_body("t1"))
+    adapter, channel = _adapter(monkeypatch, [message], None)
+    adapter.processor = FakeProcessor()
+    adapter.batcher = None
+    adapter.publisher = publisher
+
+    await adapter._consume_queue("bovara.cluster", "cluster", concurrency=1)
+    await adapter._drain_in_flight()
+
+    assert message.outcome == "ack"
+    assert [routing_key for routing_key, _ in channel.default_exchange.published] == ["bovara.cluster.retry.1000ms"]
+    assert adapter.processor.statuses == [("t1", "SUCCESS")]
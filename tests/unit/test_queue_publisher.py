@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.infrastructure.queue.queue_publisher import QueuePublisher
+from src.infrastructure.queue.rabbitmq_connection import RabbitMQConnection
+
+class FakeExchange:
+
+    def __init__(self, fail_keys=()):
+        self.fail_keys = set(fail_keys)
+        self.published = []
+        self.max_outstanding = 0
+        self.outstanding = 0
+
+    async def publish(self, message, routing_key):
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        await asyncio.sleep(0.001)
+        self.outstanding -= 1
+        if routing_key in self.fail_keys:
+            raise ConnectionError("nack del broker")
+        self.published.append((routing_key, message))
+
+class FakeChannel:
+
+    def __init__(self, exchange):
+        self.exchange_lookups = 0
+        self._exchange = exchange
+
+    @property
+    def default_exchange(self):
+        self.exchange_lookups += 1
+        return self._exchange
+
+    async def get_queue(self, name):
+        raise AssertionError("publish no debe consultar la cola")
+
+@pytest.fixture
+def channel(monkeypatch):
+    channel = FakeChannel(FakeExchange(fail_keys={"rota"}))
+
+    async def get_channel():
+        return channel
+
+    monkeypatch.setattr(RabbitMQConnection, "get_channel", get_channel)
+    return channel
+
+@pytest.mark.asyncio
+async def test_publish_uses_cached_default_exchange(channel):
+    publisher = QueuePublisher(confirm_window=10)
+
+    assert await publisher.publish("bovara.results", {"confidence": np.float64(0.5)}, message_id="t1")
+    assert await publisher.publish("bovara.results", {"confidence": 0.7})
+
+    assert channel.exchange_lookups == 1
+    routing_key, message = channel._exchange.published[0]
+    assert routing_key == "bovara.results"
+    assert json.loads(message.body) == {"confidence": 0.5}
+    assert message.message_id == "t1"
+    assert message.content_type == "application/json"
+
+@pytest.mark.asyncio
+async def test_publish_nowait_bounds_outstanding_confirms_and_counts_failures(channel):
+    publisher = QueuePublisher(confirm_window=4)
+
+    for i in range(10):
+        await publisher.publish_nowait("bovara.results", {"i": i})
+    await publisher.publish_nowait("rota", {"i": 10})
+
+    confirmed, failed = await publisher.wait_for_confirms()
+
+    assert channel._exchange.max_outstanding <= 4
+    assert len(channel._exchange.published) == 10
+    assert failed == 1
+    assert publisher.stats() == {"published": 11, "confirmed": 10, "failed": 1, "pending_confirms": 0}
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+from src.infrastructure.persistence.postgres_pool import PostgresPool
+from src.infrastructure.persistence.queue_status_writer import QueueStatusWriter
+
+class FakeDatabase:
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.updates = []
+
+    async def execute_update(self, query, params=None):
+        if self.fail:
+            raise ConnectionError("BD caída")
+        self.updates.append((query, params))
+        return len(json.loads(params[0]))
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(PostgresPool, "execute_update", database.execute_update)
+    return database
+
+@pytest.mark.asyncio
+async def test_updates_are_flushed_as_one_statement_after_interval(database):
+    writer = QueueStatusWriter(flush_size=100, flush_interval_seconds=0.01)
+
+    await asyncio.gather(
+        writer.update("t1", "SUCCESS"),
+        writer.update("t2", "ERROR", "fallo"),
+        writer.update("t1", "ERROR", "reintento"),
+    )
+
+    assert len(database.updates) == 1
+    query, params = database.updates[0]
+    assert " ".join(query.split()) == (
+        "UPDATE processing_queue AS q "
+        "SET status = v.status, "
+        "error_message = COALESCE(v.error_message, q.error_message), "
+        "processed_at = NOW() "
+        "FROM json_populate_recordset(NULL::processing_queue, %s::json) AS v "
+        "WHERE q.id = v.id"
+    )
+    assert json.loads(params[0]) == [
+        {"id": "t1", "status": "ERROR", "error_message": "reintento"},
+        {"id": "t2", "status": "ERROR", "error_message": "fallo"},
+    ]
+    assert writer.stats()["rows"] == 2
+
+@pytest.mark.asyncio
+async def test_size_triggers_flush_without_waiting_for_timer(database):
+    writer = QueueStatusWriter(flush_size=2, flush_interval_seconds=60)
+
+    await asyncio.wait_for(asyncio.gather(
+        writer.update("t1", "SUCCESS"),
+        writer.update("t2", "SUCCESS"),
+    ), timeout=5)
+
+    assert len(database.updates) == 1
+
+@pytest.mark.asyncio
+async def test_waiters_only_return_after_flush_and_see_failures(monkeypatch):
+    database = FakeDatabase(fail=True)
+    monkeypatch.setattr(PostgresPool, "execute_update", database.execute_update)
+    writer = QueueStatusWriter(flush_size=100, flush_interval_seconds=60)
+
+    waiter = asyncio.create_task(writer.update("t1", "SUCCESS"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await writer.flush()
+
+    with pytest.raises(ConnectionError):
+        await waiter
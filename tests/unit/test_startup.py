@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src.infrastructure.compute.ml_warmup import warm_up_ml_modules
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def test_importing_worker_does_not_load_heavy_ml_modules():
+    probe = (
+        "import sys, src.main; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} & {'sklearn', 'pandas', 'scipy'}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip().splitlines()[-1]
+
+    assert output == "[]"
+
+def test_warm_up_loads_sklearn():
+    warm_up_ml_modules()
+
+    assert "sklearn.cluster" in sys.modules
+    assert "sklearn.linear_model" in sys.modules
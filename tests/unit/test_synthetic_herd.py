@@ -0,0 +1,28 @@
+from benchmarks.synthetic_herd import WEIGHT_WINDOW_DAYS, generate_herd
+
+def test_herd_is_deterministic_for_a_seed():
+    first = generate_herd(200, seed=7)
+    second = generate_herd(200, seed=7)
+    other = generate_herd(200, seed=8)
+
+    assert first.animal_ids == second.animal_ids
+    assert first.weight_events == second.weight_events
+    assert first.breeding_events == second.breeding_events
+    assert first.animal_ids != other.animal_ids
+
+def test_events_match_repository_row_shapes():
+    herd = generate_herd(500)
+
+    for animal in herd.animals:
+        weights = herd.weight_events[animal.id]
+        dates = [event[0] for event in weights]
+        assert dates == sorted(dates, reverse=True)
+        assert all((herd.reference_date - day.date()).days < WEIGHT_WINDOW_DAYS for day in dates)
+        assert all(len(event) == 3 for event in weights)
+
+        breeding = herd.breeding_events[animal.id]
+        if breeding:
+            assert animal.last_insemination_date == breeding[0][0].date()
+
+    assert any(len(events) < 2 for events in herd.weight_events.values())
+    assert any(herd.birth_events[animal.id] for animal in herd.animals)
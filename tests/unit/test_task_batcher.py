@@ -0,0 +1,115 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.adapters.input.task_batcher import TaskBatcher
+from src.infrastructure.queue.messages import ClusterTaskMessage, RanchClusterTaskMessage
+
+class FakeProcessor:
+
+    def __init__(self, active_ids, fail_ranch=None):
+        self.active_ids = set(active_ids)
+        self.fail_ranch = fail_ranch
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def process_clustering_batch(self, ranch_id, animal_ids=None):
+        self.batch_calls.append((ranch_id, None if animal_ids is None else sorted(animal_ids)))
+        if ranch_id == self.fail_ranch:
+            return {"status": "error", "error": "BD caída"}
+
+        wanted = self.active_ids if animal_ids is None else self.active_ids & set(animal_ids)
+        return {
+            "status": "success",
+            "data": {"ranch_id": ranch_id, "processed": len(wanted)},
+            "results": {animal_id: {"animal_id": animal_id} for animal_id in wanted}
+        }
+
+    async def process_clustering_task(self, ranch_id, animal_id, task_id):
+        self.single_calls.append(animal_id)
+        if animal_id in self.active_ids:
+            return {"status": "success", "task_id": task_id, "data": {"animal_id": animal_id}}
+        return {"status": "error", "task_id": task_id, "error": f"Animal {animal_id} no encontrado"}
+
+def _task(ranch_id, task_id, animal_id=None):
+    if animal_id:
+        return ClusterTaskMessage(ranch_id=ranch_id, animal_id=animal_id, task_id=task_id)
+    return RanchClusterTaskMessage(ranch_id=ranch_id, task_id=task_id)
+
+@pytest.mark.asyncio
+async def test_duplicates_are_coalesced_into_one_batched_call():
+    ranch = uuid4()
+    first, second = uuid4(), uuid4()
+    processor = FakeProcessor([first, second])
+    batcher = TaskBatcher(processor, window_seconds=0.01, max_batch=50)
+
+    results = await asyncio.gather(
+        batcher.submit("cluster", _task(ranch, "t1", first)),
+        batcher.submit("cluster", _task(ranch, "t2", first)),
+        batcher.submit("cluster", _task(ranch, "t3", second)),
+    )
+
+    assert processor.batch_calls == [(ranch, sorted([first, second]))]
+    assert [result["task_id"] for result in results] == ["t1", "t2", "t3"]
+    assert all(result["status"] == "success" for result in results)
+    assert results[0]["data"] == {"animal_id": first}
+    assert batcher.stats()["computations"] == 1
+
+@pytest.mark.asyncio
+async def test_ranch_task_covers_animals_and_unknown_animals_fall_back():
+    ranch = uuid4()
+    active, inactive = uuid4(), uuid4()
+    processor = FakeProcessor([active])
+    batcher = TaskBatcher(processor, window_seconds=0.01, max_batch=50)
+
+    ranch_result, active_result, inactive_result = await asyncio.gather(
+        batcher.submit("cluster", _task(ranch, "r1")),
+        batcher.submit("cluster", _task(ranch, "a1", active)),
+        batcher.submit("cluster", _task(ranch, "a2", inactive)),
+    )
+
+    assert processor.batch_calls == [(ranch, None)]
+    assert processor.single_calls == [inactive]
+    assert ranch_result == {"status": "success", "task_id": "r1", "data": {"ranch_id": ranch, "processed": 1}}
+    assert active_result["data"] == {"animal_id": active}
+    assert inactive_result["status"] == "error"
+    assert inactive_result["task_id"] == "a2"
+
+@pytest.mark.asyncio
+async def test_failed_batch_marks_every_task_and_size_triggers_flush():
+    ranch = uuid4()
+    animal = uuid4()
+    processor = FakeProcessor([animal], fail_ranch=ranch)
+    batcher = TaskBatcher(processor, window_seconds=60, max_batch=2)
+
+    results = await asyncio.wait_for(asyncio.gather(
+        batcher.submit("cluster", _task(ranch, "t1", animal)),
+        batcher.submit("cluster", _task(ranch, "t2")),
+    ), timeout=5)
+
+    assert [result["status"] for result in results] == ["error", "error"]
+    assert [result["task_id"] for result in results] == ["t1", "t2"]
+    assert processor.single_calls == []
+
+@pytest.mark.asyncio
+async def test_small_flush_without_ranch_task_runs_per_animal():
+    ranch = uuid4()
+    animals = [uuid4() for _ in range(3)]
+    processor = FakeProcessor(animals)
+    batcher = TaskBatcher(processor, window_seconds=0.01, max_batch=50, min_ranch_batch=3)
+
+    small = await asyncio.gather(
+        batcher.submit("cluster", _task(ranch, "t1", animals[0])),
+        batcher.submit("cluster", _task(ranch, "t2", animals[0])),
+        batcher.submit("cluster", _task(ranch, "t3", animals[1])),
+    )
+    assert processor.batch_calls == []
+    assert processor.single_calls == animals[:2]
+    assert [result["data"] for result in small] == [{"animal_id": animals[0]}] * 2 + [{"animal_id": animals[1]}]
+
+    await asyncio.gather(*(
+        batcher.submit("cluster", _task(ranch, f"b{index}", animal_id)) for index, animal_id in enumerate(animals)
+    ))
+    assert processor.batch_calls == [(ranch, sorted(animals))]
+    assert batcher.stats()["computations"] == 3
@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+from src.infrastructure.metrics.worker_metrics import instrument_repository
+from src.infrastructure.tracing.span_exporter import JsonFileSpanExporter, SpanExporter
+from src.infrastructure.tracing.tracer import NOOP_SPAN, Tracer, tracer
+from tests.unit.test_queue_consumer_adapter import FakeMessage, _adapter, _body, RANCH_ID
+
+class MemoryExporter(SpanExporter):
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace_id, correlation, spans):
+        self.traces.append((trace_id, dict(correlation), list(spans)))
+
+def test_disabled_tracer_returns_shared_noop_span():
+    disabled = Tracer(enabled=False, exporter=MemoryExporter())
+
+    assert disabled.start_trace("message") is NOOP_SPAN
+    assert disabled.span("decode") is NOOP_SPAN
+
+def test_spans_outside_a_trace_are_not_recorded():
+    exporter = MemoryExporter()
+    enabled = Tracer(enabled=True, exporter=exporter)
+
+    with enabled.span("orphan") as span:
+        span.set_attribute("rows", 1)
+
+    assert span is NOOP_SPAN
+    assert exporter.traces == []
+
+def test_sampling_skips_unsampled_traces():
+    exporter = MemoryExporter()
+    sampled_out = Tracer(enabled=True, sample_rate=0.0, exporter=exporter)
+
+    with sampled_out.start_trace("message"):
+        with sampled_out.span("decode"):
+            pass
+
+    assert exporter.traces == []
+    assert sampled_out.stats()["traces_started"] == 1
+    assert sampled_out.stats()["traces_sampled"] == 0
+
+def test_nested_spans_share_trace_and_record_errors():
+    exporter = MemoryExporter()
+    enabled = Tracer(enabled=True, exporter=exporter)
+
+    with enabled.start_trace("message") as root:
+        root.set_correlation(task_id="t1")
+        with enabled.span("decode"):
+            pass
+        with pytest.raises(ValueError):
+            with enabled.span("train"):
+                raise ValueError("sin datos")
+
+    [(trace_id, correlation, spans)] = exporter.traces
+    by_name = {span.name: span for span in spans}
+
+    assert correlation == {"task_id": "t1"}
+    assert by_name["decode"].parent_span_id == root.span_id
+    assert by_name["train"].error == "ValueError: sin datos"
+    assert all(span.trace.trace_id == trace_id for span in spans)
+
+def test_file_exporter_writes_otlp_json_lines(tmp_path):
+    exporter = JsonFileSpanExporter(str(tmp_path / "spans-{pid}.jsonl"))
+    enabled = Tracer(enabled=True, exporter=exporter)
+
+    with enabled.start_trace("message", queue="forecast") as root:
+        root.set_correlation(task_id="t1", ranch_id=RANCH_ID)
+        with enabled.span("decode"):
+            pass
+    enabled.shutdown()
+
+    [line] = open(exporter.path).read().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    decode = next(span for span in spans if span["name"] == "decode")
+    attributes = {item["key"]: item["value"] for item in decode["attributes"]}
+
+    assert len(spans) == 2
+    assert decode["parentSpanId"] == root.span_id
+    assert attributes["task_id"] == {"stringValue": "t1"}
+    assert attributes["ranch_id"] == {"stringValue": RANCH_ID}
+    assert decode["status"] == {"code": 1}
+
+@pytest.mark.asyncio
+async def test_message_trace_covers_decode_repository_and_correlation(monkeypatch):
+    exporter = MemoryExporter()
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    monkeypatch.setattr(tracer, "exporter", exporter)
+
+    @instrument_repository("traced")
+    class Repository:
+
+        async def find_weights(self):
+            await asyncio.sleep(0)
+            return []
+
+    async def process(task, queue_type):
+        await Repository().find_weights()
+        return "success"
+
+    message = FakeMessage(_body("t-42"))
+    adapter, _ = _adapter(monkeypatch, [message], process)
+
+    await adapter._handle_message(message, "forecast")
+
+    [(_, correlation, spans)] = exporter.traces
+    names = {span.name for span in spans}
+
+    assert message.outcome == "ack"
+    assert names == {"forecast.message", "decode", "traced.find_weights"}
+    assert correlation["task_id"] == "t-42"
+    assert str(correlation["ranch_id"]) == RANCH_ID
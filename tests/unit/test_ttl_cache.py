@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from uuid import uuid4
+
+from src.infrastructure.cache.ttl_cache import TTLCache
+from src.infrastructure.persistence.cached_ranch_repository import CachedRanchRepository
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class CountingRanchRepository:
+    def __init__(self):
+        self.calls = {"repro": 0, "goals": 0}
+
+    async def find_by_id(self, ranch_id):
+        return None
+
+    async def get_repro_settings(self, ranch_id):
+        self.calls["repro"] += 1
+        await asyncio.sleep(0.01)
+        return {"ranch_id": ranch_id, "kind": "repro"}
+
+    async def get_production_goals(self, ranch_id):
+        self.calls["goals"] += 1
+        await asyncio.sleep(0.01)
+        return {"ranch_id": ranch_id, "kind": "goals"}
+
+@pytest.mark.asyncio
+async def test_single_flight_for_concurrent_requests():
+    inner = CountingRanchRepository()
+    repo = CachedRanchRepository(inner, TTLCache(ttl_seconds=60, max_entries=10))
+    ranch_id = uuid4()
+
+    results = await asyncio.gather(*[
+        coro
+        for _ in range(200)
+        for coro in (repo.get_repro_settings(ranch_id), repo.get_production_goals(ranch_id))
+    ])
+
+    assert len(results) == 400
+    assert inner.calls == {"repro": 1, "goals": 1}
+    stats = repo.stats()
+    assert stats["misses"] == 2
+    assert stats["coalesced"] == 398
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    inner = CountingRanchRepository()
+    repo = CachedRanchRepository(inner, TTLCache(ttl_seconds=30, max_entries=10, clock=clock))
+    ranch_id = uuid4()
+
+    await repo.get_repro_settings(ranch_id)
+    clock.now = 29
+    await repo.get_repro_settings(ranch_id)
+    assert inner.calls["repro"] == 1
+
+    clock.now = 31
+    await repo.get_repro_settings(ranch_id)
+    assert inner.calls["repro"] == 2
+
+@pytest.mark.asyncio
+async def test_invalidation_forces_reload():
+    inner = CountingRanchRepository()
+    repo = CachedRanchRepository(inner, TTLCache(ttl_seconds=60, max_entries=10))
+    ranch_id = uuid4()
+
+    await repo.get_production_goals(ranch_id)
+    repo.invalidate(ranch_id)
+    await repo.get_production_goals(ranch_id)
+
+    assert inner.calls["goals"] == 2
+
+@pytest.mark.asyncio
+async def test_bounded_size_evicts_least_recent():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+
+    async def load(value):
+        return value
+
+    await cache.get_or_load("a", lambda: load(1))
+    await cache.get_or_load("b", lambda: load(2))
+    await cache.get_or_load("a", lambda: load(1))
+    await cache.get_or_load("c", lambda: load(3))
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
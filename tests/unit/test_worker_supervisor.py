@@ -0,0 +1,49 @@
+import signal
+import sys
+import time
+
+from src.worker_supervisor import WorkerSupervisor
+
+def _crash():
+    sys.exit(3)
+
+def _serve_until_terminated():
+    stop = []
+    signal.signal(signal.SIGTERM, lambda sig, frame: stop.append(sig))
+    while not stop:
+        time.sleep(0.01)
+
+def _wait_until_dead(supervisor, slot, timeout=30.0):
+    supervisor._workers[slot].join(timeout)
+
+def test_crashed_worker_is_restarted_with_backoff():
+    supervisor = WorkerSupervisor(_crash, processes=1, restart_backoff=0.05)
+
+    supervisor._spawn(0)
+    _wait_until_dead(supervisor, 0)
+    supervisor._reap()
+
+    assert 0 not in supervisor._workers
+    assert supervisor._failures[0] == 1
+    assert 0 in supervisor._restart_at
+
+    time.sleep(0.1)
+    supervisor._restart_due()
+
+    assert supervisor.restarts == 1
+    assert 0 in supervisor._workers
+
+    _wait_until_dead(supervisor, 0)
+    supervisor._reap()
+    assert supervisor._failures[0] == 2
+    assert supervisor._restart_at[0] - time.monotonic() > 0.05
+
+def test_shutdown_terminates_workers_gracefully():
+    supervisor = WorkerSupervisor(_serve_until_terminated, processes=2, shutdown_timeout=30)
+
+    supervisor._spawn(0)
+    supervisor._spawn(1)
+    time.sleep(0.5)
+
+    assert supervisor._shutdown() == 0
+    assert supervisor._workers == {}